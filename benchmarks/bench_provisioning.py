@@ -0,0 +1,142 @@
+"""Benchmarks for the code paths every provisioned device goes through
+
+Scorpion: expand_2110_outputs, Defaults._split_dict, Url.to_string,
+Defaults.get_user_defaults, apply_all_defaults (one unit and a fleet).
+XIP3901: preview_summary, _fill_rtp_body, sender_jobs, apply_senders.
+Device I/O runs against the local mocks (tests.mocks.scorpion / tests.mocks.xip3901)
+with per-device rate limiting switched off, so the numbers are client cost.
+
+Run from the repo root:
+    python -m benchmarks.bench_provisioning
+    python -m benchmarks.bench_provisioning --save bench.json
+    python -m benchmarks.bench_provisioning --compare bench.json   # exit 1 on a >25% p50 regression
+    python -m benchmarks.bench_provisioning -k xip                  # only names containing "xip"
+"""
+
+import argparse
+import os
+import sys
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Tuple
+
+# Defaults() logs in when JWT_ENABLED; the mocks accept any credentials
+os.environ.setdefault("SCORPION_USER", "bench")
+os.environ.setdefault("SCORPION_PASS", "bench")
+
+from benchmarks import harness  # noqa: E402
+from src import ratelimit  # noqa: E402
+from src.scorpion import default as scorpion_default  # noqa: E402
+from src.scorpion import fleet as scorpion_fleet  # noqa: E402
+from src.scorpion import tokens  # noqa: E402
+from src.scorpion.utils import Url  # noqa: E402
+from src.xip3901.default import Defaults as XipDefaults  # noqa: E402
+from tests.mocks.scorpion import MockFleet, MockScorpion  # noqa: E402
+from tests.mocks.xip3901 import MockXip  # noqa: E402
+
+# name -> (fn, number of timed calls)
+Case = Tuple[Callable[[], object], int]
+
+
+def _unthrottled(family: str, *hosts):
+    for host in hosts:
+        ratelimit.limiter_for(host, family).rate = 0
+
+
+def scorpion_cases(stack: ExitStack) -> Dict[str, Case]:
+    # never write mock tokens into config/tokens.json
+    tokens.cache().persist = False
+
+    config = scorpion_default.read_config()
+    defaults = scorpion_default.read_default_params()
+    device = stack.enter_context(MockScorpion(host="127.0.3.1"))
+    fleet = stack.enter_context(MockFleet(8, base="127.0.5."))
+    _unthrottled("scorpion", device.host, *fleet.hosts)
+
+    unit = scorpion_default.Defaults(name="bench", host=device.host, port=device.port)
+    expanded = unit.get_user_defaults()
+    url = Url(scheme="http", host=device.host, port=device.port, version="v.api/apis/")
+
+    def expand_cold():
+        scorpion_default._EXPANSION_MEMO.clear()
+        return scorpion_default.expand_2110_outputs(defaults, config, "10.169.20.51", outputs=8)
+
+    def expand_memo():
+        return scorpion_default.expand_2110_outputs(defaults, config, "10.169.20.51", outputs=8)
+
+    def url_to_string():
+        url.path = "v.api/apis/EV/SET/parameter"
+        url.query = {"6551.0.0.0": "232.20.51.201", "6551.0.0.1": "232.120.51.201", "55": "SCPN6-051"}
+        return url.to_string()
+
+    def apply_unit():
+        return unit.apply_all_defaults(journal=False)
+
+    def apply_fleet():
+        return scorpion_fleet.apply_all_defaults(fleet.hosts, port=fleet.port, max_workers=8, journal=False)
+
+    return {
+        "scorpion.expand_2110_outputs (cold)": (expand_cold, 200),
+        "scorpion.expand_2110_outputs (memo)": (expand_memo, 2000),
+        "scorpion.Defaults._split_dict": (lambda: unit._split_dict(expanded, 100), 2000),
+        "scorpion.Url.to_string": (url_to_string, 2000),
+        "scorpion.Defaults.get_user_defaults": (unit.get_user_defaults, 500),
+        "scorpion.apply_all_defaults (1 unit)": (apply_unit, 20),
+        "scorpion.apply_all_defaults (fleet x8)": (apply_fleet, 5),
+    }
+
+
+def xip_cases(stack: ExitStack) -> Dict[str, Case]:
+    device = stack.enter_context(MockXip(host="127.0.4.1"))
+    _unthrottled("xip3901", device.host)
+    xip = XipDefaults(name="bench", host=device.host, port=device.port)
+    template = xip.refs["senders"]["audio"]["body_template"]
+
+    return {
+        "xip3901.preview_summary": (xip.preview_summary, 2000),
+        "xip3901._fill_rtp_body": (lambda: xip._fill_rtp_body(template, 201, 50200, audio=True), 2000),
+        "xip3901.sender_jobs": (xip.sender_jobs, 500),
+        "xip3901.apply_senders": (xip.apply_senders, 20),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="keyword", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--save", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON from --save; exit 1 if a p50 regresses")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed p50 ratio vs baseline")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every case's call count")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    with ExitStack() as stack:
+        cases: Dict[str, Case] = {}
+        cases.update(scorpion_cases(stack))
+        cases.update(xip_cases(stack))
+        # the request logging in the Sessions would dominate (and flood) the output
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            for name, (fn, number) in cases.items():
+                if args.keyword.lower() not in name.lower():
+                    continue
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    results[name] = harness.measure(
+                        fn, number=max(1, int(number * args.scale)), warmup=min(10, number)
+                    )
+                finally:
+                    sys.stdout = stdout
+
+    baseline = harness.load(args.compare) if args.compare else None
+    harness.report(results, baseline)
+    if args.save:
+        harness.save(results, args.save)
+    if baseline:
+        slower = harness.regressions(results, baseline, args.threshold)
+        for line in slower:
+            print(f"REGRESSION {line}")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Micro-benchmark: Url.to_string() (pydantic + furl) vs the precompiled UrlBuilder
+
+Run from the repo root:
+    python -m benchmarks.bench_urls
+"""
+
+import timeit
+
+from src.scorpion.utils import Url
+from src.urlbuilder import UrlBuilder
+
+HOST = "10.169.20.51"
+VERSION = "v.api/apis/"
+
+CASES = {
+    "scorpion GET": (f"{VERSION}EV/GET/parameter/6551.3.2.1", None),
+    "scorpion SET (labels)": (f"{VERSION}EV/SET/parameter", {"55": "SCPN6-051", "5204": "SCPN6-051"}),
+    "scorpion SET (multicast x20)": (
+        f"{VERSION}EV/SET/parameter",
+        {f"6551.{o}.{s}.0": f"232.20.51.{201 + o * 4 + s}" for o in range(5) for s in range(4)},
+    ),
+}
+
+
+def main(number: int = 2000):
+    builder = UrlBuilder(scheme="http", host=HOST, port=80)
+    url = Url(scheme="http", host=HOST, port=80, version=VERSION)
+
+    print(f"{'case':32} {'to_string us':>13} {'builder us':>11} {'speedup':>8}")
+    for name, (path, query) in CASES.items():
+        def old():
+            url.path = path
+            url.query = query
+            return url.to_string()
+
+        def new():
+            return builder.build(path, query)
+
+        assert old() == new(), name
+
+        old_us = min(timeit.repeat(old, number=number, repeat=3)) / number * 1e6
+        new_us = min(timeit.repeat(new, number=number, repeat=3)) / number * 1e6
+        print(f"{name:32} {old_us:13.1f} {new_us:11.1f} {old_us / new_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
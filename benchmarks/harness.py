@@ -0,0 +1,107 @@
+"""Minimal benchmark harness: ops/sec, p50/p99 latency and allocations per call"""
+
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(
+    fn: Callable[[], Any],
+    number: int = 200,
+    warmup: int = 10,
+    alloc_runs: int = 5,
+) -> Dict[str, float]:
+    """
+    Time `number` calls of fn individually, then trace allocations over a few more.
+
+    Returns:
+        dict: ops_per_sec, p50_us, p99_us, mean_us, alloc_kib (bytes allocated per
+        call, net of what was freed again) and peak_kib (highest traced memory
+        during one call)
+    """
+    for _ in range(warmup):
+        fn()
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = []
+        started = time.perf_counter()
+        for _ in range(number):
+            t0 = time.perf_counter_ns()
+            fn()
+            samples.append(time.perf_counter_ns() - t0)
+        total = time.perf_counter() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        alloc = 0
+        peak = 0
+        for _ in range(max(1, alloc_runs)):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            after, run_peak = tracemalloc.get_traced_memory()
+            alloc += max(0, after - before)
+            peak = max(peak, run_peak - before)
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    return {
+        "calls": number,
+        "ops_per_sec": number / total if total else 0.0,
+        "mean_us": sum(samples) / len(samples) / 1e3,
+        "p50_us": _percentile(samples, 50) / 1e3,
+        "p99_us": _percentile(samples, 99) / 1e3,
+        "alloc_kib": alloc / max(1, alloc_runs) / 1024,
+        "peak_kib": peak / 1024,
+    }
+
+
+def report(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None):
+    header = f"{'benchmark':40} {'ops/s':>10} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>9}"
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    print(header)
+    for name, r in results.items():
+        line = f"{name:40} {r['ops_per_sec']:10.1f} {r['p50_us']:10.1f} {r['p99_us']:10.1f} {r['peak_kib']:9.1f}"
+        if baseline and name in baseline and baseline[name].get("p50_us"):
+            line += f" {r['p50_us'] / baseline[name]['p50_us']:11.2f}x"
+        print(line)
+
+
+def regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = 1.25,
+) -> List[str]:
+    """Benchmarks whose p50 grew by more than `threshold` times the baseline"""
+    slower = []
+    for name, r in results.items():
+        base = baseline.get(name, {}).get("p50_us")
+        if base and r["p50_us"] > base * threshold:
+            slower.append(f"{name}: p50 {base:.1f}us -> {r['p50_us']:.1f}us")
+    return slower
+
+
+def save(results: Dict[str, Dict[str, float]], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -39,8 +39,8 @@ def main():
     )
 
     with home_page:
-        # Pass XIPs so the Home tab can include them in Discover Devices
-        home_tab.tab(config, scorpions, mcms, switches, xips)
+        # Discover Devices reads its device list from config.json (src.health)
+        home_tab.tab(config)
 
     with scorpion_page:
         scorpions_tab.tab(scorpions, config.get("SCORPION_CONTROL_PORT", 80))
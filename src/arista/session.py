@@ -9,6 +9,7 @@ from typing import Optional
 import requests
 from pydantic import BaseModel, ConfigDict
 
+from src import httppool, telemetry
 from src.mcm.utils import Url
 
 PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -37,7 +38,7 @@ class Session(BaseModel):
         super().__init__(**kwargs)
 
         # self.token = self.config.get("SCORPION_TOKEN")
-        self.session = requests.Session()
+        self.session = httppool.session_for(self.scheme, self.host, self.port)
         self.session.headers = {
             "Authorization": f"Basic {self.encode_credentials('admin', 'ctUS1986!')}",
             "content-type": "application/json",
@@ -64,7 +65,6 @@ class Session(BaseModel):
         return encoded_credentials
 
     def _process_response(self, response):
-        print(response)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as exc:
@@ -82,14 +82,15 @@ class Session(BaseModel):
         return response.json()
 
     def _request(self, http_method: str, params=None, json_data=None, files=None):
-        print(self.url.to_string())
-        response = self.session.request(
-            http_method,
-            self.url.to_string(),
-            params=params,
-            json=json_data,
-            files=files,
-            timeout=self.timeout,
-        )
-
-        return self._process_response(response)
+        url = self.url.to_string()
+        endpoint = telemetry.endpoint_family(self.url.path, self.version)
+        with telemetry.timed("arista", self.host, http_method, endpoint, url) as outcome:
+            outcome["response"] = self.session.request(
+                http_method,
+                url,
+                params=params,
+                json=json_data,
+                files=files,
+                timeout=self.timeout,
+            )
+            return self._process_response(outcome["response"])
@@ -0,0 +1,145 @@
+"""Parse-once cache for the JSON files under config/
+
+Every Streamlit rerun and every device object used to open and parse
+config/config.json itself. load() parses each file once, hands out the same
+read-only snapshot to every caller and parses again only when the file's
+mtime, inode or size changes (an edit, or an atomic os.replace()).
+
+Snapshots are FrozenDict / FrozenList: dict and list subclasses, so json.dumps,
+isinstance checks and .get() work as before, but writes raise TypeError.
+thaw() (or copy.deepcopy) returns an ordinary mutable copy for code that edits
+the config before saving it.
+"""
+
+import copy
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.dirname(PARENT_DIR)
+
+CONFIG_PATH = f"{ROOT_DIR}/config/config.json"
+DEFAULT_PARAMS_PATH = f"{ROOT_DIR}/config/default_params.json"
+
+_MISSING = object()
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only; use configstore.thaw() for an editable copy")
+
+
+class FrozenDict(dict):
+    """Read-only dict snapshot of a config file"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """Read-only list inside a FrozenDict"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    __iadd__ = __imul__ = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return value if isinstance(value, FrozenDict) else FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return value if isinstance(value, FrozenList) else FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a snapshot (plain dicts and lists)"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return copy.deepcopy(value)
+
+
+_Stamp = Tuple[int, int, int]
+
+_LOCK = threading.Lock()
+_CACHE: Dict[str, Tuple[_Stamp, Any]] = {}
+_STATS = {"parses": 0, "hits": 0}
+
+
+def _stamp(path: str) -> _Stamp:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+
+def load(path: str = CONFIG_PATH, default: Any = _MISSING) -> Any:
+    """
+    Read-only snapshot of a JSON file, parsed again only when the file changes.
+
+    Args:
+        path: file to read (config/config.json by default)
+        default: returned (as is) when the file is missing or not valid JSON;
+            without it the OSError / ValueError is raised like open() + json.load()
+    """
+    path = os.path.realpath(path)
+    try:
+        stamp = _stamp(path)
+        with _LOCK:
+            cached = _CACHE.get(path)
+            if cached is not None and cached[0] == stamp:
+                _STATS["hits"] += 1
+                return cached[1]
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = freeze(json.load(f))
+    except (OSError, ValueError):
+        if default is _MISSING:
+            raise
+        return default
+    with _LOCK:
+        _STATS["parses"] += 1
+        # keep the stamp taken before reading: a write that lands mid-parse
+        # changes the file's stamp and forces another parse next time
+        _CACHE[path] = (stamp, snapshot)
+    return snapshot
+
+
+def config(default: Any = _MISSING) -> FrozenDict:
+    """Snapshot of config/config.json"""
+    return load(CONFIG_PATH, default)
+
+
+def invalidate(path: Optional[str] = None):
+    """Drop one cached file (or all of them) so the next load() parses again"""
+    with _LOCK:
+        if path is None:
+            _CACHE.clear()
+        else:
+            _CACHE.pop(os.path.realpath(path), None)
+
+
+def stats() -> Dict[str, int]:
+    with _LOCK:
+        return dict(_STATS, files=len(_CACHE))
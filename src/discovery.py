@@ -0,0 +1,151 @@
+"""Concurrent reachability sweep for every configured device
+
+Every host is probed at once from one asyncio loop, so a sweep takes about one
+timeout however many devices there are. A host is online as soon as any probe
+answers:
+
+    - TCP connect to one of its ports: an accept *or* a refusal (RST) proves the
+      host is up; the handshake time is the RTT
+    - one ICMP echo through the system ping (run as an asyncio subprocess, no
+      shell), for devices with nothing listening on the probed ports
+
+Hosts that have not answered when the deadline passes are offline.
+
+    sweep({"10.169.20.51": (80,), "10.244.243.201": (80, 443)}, timeout=1.0)
+    # {"10.169.20.51": {"online": True, "rtt_ms": 0.6, "via": "tcp:80"}, ...}
+"""
+
+import asyncio
+import errno
+import math
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_PORTS = (80, 443, 22)
+MAX_IN_FLIGHT = 512
+
+# errors meaning something at the address answered (so it is up)
+_ANSWERED = {errno.ECONNREFUSED, errno.ECONNRESET}
+
+
+async def _tcp(host: str, port: int, timeout: float) -> Optional[float]:
+    """Handshake time in ms, or None if nothing answered"""
+    started = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except OSError as exc:
+        if exc.errno in _ANSWERED:
+            return (time.perf_counter() - started) * 1e3
+        return None
+    except asyncio.TimeoutError:
+        return None
+    rtt = (time.perf_counter() - started) * 1e3
+    writer.close()
+    return rtt
+
+
+async def _icmp(host: str, timeout: float, ping_path: str) -> Optional[float]:
+    """Round trip in ms from one system ping, or None"""
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        # -W is whole seconds on older pings; the deadline below is what counts
+        ping_path, "-c", "1", "-n", "-W", str(max(1, math.ceil(timeout))), host,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        code = await asyncio.wait_for(process.wait(), timeout)
+    except asyncio.TimeoutError:
+        code = None
+    finally:
+        # also reached when the probe is cancelled because TCP answered first
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    return (time.perf_counter() - started) * 1e3 if code == 0 else None
+
+
+async def _probe(host: str, ports: Iterable[int], timeout: float, icmp: Optional[str],
+                 limit: asyncio.Semaphore) -> Dict[str, Any]:
+    async with limit:
+        probes = {asyncio.ensure_future(_tcp(host, port, timeout)): f"tcp:{port}" for port in ports}
+        if icmp:
+            probes[asyncio.ensure_future(_icmp(host, timeout, icmp))] = "icmp"
+        pending = set(probes)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    rtt = None if task.exception() else task.result()
+                    if rtt is not None:
+                        return {"online": True, "rtt_ms": round(rtt, 2), "via": probes[task]}
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    return {"online": False, "rtt_ms": None, "via": None}
+
+
+async def sweep_async(
+    targets: Dict[str, Iterable[int]],
+    timeout: float = DEFAULT_TIMEOUT,
+    use_icmp: bool = True,
+    max_in_flight: int = MAX_IN_FLIGHT,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Probe every host in targets ({host: ports}) concurrently.
+
+    The whole sweep is bounded by timeout plus a small grace period; any host
+    still unanswered then is reported offline.
+
+    Returns:
+        dict: {host: {"online": bool, "rtt_ms": float | None, "via": "tcp:<port>" | "icmp" | None}}
+    """
+    icmp = shutil.which("ping") if use_icmp else None
+    limit = asyncio.Semaphore(max(1, max_in_flight))
+    tasks = {
+        asyncio.ensure_future(_probe(host, tuple(ports), timeout, icmp, limit)): host
+        for host, ports in targets.items()
+    }
+    if not tasks:
+        return {}
+    # hosts beyond max_in_flight start a timeout later, so allow for the extra rounds
+    rounds = -(-len(tasks) // max(1, max_in_flight))
+    done, pending = await asyncio.wait(tasks, timeout=timeout * rounds + 0.5)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    offline = {"online": False, "rtt_ms": None, "via": None}
+    results = {}
+    for task, host in tasks.items():
+        if task in done and not task.exception():
+            results[host] = task.result()
+        else:
+            results[host] = dict(offline)
+    return results
+
+
+def sweep(
+    targets: Dict[str, Iterable[int]],
+    timeout: float = DEFAULT_TIMEOUT,
+    use_icmp: bool = True,
+    max_in_flight: int = MAX_IN_FLIGHT,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Blocking sweep_async() on its own event loop. Called from inside a running
+    loop (where asyncio.run() is refused) it runs on a helper thread instead;
+    async code should await sweep_async() directly.
+    """
+    coro = sweep_async(targets, timeout, use_icmp, max_in_flight)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="discovery-sweep") as pool:
+        return pool.submit(asyncio.run, coro).result()
@@ -0,0 +1,62 @@
+"""Runs a per-device operation across a fleet of devices concurrently"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def fleet_workers(config: Optional[dict], key: str, default: int = DEFAULT_MAX_WORKERS) -> int:
+    """Read a worker cap from config (eg "SCORPION_FLEET_WORKERS"), falling back to default."""
+    try:
+        value = int((config or {}).get(key, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(1, value)
+
+
+def run_fleet(
+    targets: Iterable[str],
+    operation: Callable[[str], Any],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Run operation(ip) for every target with at most max_workers hosts in flight.
+
+    Each host is isolated: an exception raised for one host is captured as that
+    host's {"error": ...} result and never affects the others.
+
+    Returns:
+        dict: {
+            "results": {ip: result, ...},   # same per-IP dict the tabs already render
+            "timings": {ip: seconds, ...},  # per-host duration
+            "elapsed": seconds,             # wall-clock for the whole fleet
+            "workers": n,
+        }
+    """
+    targets = list(dict.fromkeys(t for t in targets if t))
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+
+    def _one(ip: str):
+        start = time.perf_counter()
+        try:
+            res = operation(ip)
+        except Exception as exc:
+            res = {"error": str(exc)}
+        return res, time.perf_counter() - start
+
+    workers = max(1, min(int(max_workers or 1), len(targets) or 1))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fleet") as pool:
+        futures = {ip: pool.submit(_one, ip) for ip in targets}
+        for ip, fut in futures.items():
+            results[ip], timings[ip] = fut.result()
+
+    return {
+        "results": results,
+        "timings": {ip: round(t, 3) for ip, t in timings.items()},
+        "elapsed": round(time.perf_counter() - started, 3),
+        "workers": workers,
+    }
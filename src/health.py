@@ -0,0 +1,237 @@
+"""Background reachability monitor for every configured device
+
+One daemon thread per server process sweeps all devices from config.json
+(Scorpions, MCMs, switches and XIP3901s) every HEALTH_INTERVAL seconds with
+utils.discover_devices and keeps, per device, the latest status, RTT, when it
+was last seen online, how often it flapped and a short history. The Home tab
+renders from snapshot() instead of probing on the Streamlit script thread.
+
+    monitor = health.monitor()        # started on first call
+    monitor.snapshot()                # {"devices": {name: {...}}, "last_sweep": ..., ...}
+    monitor.refresh(wait=2.0)         # sweep now instead of at the next interval
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from src import configstore, utils
+
+DEFAULT_INTERVAL = 15.0
+DEFAULT_HISTORY = 120
+
+
+class DeviceHealth:
+    """Status history of one device"""
+
+    def __init__(self, name: str, ip: str, history: int):
+        self.name = name
+        self.ip = ip
+        self.online: Optional[bool] = None
+        self.rtt_ms: Optional[float] = None
+        self.via: Optional[str] = None
+        self.last_checked: Optional[float] = None
+        self.last_seen: Optional[float] = None
+        self.changed: Optional[float] = None
+        self.flaps = 0
+        # (timestamp, online, rtt_ms)
+        self.history: Deque[Tuple[float, bool, Optional[float]]] = deque(maxlen=history)
+
+    def update(self, result: Dict[str, Any], now: float):
+        online = bool(result.get("online"))
+        if self.online is not None and online != self.online:
+            self.flaps += 1
+        if online != self.online:
+            self.changed = now
+        self.online = online
+        self.rtt_ms = result.get("rtt_ms")
+        self.via = result.get("via")
+        self.ip = result.get("ip", self.ip)
+        self.last_checked = now
+        if online:
+            self.last_seen = now
+        self.history.append((now, online, self.rtt_ms))
+
+    def as_dict(self) -> Dict[str, Any]:
+        samples = [rtt for _, online, rtt in self.history if online and rtt is not None]
+        return {
+            "ip": self.ip,
+            "online": self.online,
+            "rtt_ms": self.rtt_ms,
+            "via": self.via,
+            "last_checked": self.last_checked,
+            "last_seen": self.last_seen,
+            "changed": self.changed,
+            "flaps": self.flaps,
+            "availability": (
+                round(sum(1 for _, online, _ in self.history if online) / len(self.history), 3)
+                if self.history else None
+            ),
+            "rtt_avg_ms": round(sum(samples) / len(samples), 2) if samples else None,
+            "history": list(self.history),
+        }
+
+
+class HealthMonitor:
+    """Periodic sweep of all configured devices on a daemon thread"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, timeout: Optional[float] = None,
+                 history: int = DEFAULT_HISTORY):
+        self.interval = interval
+        self.timeout = timeout
+        self.history = history
+        self.devices: Dict[str, DeviceHealth] = {}
+        self.sweeps = 0
+        self._sweeping = 0
+        self.last_sweep: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._swept = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- lifecycle ----
+    def start(self) -> "HealthMonitor":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, wait: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(wait)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self, wait: Optional[float] = None) -> bool:
+        """
+        Sweep now rather than at the next interval.
+
+        Args:
+            wait: seconds to block for that sweep to finish (None returns at once)
+
+        Returns:
+            bool: True if a sweep finished within wait (always False without wait,
+            unless the thread isn't running and the sweep ran right here)
+        """
+        if not self.running:
+            self.sweep()
+            return True
+        with self._lock:
+            # a sweep already under way started before this request (it may have
+            # read config.json or probed a device already); wait for the next one
+            target = self.sweeps + (2 if self._sweeping else 1)
+        self._wake.set()
+        if not wait:
+            return False
+        deadline = time.monotonic() + wait
+        with self._swept:
+            while self.sweeps < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._swept.wait(remaining)
+        return True
+
+    def configure(self, interval: float, history: int):
+        """New interval / history length; the interval applies from the next wait"""
+        with self._lock:
+            self.interval = interval
+            if history != self.history:
+                self.history = history
+                for device in self.devices.values():
+                    device.history = deque(device.history, maxlen=history)
+
+    # ---- polling ----
+    def _run(self):
+        while not self._stop.is_set():
+            # cleared before sweeping, so a refresh() asked for mid-sweep gets its own
+            self._wake.clear()
+            self.sweep()
+            if self.interval <= 0:
+                # polling switched off (HEALTH_INTERVAL 0); monitor() starts it again
+                break
+            self._wake.wait(self.interval)
+
+    def sweep(self):
+        """One pass over every configured device (normally called by the thread)"""
+        with self._lock:
+            self._sweeping += 1
+        started = time.monotonic()
+        error = None
+        results: Dict[str, Dict[str, Any]] = {}
+        try:
+            config, scorpions, mcms, switches, _ = utils.get_config()
+            xips = utils.get_xip3901_unit_list(config)
+            results = utils.discover_devices(
+                scorpions, mcms, switches, xips=xips, timeout=self.timeout, details=True
+            )
+        except Exception as exc:
+            # a bad config.json must not kill the thread; the next sweep retries
+            error = str(exc)
+        now = time.time()
+        with self._swept:
+            for name, result in results.items():
+                device = self.devices.get(name)
+                if device is None:
+                    device = self.devices[name] = DeviceHealth(name, result.get("ip", ""), self.history)
+                device.update(result, now)
+            if not error:
+                # devices removed from config.json drop out of the snapshot
+                for name in [n for n in self.devices if n not in results]:
+                    del self.devices[name]
+            self.sweeps += 1
+            self._sweeping -= 1
+            self.last_sweep = now
+            self.last_duration = time.monotonic() - started
+            self.last_error = error
+            self._swept.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "interval": self.interval,
+                "sweeps": self.sweeps,
+                "last_sweep": self.last_sweep,
+                "last_duration": self.last_duration,
+                "last_error": self.last_error,
+                "devices": {name: device.as_dict() for name, device in self.devices.items()},
+            }
+
+
+_MONITOR: Optional[HealthMonitor] = None
+_MONITOR_LOCK = threading.Lock()
+
+
+def monitor(start: bool = True) -> HealthMonitor:
+    """
+    The process-wide monitor, created on first use.
+
+    HEALTH_INTERVAL (seconds, default 15) and HEALTH_HISTORY (samples kept per
+    device, default 120) come from config.json and are read again on every call,
+    so an edit applies from the next Home render; an interval of 0 stops (or
+    never starts) the thread, so devices are only probed on refresh()/sweep().
+    """
+    global _MONITOR
+    config = configstore.config(default={})
+    interval = float(config.get("HEALTH_INTERVAL", DEFAULT_INTERVAL))
+    history = int(config.get("HEALTH_HISTORY", DEFAULT_HISTORY))
+    with _MONITOR_LOCK:
+        if _MONITOR is None:
+            _MONITOR = HealthMonitor(interval=interval, history=history)
+        else:
+            _MONITOR.configure(interval, history)
+        if start and _MONITOR.interval > 0:
+            _MONITOR.start()
+        return _MONITOR
@@ -0,0 +1,125 @@
+"""Process-wide keep-alive connection pools shared by every device Session
+
+A Session object is built per device per button press (and per fleet worker),
+so a plain requests.Session() would reconnect every time. session_for() gives
+each Session its own requests.Session (headers, auth) but mounts the shared
+HTTPAdapter for its (scheme, host, port), whose urllib3 pool keeps warm
+connections between operations.
+
+Pool sizes come from HTTP_POOL in config/config.json:
+
+    "HTTP_POOL": {"maxsize": 8, "block": false}
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src import configstore
+
+DEFAULT_MAXSIZE = 8
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+PoolKey = Tuple[str, str, int]
+
+_ADAPTERS: Dict[PoolKey, HTTPAdapter] = {}
+_ADAPTERS_LOCK = threading.Lock()
+
+
+def _settings() -> Dict[str, Any]:
+    settings = configstore.config(default={}).get("HTTP_POOL")
+    return settings if isinstance(settings, dict) else {}
+
+
+def pool_key(scheme: Optional[str], host: str, port: Optional[int] = None) -> PoolKey:
+    scheme = (scheme or "http").lower()
+    return scheme, str(host).lower(), int(port or DEFAULT_PORTS.get(scheme, 80))
+
+
+def _prefixes(key: PoolKey):
+    scheme, host, port = key
+    yield f"{scheme}://{host}:{port}/"
+    if port == DEFAULT_PORTS.get(scheme):
+        # UrlBuilder leaves the default port out of the URL
+        yield f"{scheme}://{host}/"
+
+
+def adapter_for(scheme: Optional[str], host: str, port: Optional[int] = None) -> HTTPAdapter:
+    """Return the shared adapter for one device, creating it on first use"""
+    key = pool_key(scheme, host, port)
+    adapter = _ADAPTERS.get(key)
+    if adapter is not None:
+        return adapter
+    with _ADAPTERS_LOCK:
+        if key not in _ADAPTERS:
+            settings = _settings()
+            _ADAPTERS[key] = HTTPAdapter(
+                # one device per adapter, but urllib3 keeps a separate pool per
+                # TLS setting (the JWT calls pass verify=False); don't let them evict
+                pool_connections=4,
+                pool_maxsize=int(settings.get("maxsize", DEFAULT_MAXSIZE)),
+                pool_block=bool(settings.get("block", False)),
+            )
+        return _ADAPTERS[key]
+
+
+def mount(session: requests.Session, scheme: Optional[str], host: str, port: Optional[int] = None) -> requests.Session:
+    """Route session's requests to the device through its shared adapter"""
+    key = pool_key(scheme, host, port)
+    adapter = adapter_for(*key)
+    for prefix in _prefixes(key):
+        session.mount(prefix, adapter)
+    return session
+
+
+def session_for(scheme: Optional[str], host: Optional[str], port: Optional[int] = None) -> requests.Session:
+    """
+    A new requests.Session whose connections to host come from the shared pool.
+
+    Headers set on the returned session stay private to it. Don't close() it:
+    that would close the shared adapter for every other Session too.
+    """
+    session = requests.Session()
+    if host:
+        mount(session, scheme, host, port)
+    return session
+
+
+def stats(hosts=None) -> Dict[str, Dict[str, int]]:
+    """Connections opened, requests sent and idle (kept-alive) connections per device pool"""
+    with _ADAPTERS_LOCK:
+        adapters = dict(_ADAPTERS)
+    wanted = set(hosts) if hosts is not None else None
+    result = {}
+    for (scheme, host, port), adapter in adapters.items():
+        if wanted is not None and host not in wanted:
+            continue
+        opened = sent = idle = 0
+        manager = adapter.poolmanager
+        for pool_key_ in list(manager.pools.keys()):
+            pool = manager.pools.get(pool_key_)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            sent += pool.num_requests
+            if pool.pool is not None:
+                # the queue holds None for slots that were never filled
+                idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        result[f"{scheme}://{host}:{port}"] = {
+            "maxsize": adapter._pool_maxsize,
+            "connections_opened": opened,
+            "requests": sent,
+            "idle": idle,
+        }
+    return result
+
+
+def clear(hosts=None):
+    """Close pooled connections (all devices, or only the given hosts)"""
+    with _ADAPTERS_LOCK:
+        keys = [k for k in _ADAPTERS if hosts is None or k[1] in set(hosts)]
+        adapters = [_ADAPTERS.pop(k) for k in keys]
+    for adapter in adapters:
+        adapter.close()
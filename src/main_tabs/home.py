@@ -1,7 +1,9 @@
 import os
+import time
+
 import streamlit as st
 
-import src.utils as utils
+from src import health
 
 PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
 ROOT_DIR = os.path.dirname(PARENT_DIR)
@@ -21,7 +23,18 @@ def _norm_url(v: str | None) -> str | None:
     return f"http://{v}"
 
 
-def tab(config, scorpions, mcms, switches, xips):
+def _ago(ts: float | None) -> str:
+    if ts is None:
+        return "never"
+    seconds = max(0, int(time.time() - ts))
+    if seconds < 60:
+        return f"{seconds}s ago"
+    if seconds < 3600:
+        return f"{seconds // 60}m ago"
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(ts))
+
+
+def tab(config):
     # Safely read LINKS map
     links = (config.get("LINKS") or {}) if isinstance(config, dict) else {}
 
@@ -41,17 +54,35 @@ def tab(config, scorpions, mcms, switches, xips):
             # Disabled placeholder to keep layout consistent when a link is missing
             col.button(label, disabled=True, use_container_width=True)
 
-    # Device discovery (includes XIP3901s)
+    # Device status (includes XIP3901s), kept current by the background monitor
     st.header("Discover Devices")
-    discover = st.button("Discover", key="discover_devices")
-    device_status = {}
-    if discover:
+    monitor = health.monitor()
+    if st.button("Discover", key="discover_devices", help="Sweep every device now instead of waiting for the next poll"):
         with st.spinner("Discovering Devices..."):
-            device_status = utils.discover_devices(scorpions, mcms, switches, xips=xips)
-
-    if device_status:
-        for unit, status in device_status.items():
-            st.markdown(
-                f"<span style='color:{'green' if status else 'red'};'>{unit}: {'Online' if status else 'Offline'}</span>",
-                unsafe_allow_html=True,
-            )
\ No newline at end of file
+            monitor.refresh(wait=5.0)
+
+    snapshot = monitor.snapshot()
+    if snapshot["last_sweep"] is None:
+        st.caption("First sweep in progress...")
+    else:
+        st.caption(
+            f"Last sweep {_ago(snapshot['last_sweep'])} ({snapshot['last_duration']:.1f}s), "
+            f"polling every {snapshot['interval']:g}s"
+        )
+    if snapshot["last_error"]:
+        st.warning(f"Last sweep failed: {snapshot['last_error']}")
+
+    for unit, status in snapshot["devices"].items():
+        online = status["online"]
+        details = []
+        if online and status["rtt_ms"] is not None:
+            details.append(f"{status['rtt_ms']:.1f} ms")
+        if not online:
+            details.append(f"last seen {_ago(status['last_seen'])}")
+        if status["flaps"]:
+            details.append(f"{status['flaps']} flap{'s' if status['flaps'] != 1 else ''}")
+        suffix = f" ({', '.join(details)})" if details else ""
+        st.markdown(
+            f"<span style='color:{'green' if online else 'red'};'>{unit}: {'Online' if online else 'Offline'}{suffix}</span>",
+            unsafe_allow_html=True,
+        )
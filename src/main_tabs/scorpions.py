@@ -11,6 +11,8 @@ import shlex
 import streamlit as st
 import base64
 
+from src import configstore, httppool, ratelimit, telemetry
+from src.fleet import fleet_workers
 from src.utils import ping as ping_host
 
 # --- Ping UI helpers (use utils.ping for reachability) ---
@@ -74,9 +76,13 @@ def _show_ping_fail(ip: str):
 # Robust import of Scorpion defaults; keep working UI if it fails
 try:
     from src.scorpion.default import Defaults as ScorpionDefaults
+    from src.scorpion import fleet as scorpion_fleet
+    from src.scorpion import plan as scorpion_plan
     _IMPORT_ERROR = None
 except Exception as e:  # keep the exception for display
     ScorpionDefaults = None
+    scorpion_fleet = None
+    scorpion_plan = None
     _IMPORT_ERROR = e
 
 # ----- Robust repo paths -----
@@ -94,8 +100,7 @@ def _load_config() -> Dict[str, Any]:
     for p in _CONFIG_CANDIDATES:
         try:
             if os.path.isfile(p):
-                with open(p, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return configstore.load(p)
         except Exception as e:
             st.warning(f"Failed reading config at {p}: {e}")
     st.error(
@@ -152,21 +157,6 @@ def _build_trunk_params(cfg: Dict[str, Any]) -> Dict[str, str]:
     return params
 
 
-def _call_optional_defaults_apply(d: ScorpionDefaults) -> Tuple[str, Any]:
-    """
-    Preferred: apply_all_defaults()
-    Fallbacks: apply_defaults(), apply_all(), apply_default_params()
-    """
-    for method in ("apply_all_defaults", "apply_defaults", "apply_all", "apply_default_params"):
-        if hasattr(d, method) and callable(getattr(d, method)):
-            try:
-                res = getattr(d, method)()
-                return (method, res)
-            except Exception as exc:
-                return (method, {"error": str(exc)})
-    return ("none", {"info": "No default-apply method found; only routes/trunks were applied."})
-
-
 def _build_option_labels(scorpions: List[str] | Dict[str, str]) -> Tuple[List[str], Dict[str, str]]:
     """
     Returns (labels, label->ip) for the multiselect.
@@ -297,44 +287,52 @@ def tab(scorpions: List[str] | Dict[str, str], control_port: int = 80):
     import_ok = ScorpionDefaults is not None
 
     with col1:
+        workers = st.number_input(
+            "Parallel devices",
+            min_value=1,
+            max_value=64,
+            value=fleet_workers(config, "SCORPION_FLEET_WORKERS"),
+            step=1,
+            help="How many Scorpions 'Set Defaults' talks to at once (config: SCORPION_FLEET_WORKERS)",
+            key="scorp_fleet_workers",
+        )
+        delta = st.checkbox(
+            "Only push changed parameters",
+            value=False,
+            help="Read each device first and skip keys that already hold the default value",
+            key="scorp_delta_apply",
+        )
         if st.button("Set Defaults (safe)", disabled=(not targets) or (not import_ok)):
-            results = {}
-            for ip in targets:
-                d = ScorpionDefaults(name=f"SC@{ip}", host=ip, port=control_port)
-
-                # Prefer the consolidated method if present (now implemented):
-                if hasattr(d, "apply_all_defaults") and callable(getattr(d, "apply_all_defaults")):
-                    try:
-                        results[ip] = d.apply_all_defaults()
-                    except Exception as exc:
-                        results[ip] = {"error": str(exc)}
-                else:
-                    # Fallback: do the safe sequence manually (older builds)
-                    try:
-                        route_res = d.set_default_routes(test=False)
-                    except Exception as exc:
-                        route_res = {"error": f"routes: {exc}"}
-
-                    trunk_params = _build_trunk_params(config)
-                    try:
-                        if hasattr(d, "_send_params") and callable(getattr(d, "_send_params")):
-                            resp, fails = d._send_params(trunk_params)
-                            trunk_apply = {"applied": resp, "fails": fails}
-                        else:
-                            trunk_apply = {"error": "Defaults._send_params not available"}
-                    except Exception as exc:
-                        trunk_apply = {"error": str(exc)}
-
-                    method_used, def_res = _call_optional_defaults_apply(d)
-
-                    results[ip] = {
-                        "routes": route_res,
-                        "trunks": trunk_apply,
-                        "defaults_apply_method": method_used,
-                        "defaults_apply_result": def_res,
-                    }
-
-            st.json(results)
+            telemetry.reset(targets)
+            with st.spinner(f"Applying defaults to {len(targets)} device(s)..."):
+                fleet = scorpion_fleet.apply_all_defaults(
+                    targets, port=control_port, max_workers=int(workers), delta=delta
+                )
+            st.caption(
+                f"Finished {len(targets)} device(s) in {fleet['elapsed']:.1f}s "
+                f"with {fleet['workers']} worker(s)"
+            )
+            with st.expander("Per-device timings (s)", expanded=False):
+                st.json(fleet["timings"])
+            with st.expander("Rate limiter (requests throttled per device)", expanded=False):
+                st.json(ratelimit.stats(targets))
+            with st.expander("Connection pool (connections opened vs requests sent)", expanded=False):
+                st.json(httppool.stats(targets))
+            with st.expander("Request latency per device (p50/p95 ms, error rate)", expanded=False):
+                st.json(telemetry.summary(targets, family="scorpion"))
+                st.dataframe(telemetry.endpoints(targets, family="scorpion"), use_container_width=True)
+            st.json(fleet["results"])
+
+        if st.button(
+            "Resume last apply",
+            disabled=(not targets) or (not import_ok),
+            help="Send only the parameters the last 'Set Defaults' run could not deliver",
+            key="scorp_resume_apply",
+        ):
+            with st.spinner(f"Resuming {len(targets)} device(s)..."):
+                fleet = scorpion_fleet.resume_all(targets, port=control_port, max_workers=int(workers))
+            st.caption(f"Finished {len(targets)} device(s) in {fleet['elapsed']:.1f}s")
+            st.json(fleet["results"])
 
     with col2:
         if st.button("Apply Trunk A/B to selected", disabled=(not targets) or (not import_ok)):
@@ -361,4 +359,24 @@ def tab(scorpions: List[str] | Dict[str, str], control_port: int = 80):
                 results[ip] = res
             st.json(results)
 
-    st.caption("Tip: use the Config Manager page to edit SCORPION_TRUNKS prefixes/suffixes and save first.")
\ No newline at end of file
+    st.caption("Tip: use the Config Manager page to edit SCORPION_TRUNKS prefixes/suffixes and save first.")
+
+    # ---- Fleet address plan ----
+    st.subheader("Address plan")
+    st.caption(
+        "Precompute the expanded defaults (2110 IPs/UDPs, labels, trunks) for every Scorpion "
+        "in SCORPION_RANGE / SCORPION_LIST. Applies use it while config and defaults are unchanged."
+    )
+    if st.button("Build address plan", disabled=not import_ok, key="scorp_build_plan"):
+        try:
+            header = scorpion_plan.write_plan(config=config)
+            st.success(f"Planned {header['devices']} device(s) → {header['path']}")
+        except Exception as exc:
+            st.error(f"Plan failed: {exc}")
+    if import_ok:
+        plan_file = scorpion_plan.load_plan()
+        if plan_file is not None:
+            with st.expander(f"Plan built {plan_file.header.get('created', '?')} ({len(plan_file.offsets)} devices)"):
+                plan_ip = st.selectbox("Device", options=list(plan_file.offsets), key="scorp_plan_ip")
+                if plan_ip:
+                    st.json(plan_file.get(plan_ip))
\ No newline at end of file
@@ -11,6 +11,7 @@ import shlex
 import streamlit as st
 import base64
 
+from src import configstore, telemetry
 from src.utils import ping as ping_host
 
 # --- Ping UI helpers (use utils.ping for reachability) ---
@@ -73,9 +74,11 @@ def _show_ping_fail(ip: str):
 
 try:
     from src.xip3901.default import Defaults as XipDefaults
+    from src.xip3901 import fleet as xip_fleet
     _IMPORT_ERROR = None
 except Exception as e:
     XipDefaults = None
+    xip_fleet = None
     _IMPORT_ERROR = e
 
 _THIS_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -91,8 +94,7 @@ def _load_config() -> Dict[str, Any]:
     for p in _CONFIG_CANDIDATES:
         try:
             if os.path.isfile(p):
-                with open(p, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return configstore.load(p)
         except Exception as e:
             st.warning(f"Failed reading config at {p}: {e}")
     st.error("config.json not found.\n" + "\n".join(f"• {p}" for p in _CONFIG_CANDIDATES))
@@ -221,29 +223,48 @@ def tab(xips: List[str] | Dict[str, str], control_port: int = 80):
                     previews[ip] = {"error": f"preview failed: {exc}"}
             st.json(previews)
 
+    # Drift audit: read everything back and compare with the plan above
+    with st.expander("Audit devices against plan (drift check)", expanded=False):
+        if st.button("Run audit", disabled=not targets, key="xip_audit"):
+            with st.spinner(f"Reading back {len(targets)} device(s)..."):
+                fleet = xip_fleet.audit(targets, port=control_port)
+            reports = fleet["results"]
+            clean = [ip for ip, r in reports.items() if r.get("ok")]
+            st.caption(
+                f"Checked {len(targets)} device(s) in {fleet['elapsed']:.1f}s: "
+                f"{len(clean)} match the plan, {len(targets) - len(clean)} drifted or unreadable"
+            )
+            st.json({
+                ip: r if "error" in r else {
+                    "drifted": r["drifted"], "unreadable": r["unreadable"],
+                    "drift": r["drift"], "errors": r["errors"],
+                }
+                for ip, r in reports.items() if not r.get("ok")
+            })
+
     st.divider()
 
     # Apply actions (multi-target)
     row1 = st.columns([1, 1, 1, 1, 1])
     with row1[0]:
+        verify = st.checkbox("Verify each unit (drift audit)", value=True, key="xip_rollout_verify")
         if st.button("Apply ALL defaults (safe sequence)", disabled=not targets, key="xip_apply_all"):
-            results = {}
-            for ip in targets:
-                d = XipDefaults(name=f"XIP@{ip}", host=ip, port=control_port)
-                try:
-                    if hasattr(d, "apply_all_defaults"):
-                        results[ip] = d.apply_all_defaults()
-                    else:
-                        results[ip] = {
-                            "hostname": d.apply_network_and_hostname(),
-                            "interfaces": d.apply_interfaces(),
-                            "nmos_ptp": d.apply_nmos_and_ptp(),
-                            "senders": d.apply_senders(),
-                            "advanced_qos": d.apply_advanced_qos(),
-                        }
-                except Exception as exc:
-                    results[ip] = {"error": str(exc)}
-            st.json(results)
+            # canary first, then waves; stops on a failed canary or a bad wave
+            with st.spinner(f"Rolling out to {len(targets)} device(s), starting with {targets[0]}..."):
+                rollout = xip_fleet.rollout(targets, port=control_port, verify=verify)
+            for wave in rollout["waves"]:
+                st.caption(
+                    f"{wave['stage']}: {len(wave['hosts'])} device(s), {len(wave['failed'])} failed, "
+                    f"{wave['elapsed']:.1f}s"
+                )
+            if rollout["halted"]:
+                st.warning(
+                    f"Rollout stopped ({rollout['halted']}); "
+                    f"not applied: {', '.join(rollout['skipped']) or '(none)'}"
+                )
+            else:
+                st.success(f"Rolled out to {len(targets)} device(s) in {rollout['elapsed']:.1f}s")
+            st.json(rollout["results"])
     
     with row1[1]:
         if st.button("Apply Interfaces + Hostname", disabled=not targets, key="xip_apply_if_host"):
@@ -271,14 +292,13 @@ def tab(xips: List[str] | Dict[str, str], control_port: int = 80):
 
     with row1[3]:
         if st.button("Apply 2110 Senders", disabled=not targets, key="xip_apply_senders"):
-            results = {}
-            for ip in targets:
-                d = XipDefaults(name=f"XIP@{ip}", host=ip, port=control_port)
-                try:
-                    results[ip] = d.apply_senders()
-                except Exception as exc:
-                    results[ip] = {"error": str(exc)}
-            st.json(results)
+            with st.spinner(f"Pushing senders to {len(targets)} device(s)..."):
+                fleet = xip_fleet.apply_senders(targets, port=control_port)
+            st.caption(
+                f"Finished {len(targets)} device(s) in {fleet['elapsed']:.1f}s "
+                f"with {fleet['workers']} worker(s)"
+            )
+            st.json(fleet["results"])
 
     with row1[4]:
         if st.button("Apply Advanced QoS", disabled=not targets, key="xip_apply_qos"):
@@ -289,4 +309,10 @@ def tab(xips: List[str] | Dict[str, str], control_port: int = 80):
                     results[ip] = d.apply_advanced_qos()
                 except Exception as exc:
                     results[ip] = {"error": str(exc)}
-            st.json(results)
\ No newline at end of file
+            st.json(results)
+
+    # Per-device request timings recorded by the Session (all applies since start-up)
+    with st.expander("Request latency per device", expanded=False):
+        st.json(telemetry.summary(targets, family="xip3901"))
+        if st.button("Reset timings", disabled=not targets, key="xip_reset_timings"):
+            telemetry.reset(targets)
@@ -2,6 +2,7 @@ import streamlit as st
 import json
 import os
 import src.utils as utils
+from src import configstore
 
 # ... your existing code (including get_config) ...
 PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -20,6 +21,8 @@ def config_editor():
     st.header("Configuration Editor")
 
     config, scorpions, mcm_list, switch_list, aristas = utils.get_config()
+    # edited in place below before saving
+    config = configstore.thaw(config)
 
     st.subheader("LINKS")
     for link_name, link_value in config["LINKS"].items():
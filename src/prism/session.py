@@ -10,6 +10,9 @@ import requests
 from pydantic import BaseModel, ConfigDict
 
 from src.mcm.utils import Url
+from src import httppool, telemetry
+from src.ratelimit import limiter_for
+from src.urlbuilder import UrlBuilder
 
 PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
 SRC_DIR = os.path.dirname(PARENT_DIR)
@@ -29,6 +32,7 @@ class Session(BaseModel):
     max_records_per_request: int = 100
     session: Optional[requests.Session] = None
     url: Optional[str] = None
+    urls: Optional[UrlBuilder] = None
     timeout: float = 2
     config: dict = None
     token: str = None
@@ -37,7 +41,7 @@ class Session(BaseModel):
         super().__init__(**kwargs)
 
         # self.token = self.config.get("SCORPION_TOKEN")
-        self.session = requests.Session()
+        self.session = httppool.session_for(self.scheme, self.host, self.port)
         # self.session.headers={
         #     "Authorization": f"Basic {self.encode_credentials('Admin', 'Admin')}",
         #     "content-type":"application/json"
@@ -47,6 +51,7 @@ class Session(BaseModel):
             host=self.host,
             port=self.port,
         )
+        self.urls = UrlBuilder(scheme=self.scheme, host=self.host, port=self.port)
 
 
     def encode_credentials(self, username, password):
@@ -66,7 +71,6 @@ class Session(BaseModel):
 
  
     def _process_response(self, response):
-        print(response)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as exc:
@@ -84,14 +88,16 @@ class Session(BaseModel):
         return response.json()
 
     def _request(self, http_method: str, params=None, json_data=None, files=None):
-
-        response = self.session.request(
-            http_method,
-            self.url.to_string(),
-            params=params,
-            json=json_data,
-            files=files,
-            timeout=self.timeout,
-        )
-
-        return self._process_response(response)
+        limiter_for(self.host, "prism").acquire()
+        url = self.urls.build(self.url.path, self.url.query)
+        endpoint = telemetry.endpoint_family(self.url.path, self.version)
+        with telemetry.timed("prism", self.host, http_method, endpoint, url) as outcome:
+            outcome["response"] = self.session.request(
+                http_method,
+                url,
+                params=params,
+                json=json_data,
+                files=files,
+                timeout=self.timeout,
+            )
+            return self._process_response(outcome["response"])
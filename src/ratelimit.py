@@ -0,0 +1,140 @@
+"""Per-device token-bucket rate limiting shared by every device Session"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from src import configstore
+
+# requests/second and burst per device when config.json sets neither. The
+# Sessions' legacy api_limit (1/4 s) was never enforced and isn't used here:
+# 4 requests/s would serialise the concurrent readback.
+DEFAULT_RATE = 50.0
+DEFAULT_BURST = 16
+
+
+class TokenBucket:
+    """Token bucket allowing `burst` back-to-back requests, refilled at `rate` per second.
+
+    Waiting callers reserve their token up front, so sync (threads) and async
+    callers can share one bucket and are released in arrival order.
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = DEFAULT_BURST):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def configure(self, rate: float, burst: int):
+        """Change rate and burst in place, keeping the tokens already earned (up to the new burst)"""
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = max(1, int(burst))
+            self._tokens = min(self._tokens, float(self.burst))
+
+    def _reserve(self) -> float:
+        with self._lock:
+            self.requests += 1
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self.rate
+            self.throttled += 1
+            self.waited += wait
+            return wait
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds waited"""
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """acquire() for coroutines; sleeps without blocking the event loop"""
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waited_s": round(self.waited, 3),
+            }
+
+
+# (family, host) -> (config snapshot the settings came from, bucket)
+_BUCKETS: Dict[Tuple[str, str], Tuple[Any, TokenBucket]] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def _settings(family: str, config) -> Dict[str, Any]:
+    """API_RATE_LIMIT from config.json, overridden by <FAMILY>_RATE_LIMIT (eg SCORPION_RATE_LIMIT)."""
+    settings: Dict[str, Any] = {}
+    for key in ("API_RATE_LIMIT", f"{family.upper()}_RATE_LIMIT"):
+        if isinstance(config.get(key), dict):
+            settings.update(config[key])
+    return settings
+
+
+def limiter_for(host: str, family: str) -> TokenBucket:
+    """
+    Return the process-wide bucket for a device, creating it on first use.
+
+    Args:
+        host: device address; every Session of the same family talking to it shares the bucket
+        family: device type used for the config override ("scorpion", "xip3901", "mcm", "prism")
+
+    Rate and burst are read again whenever config.json changes (configstore hands
+    out a new snapshot), so an edited limit applies without a restart.
+    """
+    key = (family, host)
+    snapshot = configstore.config(default={})
+    entry = _BUCKETS.get(key)
+    if entry is not None and entry[0] is snapshot:
+        return entry[1]
+    with _BUCKETS_LOCK:
+        entry = _BUCKETS.get(key)
+        if entry is not None and entry[0] is snapshot:
+            return entry[1]
+        settings = _settings(family, snapshot)
+        rate = float(settings.get("rate", DEFAULT_RATE))
+        burst = int(settings.get("burst", DEFAULT_BURST))
+        if entry is None:
+            bucket = TokenBucket(rate=rate, burst=burst)
+        else:
+            bucket = entry[1]
+            bucket.configure(rate, burst)
+        _BUCKETS[key] = (snapshot, bucket)
+        return bucket
+
+
+def stats(hosts=None) -> Dict[str, Dict[str, Any]]:
+    """Throttling counters per device, optionally only for the given hosts"""
+    with _BUCKETS_LOCK:
+        buckets = [(family, host, bucket) for (family, host), (_, bucket) in _BUCKETS.items()]
+    wanted = set(hosts) if hosts is not None else None
+    out: Dict[str, Dict[str, Any]] = {}
+    for family, host, bucket in buckets:
+        if wanted is not None and host not in wanted:
+            continue
+        name = host if host not in out else f"{host} ({family})"
+        out[name] = dict(bucket.stats(), family=family)
+    return out
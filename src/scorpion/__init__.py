@@ -1,4 +1,4 @@
 # src/scorpion/__init__.py
 # Lightweight package init to avoid side effects during submodule imports.
 
-__all__ = ["api", "default", "session", "utils"]
\ No newline at end of file
+__all__ = ["api", "default", "fleet", "journal", "plan", "session", "tokens", "utils"]
\ No newline at end of file
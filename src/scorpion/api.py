@@ -1,10 +1,14 @@
 """API Interface to Evertz Scorpion"""
 
-from src.scorpion.session import Session
+from src.scorpion.session import AsyncSession, Session
 
 
 class Call(Session):
-    """Creates a requests session to the Evertz Scorpion api"""
+    """Creates a requests session to the Evertz Scorpion api
+
+    Path and query are passed to _request() per call rather than stored on the
+    object, so one Call can be shared by many worker threads.
+    """
 
     def get(self, path, query=None):
         """GET request
@@ -18,9 +22,7 @@ class Call(Session):
             session.get("6501.1.0")
         """
 
-        self.url.path = f"{self.version}EV/GET/parameter/{path}"
-        self.url.query = query
-        return self._request("GET")
+        return self._request("GET", f"{self.version}EV/GET/parameter/{path}", query)
 
     def post(self, query=None):
         """POST request
@@ -30,6 +32,34 @@ class Call(Session):
         Returns:
             dict: The response from the server as a dictionary
         """
-        self.url.path = f"{self.version}EV/SET/parameter"
-        self.url.query = query
-        return self._request("GET")
+        return self._request("GET", f"{self.version}EV/SET/parameter", query)
+
+
+class AsyncCall(AsyncSession):
+    """Creates an aiohttp session to the Evertz Scorpion api
+
+    Same get/post surface as Call, but both are coroutines:
+
+        async with AsyncCall(host="10.169.20.51", port=80) as scorpion:
+            await scorpion.get("6501.1.0")
+    """
+
+    async def get(self, path, query=None):
+        """GET request
+        Args:
+            path (str): The path to the endpoint
+            query (dict): Optional The query parameters to be sent with the request
+        Returns:
+            dict: The response from the server as a dictionary
+        """
+
+        return await self._request("GET", f"{self.version}EV/GET/parameter/{path}", query)
+
+    async def post(self, query=None):
+        """POST request
+        Args:
+            query (dict): OptionalThe query parameters to be sent with the request
+        Returns:
+            dict: The response from the server as a dictionary
+        """
+        return await self._request("GET", f"{self.version}EV/SET/parameter", query)
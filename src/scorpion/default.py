@@ -4,22 +4,281 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Tuple, Optional
 
+import asyncio
+import errno
 import json
 import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from math import ceil
 from copy import deepcopy
+from urllib.parse import quote_plus
 
-from requests.exceptions import RequestException
-from src.scorpion.api import Call
+import aiohttp
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, RequestException, Timeout
+from urllib3.exceptions import ProtocolError
+from src import configstore
+from src.scorpion.api import AsyncCall, Call
+from src.scorpion.journal import ApplyJournal
 
 PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
 SRC_DIR = os.path.dirname(PARENT_DIR)
 ROOT_DIR = os.path.dirname(SRC_DIR)
 
+# GETs kept in flight per device by the bulk readback
+READ_WINDOW = 16
+
+# EV/SET packing budget; override with SCORPION_MAX_URL_BYTES / SCORPION_MAX_PARAMS_PER_REQUEST
+MAX_URL_BYTES = 2000
+# a 400 or a dropped connection only counts as "request too big" for a URL at
+# least this share of the budget (413 / 414 always do)
+NEAR_BUDGET = 0.75
+
+# Transient failures (timeouts, 5xx, dropped single-key requests) are retried with
+# exponential backoff and full jitter; override with SCORPION_APPLY_RETRIES / SCORPION_RETRY_BASE
+APPLY_RETRIES = 3
+RETRY_BASE = 0.5
+RETRY_CAP = 8.0
+
+# Record limits learnt per host after a device rejected a request for its size:
+# {host: (limit, expires)}; after SCORPION_RECORD_LIMIT_TTL seconds the configured
+# limit is tried again (and learnt again if the device still rejects it)
+RECORD_LIMIT_TTL = 900.0
+_RECORD_LIMITS: Dict[str, Tuple[int, float]] = {}
+_RECORD_LIMITS_LOCK = threading.Lock()
+
 
 # ---------------------------
 # 2110 expansion helpers
 # ---------------------------
+# Media families, in the order their flat base keys are defaulted. "per_stream"
+# families (audio) have a <out>.<stream> dimension between output and trunk.
+MEDIA_FAMILIES: Dict[str, Dict[str, Any]] = {
+    "video": {
+        "enable": "6500",
+        "ip": "6501",
+        "udp": "6502",
+        "src_udp": "6503",
+        "range_key": "2110_VIDEO_RANGE",
+        "range_default": "101-108",
+        "flat_udp": "50100",
+        "per_stream": False,
+    },
+    "audio": {
+        "enable": "6550",
+        "ip": "6551",
+        "udp": "6552",
+        "src_udp": "6553",
+        "range_key": "2110_AUDIO_RANGE",
+        "range_default": "201-232",
+        "flat_udp": "50200",
+        "per_stream": True,
+    },
+    "meta": {
+        "enable": "6600",
+        "ip": "6601",
+        "udp": "6602",
+        "src_udp": "6603",
+        "range_key": "2110_META_RANGE",
+        "range_default": "1-8",
+        "flat_udp": "50300",
+        "per_stream": False,
+    },
+}
+
+# Order the per-output keys are emitted in (families, then fields within a trunk)
+EXPANSION_ORDER = ("video", "meta", "audio")
+EXPANSION_FIELDS = ("ip", "udp", "src_udp", "enable")
+
+# Config keys the expansion depends on (the memo is keyed on these only)
+EXPANSION_CONFIG_KEYS = (
+    "2110_AUDIO_STREAMS",
+    "2110_VIDEO_RANGE",
+    "2110_AUDIO_RANGE",
+    "2110_META_RANGE",
+    "2110_Red",
+    "2110_Blue",
+)
+
+_EXPANSION_MEMO_SIZE = 256
+_EXPANSION_MEMO: "OrderedDict[int, Tuple[tuple, dict, bool]]" = OrderedDict()
+_EXPANSION_MEMO_LOCK = threading.Lock()
+
+
+def _parse_range_string(r):
+    if r is None:
+        return []
+    if isinstance(r, (list, tuple)):
+        return list(r)
+    s = str(r).strip()
+    if "-" in s:
+        a, b = s.split("-", 1)
+        return list(range(int(a), int(b) + 1))
+    if "," in s:
+        return [int(x.strip()) for x in s.split(",") if x.strip()]
+    return [int(s)]
+
+
+def _dropped(exc: RequestException) -> bool:
+    """
+    True when the device accepted the connection and then closed or reset it
+    mid-request (how some units answer an oversized URL), as opposed to never
+    accepting it (refused, unreachable) or timing out.
+    """
+    reason = exc.args[0] if exc.args else None
+    if isinstance(reason, ProtocolError):
+        return True
+    cause = exc.__cause__
+    if isinstance(cause, aiohttp.ClientConnectorError):
+        return False
+    if isinstance(cause, aiohttp.ServerDisconnectedError):
+        return True
+    return isinstance(cause, aiohttp.ClientOSError) and cause.errno in (errno.ECONNRESET, errno.EPIPE)
+
+
+def _accepted_keys(chunk: Dict[str, Any], reply) -> List[str]:
+    """
+    Keys of an EV/SET chunk the device took without a per-key error.
+    An error entry without an "id" can't be matched to a key, so the whole
+    chunk counts as rejected (resume() will send it again).
+    """
+    items = reply if isinstance(reply, list) else [reply]
+    rejected = set()
+    for item in items:
+        if isinstance(item, dict) and item.get("error"):
+            if item.get("id") is None:
+                return []
+            rejected.add(str(item["id"]))
+    return [key for key in chunk if str(key) not in rejected]
+
+
+def _ensure_dot_suffix(s):
+    s = str(s)
+    return s if s.endswith(".") else s + "."
+
+
+@lru_cache(maxsize=64)
+def _compile_2110_layout(outputs: int, audio_streams: int) -> Tuple[tuple, ...]:
+    """
+    Every per-output key the expansion may write, in emission order.
+
+    Each slot is (family, field, key, fallbacks, trunk, index) where fallbacks are
+    the less-qualified keys checked most-specific first (stream, output) and index
+    picks the generated IP suffix (output index, or linear output*streams+stream).
+    """
+    slots = []
+    for family in EXPANSION_ORDER:
+        spec = MEDIA_FAMILIES[family]
+        streams = range(audio_streams) if spec["per_stream"] else (None,)
+        for out_idx in range(outputs):
+            for stream_idx in streams:
+                if stream_idx is None:
+                    prefix, index, chain = f"{out_idx}", out_idx, ()
+                else:
+                    prefix = f"{out_idx}.{stream_idx}"
+                    index = out_idx * audio_streams + stream_idx
+                    chain = (prefix,)
+                for trunk in (0, 1):
+                    for field in EXPANSION_FIELDS:
+                        param = spec[field]
+                        fallbacks = tuple(f"{param}.{c}" for c in chain) + (f"{param}.{out_idx}",)
+                        slots.append(
+                            (family, field, f"{param}.{prefix}.{trunk}", fallbacks, trunk, index)
+                        )
+    return tuple(slots)
+
+
+def _expand_2110(params: dict, config: dict, last_octet: str, outputs: int) -> dict:
+    audio_streams = int(config.get("2110_AUDIO_STREAMS", 4))
+    if audio_streams < 1:
+        audio_streams = 1
+
+    red_prefix = _ensure_dot_suffix(config.get("2110_Red", "232.20."))
+    blue_prefix = _ensure_dot_suffix(config.get("2110_Blue", "232.120."))
+
+    # Base defaults (flat UDPs; specifics are written below)
+    for spec in MEDIA_FAMILIES.values():
+        params.setdefault(spec["enable"], 1)
+        params.setdefault(spec["udp"], spec["flat_udp"])
+        params.setdefault(spec["src_udp"], spec["flat_udp"])
+
+    # Generated IP suffix per family: video/meta ranges are padded to outputs
+    # (repeat last); audio counts linearly from the start of its range.
+    suffixes: Dict[str, Any] = {}
+    for family, spec in MEDIA_FAMILIES.items():
+        rng = _parse_range_string(config.get(spec["range_key"], spec["range_default"]))
+        if spec["per_stream"]:
+            start = rng[0] if rng else int(spec["range_default"].split("-")[0])
+            suffixes[family] = lambda i, start=start: start + i
+        else:
+            if len(rng) < outputs:
+                base = rng or [int(spec["range_default"].split("-")[0])]
+                rng = base + [base[-1]] * (outputs - len(base))
+            suffixes[family] = rng.__getitem__
+
+    # Values for keys without a more specific entry: the flat base key, as a string.
+    # The IP has no flat string; it falls back to the raw base value or a generated address.
+    flat = {
+        family: {
+            "udp": str(params.get(spec["udp"], spec["flat_udp"])),
+            "src_udp": str(params.get(spec["src_udp"], spec["flat_udp"])),
+            "enable": str(params.get(spec["enable"], 1)),
+        }
+        for family, spec in MEDIA_FAMILIES.items()
+    }
+
+    for family, field, key, fallbacks, trunk, index in _compile_2110_layout(outputs, audio_streams):
+        if key in params:
+            continue
+        for fallback in fallbacks:
+            if fallback in params:
+                params[key] = params[fallback]
+                break
+        else:
+            if field != "ip":
+                params[key] = flat[family][field]
+                continue
+            base = MEDIA_FAMILIES[family]["ip"]
+            if base in params:
+                params[key] = params[base]
+            else:
+                prefix = red_prefix if trunk == 0 else blue_prefix
+                params[key] = f"{prefix}{last_octet}.{suffixes[family](index)}"
+    return params
+
+
+def _is_flat(params: dict) -> bool:
+    return all(isinstance(v, (str, int, float, bool, type(None))) for v in params.values())
+
+
+def _expansion_memo_key(default_params: dict, config: dict, last_octet: str, outputs: int):
+    """(hash, key) for the memo, order-sensitive; None when a value can't be hashed"""
+    values = default_params.values()
+    key = (
+        tuple((k, _freeze(config[k])) for k in EXPANSION_CONFIG_KEYS if k in config),
+        # order-sensitive: it decides the order of the expanded dict
+        tuple(default_params.items()),
+        # types too: 1, 1.0 and True compare equal but expand differently
+        tuple(map(type, values)),
+        tuple(type(config.get(k)) for k in EXPANSION_CONFIG_KEYS),
+        last_octet,
+        outputs,
+    )
+    try:
+        return hash(key), key
+    except TypeError:
+        return None
+
+
+def _freeze(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
 def expand_2110_outputs(default_params: dict, config: dict, device_ip: str, outputs: int = 8) -> dict:
     """
     Expand/default params to include explicit per-output/trunk entries for 2110 video/audio/meta.
@@ -36,272 +295,93 @@ def expand_2110_outputs(default_params: dict, config: dict, device_ip: str, outp
 
     Precedence (most specific → least) applies:
       fully-qualified key → less-qualified key → base key → generated value
+
+    The key layout is compiled once per (outputs, streams) from MEDIA_FAMILIES and
+    results are memoized per (2110 config, defaults, last octet, outputs), so
+    repeated applies/previews only pay for a copy.
     """
-    def parse_range_string(r):
-        if r is None:
-            return []
-        if isinstance(r, (list, tuple)):
-            return list(r)
-        s = str(r).strip()
-        if "-" in s:
-            a, b = s.split("-", 1)
-            return list(range(int(a), int(b) + 1))
-        if "," in s:
-            return [int(x.strip()) for x in s.split(",") if x.strip()]
-        return [int(s)]
-
-    def _ensure_dot_suffix(s):
-        s = str(s)
-        return s if s.endswith(".") else s + "."
-
-    params = deepcopy(default_params or {})
     last_octet = str(device_ip).strip().split(".")[-1]
+    # the memo is indexed by the key's hash (computed once) and the full key is
+    # compared on a hit
+    memo = _expansion_memo_key(default_params or {}, config, last_octet, outputs)
+    memo_hash, memo_key = memo if memo is not None else (None, None)
+    if memo is not None:
+        with _EXPANSION_MEMO_LOCK:
+            hit = _EXPANSION_MEMO.get(memo_hash)
+            if hit is not None and hit[0] == memo_key:
+                _EXPANSION_MEMO.move_to_end(memo_hash)
+            else:
+                hit = None
+        if hit is not None:
+            _, result, flat_values = hit
+            return dict(result) if flat_values else deepcopy(result)
 
-    # Config
-    audio_streams = int(config.get("2110_AUDIO_STREAMS", 4))
-    if audio_streams < 1:
-        audio_streams = 1
+    result = _expand_2110(deepcopy(default_params or {}), config, last_octet, outputs)
+    if memo is not None:
+        flat_values = _is_flat(result)
+        stored = dict(result) if flat_values else deepcopy(result)
+        with _EXPANSION_MEMO_LOCK:
+            _EXPANSION_MEMO[memo_hash] = (memo_key, stored, flat_values)
+            while len(_EXPANSION_MEMO) > _EXPANSION_MEMO_SIZE:
+                _EXPANSION_MEMO.popitem(last=False)
+    return result
 
-    media_map = {
-        "video": {
-            "enable": "6500",
-            "ip": "6501",
-            "udp": "6502",
-            "src_udp": "6503",
-            "range_key": "2110_VIDEO_RANGE",
-            "flat_udp": "50100",
-        },
-        "audio": {
-            "enable": "6550",
-            "ip": "6551",
-            "udp": "6552",
-            "src_udp": "6553",
-            "range_key": "2110_AUDIO_RANGE",
-            "flat_udp": "50200",
-        },
-        "meta": {
-            "enable": "6600",
-            "ip": "6601",
-            "udp": "6602",
-            "src_udp": "6603",
-            "range_key": "2110_META_RANGE",
-            "flat_udp": "50300",
-        },
-    }
 
-    red_prefix = _ensure_dot_suffix(config.get("2110_Red", "232.20."))
-    blue_prefix = _ensure_dot_suffix(config.get("2110_Blue", "232.120."))
+def read_config() -> Dict[str, Any]:
+    """Read-only snapshot of config/config.json ({} if missing or invalid)."""
+    return configstore.config(default={})
 
-    # Base defaults (flat UDPs; will also write specifics below)
-    for m in media_map.values():
-        params.setdefault(m["enable"], 1)
-        params.setdefault(m["udp"], m["flat_udp"])
-        params.setdefault(m["src_udp"], m["flat_udp"])
-
-    # Parse ranges
-    video_rng = parse_range_string(config.get(media_map["video"]["range_key"], "101-108"))
-    meta_rng = parse_range_string(config.get(media_map["meta"]["range_key"], "1-8"))
-    audio_rng = parse_range_string(config.get(media_map["audio"]["range_key"], "201-232"))
-
-    # Pad video/meta ranges to outputs if needed (repeat last)
-    if len(video_rng) < outputs:
-        base = video_rng or [101]
-        video_rng = base + [base[-1]] * (outputs - len(base))
-    if len(meta_rng) < outputs:
-        base = meta_rng or [1]
-        meta_rng = base + [base[-1]] * (outputs - len(base))
-
-    # AUDIO: linear suffix across ALL outputs/streams (avoid duplication)
-    audio_start = audio_rng[0] if audio_rng else 201
-
-    # -------- VIDEO (per-output, per-trunk) --------
-    v = media_map["video"]
-    video_udp_flat = str(params.get(v["udp"], v["flat_udp"]))
-    video_src_udp_flat = str(params.get(v["src_udp"], v["flat_udp"]))
-    video_enable_flat = str(params.get(v["enable"], 1))
-
-    for out_idx in range(outputs):
-        suffix_value = video_rng[out_idx]
-        for trunk in (0, 1):
-            # IP (6501)
-            ip_key_specific = f"{v['ip']}.{out_idx}.{trunk}"
-            if ip_key_specific not in params:
-                ip_key_output = f"{v['ip']}.{out_idx}"
-                ip_key_base = f"{v['ip']}"
-                if ip_key_output in params:
-                    params[ip_key_specific] = params[ip_key_output]
-                elif ip_key_base in params:
-                    params[ip_key_specific] = params[ip_key_base]
-                else:
-                    prefix = red_prefix if trunk == 0 else blue_prefix
-                    params[ip_key_specific] = f"{prefix}{last_octet}.{suffix_value}"
-
-            # UDP DEST (6502)
-            udp_key_specific = f"{v['udp']}.{out_idx}.{trunk}"
-            if udp_key_specific not in params:
-                udp_key_output = f"{v['udp']}.{out_idx}"
-                udp_key_base = f"{v['udp']}"
-                if udp_key_output in params:
-                    params[udp_key_specific] = params[udp_key_output]
-                elif udp_key_base in params:
-                    params[udp_key_specific] = video_udp_flat
-                else:
-                    params[udp_key_specific] = video_udp_flat
-
-            # UDP SRC (6503)
-            src_udp_key_specific = f"{v['src_udp']}.{out_idx}.{trunk}"
-            if src_udp_key_specific not in params:
-                src_udp_key_output = f"{v['src_udp']}.{out_idx}"
-                src_udp_key_base = f"{v['src_udp']}"
-                if src_udp_key_output in params:
-                    params[src_udp_key_specific] = params[src_udp_key_output]
-                elif src_udp_key_base in params:
-                    params[src_udp_key_specific] = video_src_udp_flat
-                else:
-                    params[src_udp_key_specific] = video_src_udp_flat
-
-            # ENABLE (6500)
-            en_key_specific = f"{v['enable']}.{out_idx}.{trunk}"
-            if en_key_specific not in params:
-                en_key_output = f"{v['enable']}.{out_idx}"
-                en_key_base = f"{v['enable']}"
-                if en_key_output in params:
-                    params[en_key_specific] = params[en_key_output]
-                elif en_key_base in params:
-                    params[en_key_specific] = video_enable_flat
-                else:
-                    params[en_key_specific] = "1"
-
-    # -------- META (per-output, per-trunk) --------
-    m = media_map["meta"]
-    meta_udp_flat = str(params.get(m["udp"], m["flat_udp"]))
-    meta_src_udp_flat = str(params.get(m["src_udp"], m["flat_udp"]))
-    meta_enable_flat = str(params.get(m["enable"], 1))
-
-    for out_idx in range(outputs):
-        suffix_value = meta_rng[out_idx]
-        for trunk in (0, 1):
-            # IP (6601)
-            ip_key_specific = f"{m['ip']}.{out_idx}.{trunk}"
-            if ip_key_specific not in params:
-                ip_key_output = f"{m['ip']}.{out_idx}"
-                ip_key_base = f"{m['ip']}"
-                if ip_key_output in params:
-                    params[ip_key_specific] = params[ip_key_output]
-                elif ip_key_base in params:
-                    params[ip_key_specific] = params[ip_key_base]
-                else:
-                    prefix = red_prefix if trunk == 0 else blue_prefix
-                    params[ip_key_specific] = f"{prefix}{last_octet}.{suffix_value}"
-
-            # UDP DEST (6602)
-            udp_key_specific = f"{m['udp']}.{out_idx}.{trunk}"
-            if udp_key_specific not in params:
-                udp_key_output = f"{m['udp']}.{out_idx}"
-                udp_key_base = f"{m['udp']}"
-                if udp_key_output in params:
-                    params[udp_key_specific] = params[udp_key_output]
-                elif udp_key_base in params:
-                    params[udp_key_specific] = meta_udp_flat
-                else:
-                    params[udp_key_specific] = meta_udp_flat
-
-            # UDP SRC (6603)
-            src_udp_key_specific = f"{m['src_udp']}.{out_idx}.{trunk}"
-            if src_udp_key_specific not in params:
-                src_udp_key_output = f"{m['src_udp']}.{out_idx}"
-                src_udp_key_base = f"{m['src_udp']}"
-                if src_udp_key_output in params:
-                    params[src_udp_key_specific] = params[src_udp_key_output]
-                elif src_udp_key_base in params:
-                    params[src_udp_key_specific] = meta_src_udp_flat
-                else:
-                    params[src_udp_key_specific] = meta_src_udp_flat
-
-            # ENABLE (6600)
-            en_key_specific = f"{m['enable']}.{out_idx}.{trunk}"
-            if en_key_specific not in params:
-                en_key_output = f"{m['enable']}.{out_idx}"
-                en_key_base = f"{m['enable']}"
-                if en_key_output in params:
-                    params[en_key_specific] = params[en_key_output]
-                elif en_key_base in params:
-                    params[en_key_specific] = meta_enable_flat
-                else:
-                    params[en_key_specific] = "1"
-
-    # -------- AUDIO (per-output, per-stream, per-trunk) --------
-    a = media_map["audio"]
-    audio_udp_flat = str(params.get(a["udp"], a["flat_udp"]))
-    audio_src_udp_flat = str(params.get(a["src_udp"], a["flat_udp"]))
-    audio_enable_flat = str(params.get(a["enable"], 1))
-
-    for out_idx in range(outputs):
-        for stream_idx in range(audio_streams):
-            linear = out_idx * audio_streams + stream_idx
-            ip_suffix_value = audio_start + linear
-            for trunk in (0, 1):
-                # IP (6551)
-                ip_key_specific = f"{a['ip']}.{out_idx}.{stream_idx}.{trunk}"
-                if ip_key_specific not in params:
-                    ip_key_stream = f"{a['ip']}.{out_idx}.{stream_idx}"
-                    ip_key_output = f"{a['ip']}.{out_idx}"
-                    ip_key_base = f"{a['ip']}"
-                    if ip_key_stream in params:
-                        params[ip_key_specific] = params[ip_key_stream]
-                    elif ip_key_output in params:
-                        params[ip_key_specific] = params[ip_key_output]
-                    elif ip_key_base in params:
-                        params[ip_key_specific] = params[ip_key_base]
-                    else:
-                        prefix = red_prefix if trunk == 0 else blue_prefix
-                        params[ip_key_specific] = f"{prefix}{last_octet}.{ip_suffix_value}"
-
-                # UDP DEST (6552)
-                udp_key_specific = f"{a['udp']}.{out_idx}.{stream_idx}.{trunk}"
-                if udp_key_specific not in params:
-                    udp_key_stream = f"{a['udp']}.{out_idx}.{stream_idx}"
-                    udp_key_output = f"{a['udp']}.{out_idx}"
-                    udp_key_base = f"{a['udp']}"
-                    if udp_key_stream in params:
-                        params[udp_key_specific] = params[udp_key_stream]
-                    elif udp_key_output in params:
-                        params[udp_key_specific] = params[udp_key_output]
-                    elif udp_key_base in params:
-                        params[udp_key_specific] = audio_udp_flat
-                    else:
-                        params[udp_key_specific] = audio_udp_flat
-
-                # UDP SRC (6553)
-                src_udp_key_specific = f"{a['src_udp']}.{out_idx}.{stream_idx}.{trunk}"
-                if src_udp_key_specific not in params:
-                    src_udp_key_stream = f"{a['src_udp']}.{out_idx}.{stream_idx}"
-                    src_udp_key_output = f"{a['src_udp']}.{out_idx}"
-                    src_udp_key_base = f"{a['src_udp']}"
-                    if src_udp_key_stream in params:
-                        params[src_udp_key_specific] = params[src_udp_key_stream]
-                    elif src_udp_key_output in params:
-                        params[src_udp_key_specific] = params[src_udp_key_output]
-                    elif src_udp_key_base in params:
-                        params[src_udp_key_specific] = audio_src_udp_flat
-                    else:
-                        params[src_udp_key_specific] = audio_src_udp_flat
-
-                # ENABLE (6550)
-                en_key_specific = f"{a['enable']}.{out_idx}.{stream_idx}.{trunk}"
-                if en_key_specific not in params:
-                    en_key_stream = f"{a['enable']}.{out_idx}.{stream_idx}"
-                    en_key_output = f"{a['enable']}.{out_idx}"
-                    en_key_base = f"{a['enable']}"
-                    if en_key_stream in params:
-                        params[en_key_specific] = params[en_key_stream]
-                    elif en_key_output in params:
-                        params[en_key_specific] = params[en_key_output]
-                    elif en_key_base in params:
-                        params[en_key_specific] = audio_enable_flat
-                    else:
-                        params[en_key_specific] = "1"
 
+def read_default_params() -> Dict[str, Any]:
+    """Read-only snapshot of config/default_params.json ({} if missing or invalid)."""
+    return configstore.load(configstore.DEFAULT_PARAMS_PATH, default={})
+
+
+def device_label(config: dict, host: str, last_octet: Any = None) -> str:
+    """
+    Build label from config prefix + last octet of control IP, zero-padded.
+    Example: SCORPION_RANGE_NAME_PFIX='SC_' and host '10.169.20.70' -> 'SC_070'
+    """
+    pfix = str(config.get("SCORPION_RANGE_NAME_PFIX", "SC_"))
+    # derive last octet robustly
+    try:
+        n = int(str(host).strip().split(".")[-1])
+    except Exception:
+        try:
+            n = int(last_octet)
+        except Exception:
+            n = 0
+    return f"{pfix}{n:03d}"
+
+
+def trunk_params(config: dict) -> Dict[str, str]:
+    """Trunk A/B parameter map built from config.json → SCORPION_TRUNKS."""
+    trunks = config.get("SCORPION_TRUNKS", {}) if isinstance(config.get("SCORPION_TRUNKS", {}), dict) else {}
+    A = trunks.get("A", {}) if isinstance(trunks.get("A", {}), dict) else {}
+    B = trunks.get("B", {}) if isinstance(trunks.get("B", {}), dict) else {}
+
+    def one(side: Dict[str, Any], idx: int) -> Dict[str, str]:
+        mode = str(side.get("mode", "Auto (DHCP)"))
+        is_dhcp = 1 if mode.lower().startswith("auto") else 0  # IMPORTANT: 1=DHCP, 0=Static
+        out = {f"6022.{idx}": str(is_dhcp)}
+        if is_dhcp == 0:
+            prefix = str(side.get("prefix", "10.20." if idx == 0 else "10.120."))
+            suffix = str(side.get("suffix", "")).lstrip(".")  # e.g. "34.10"
+            ip = f"{prefix}{suffix}" if suffix else ""
+            mask = str(side.get("subnetMask", "255.255.255.252"))
+            gw = str(side.get("gateway", ""))
+
+            if ip:
+                out[f"6000.{idx}"] = ip
+            if mask:
+                out[f"6001.{idx}"] = mask
+            if gw:
+                out[f"6002.{idx}"] = gw
+        return out
+
+    params: Dict[str, str] = {}
+    params.update(one(A, 0))  # A
+    params.update(one(B, 1))  # B
     return params
 
 
@@ -316,48 +396,32 @@ class Defaults:
         Build label from config prefix + last octet of control IP, zero-padded.
         Example: SCORPION_RANGE_NAME_PFIX='SC_' and host '10.169.20.70' -> 'SC_070'
         """
-        pfix = str(self.config.get("SCORPION_RANGE_NAME_PFIX", "SC_"))
-        # derive last octet robustly
-        try:
-            n = int(str(self.host).strip().split(".")[-1])
-        except Exception:
-            try:
-                n = int(self.last_octet)
-            except Exception:
-                n = 0
-        return f"{pfix}{n:03d}"
+        return device_label(self.config, self.host, self.last_octet)
 
-    def __init__(self, name, host, port=80):
+    def __init__(self, name, host, port=80, client: Optional[Call | AsyncCall] = None):
         """
         Args:
             name (str): NMOS name / alias used for the device
             host (str): control IP or hostname of the scorpion device (eg "10.169.20.51")
             port (int): control HTTP port (usually 80)
+            client (Call | AsyncCall): optional pre-built client; a blocking Call is created if omitted
         """
         self.name = name
         self.host = host
-        self.scorpion = Call(host=host, port=port)
+        self.scorpion = client if client is not None else Call(host=host, port=port)
         self.last_octet = host.split(".")[-1] if isinstance(host, str) and "." in host else host
         self.config = self._get_config()
         self.default_params: Optional[Dict[str, Any]] = None
+        # set while apply_all_defaults()/resume() run; _send_params records into it
+        self.journal: Optional[ApplyJournal] = None
 
     # ---- file helpers ----
     def _get_config(self) -> Dict[str, Any]:
         """Load config/config.json from repo root."""
-        cfg_path = f"{ROOT_DIR}/config/config.json"
-        try:
-            with open(cfg_path, encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+        return read_config()
 
     def _read_default_params(self) -> Dict[str, Any]:
-        dp_path = f"{ROOT_DIR}/config/default_params.json"
-        try:
-            with open(dp_path, encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+        return read_default_params()
 
     # ---- small utils ----
     def _split_dict(self, dict_, dict_size):
@@ -366,29 +430,287 @@ class Defaults:
         dicts = [dict(items[i : i + dict_size]) for i in range(0, len(items), dict_size)]
         return dicts
 
-    def _send_params(self, params):
+    def _is_async(self) -> bool:
+        return isinstance(self.scorpion, AsyncCall)
+
+    def _run(self, coro):
+        """
+        Run a coroutine to completion from blocking code and return its result.
+
+        The blocking methods always block and return their result. Called from
+        inside a running event loop, the coroutine runs on a helper thread with
+        its own loop. Async code should await the *_async methods instead.
+        An AsyncCall client's session is closed afterwards; it reopens on next use.
+        """
+        async def _once():
+            try:
+                return await coro
+            finally:
+                if self._is_async():
+                    await self.scorpion.close()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_once())
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"scorpion-sync-{self.host}") as pool:
+            return pool.submit(asyncio.run, _once()).result()
+
+    @staticmethod
+    def _collect(responses, response):
+        if isinstance(response, list):
+            responses.extend(response)
+        else:
+            responses.append(response)
+
+    def _record_limit(self) -> int:
+        limit = self.config.get("SCORPION_MAX_PARAMS_PER_REQUEST", self.scorpion.max_records_per_request)
+        try:
+            limit = max(1, int(limit))
+        except (TypeError, ValueError):
+            limit = self.scorpion.max_records_per_request
+        learnt = _RECORD_LIMITS.get(self.host)
+        if learnt is None:
+            return limit
+        if learnt[1] <= time.monotonic():
+            with _RECORD_LIMITS_LOCK:
+                if _RECORD_LIMITS.get(self.host) == learnt:
+                    del _RECORD_LIMITS[self.host]
+            return limit
+        return min(limit, learnt[0])
+
+    def _lower_record_limit(self, limit: int):
+        """Remember a size that got through after a size rejection (for SCORPION_RECORD_LIMIT_TTL)"""
+        try:
+            ttl = float(self.config.get("SCORPION_RECORD_LIMIT_TTL", RECORD_LIMIT_TTL))
+        except (TypeError, ValueError):
+            ttl = RECORD_LIMIT_TTL
+        now = time.monotonic()
+        with _RECORD_LIMITS_LOCK:
+            current = _RECORD_LIMITS.get(self.host)
+            if current is None or current[1] <= now or limit <= current[0]:
+                _RECORD_LIMITS[self.host] = (max(1, limit), now + ttl)
+
+    def _url_budget(self) -> int:
+        try:
+            return int(self.config.get("SCORPION_MAX_URL_BYTES", MAX_URL_BYTES))
+        except (TypeError, ValueError):
+            return MAX_URL_BYTES
+
+    def _url_base_bytes(self) -> int:
+        return len(f"{self.scorpion.scheme}://{self.host}:{self.scorpion.port}/{self.scorpion.version}EV/SET/parameter")
+
+    @staticmethod
+    def _pair_bytes(key, value) -> int:
+        return len(quote_plus(str(key))) + (0 if value is None else 1 + len(quote_plus(str(value))))
+
+    def _url_bytes(self, chunk: Dict[str, Any]) -> int:
+        return self._url_base_bytes() + sum(1 + self._pair_bytes(k, v) for k, v in chunk.items())
+
+    def _pack_params(self, params) -> List[Dict[str, Any]]:
+        """
+        Pack params into as few EV/SET queries as possible: each chunk is filled
+        until either the record limit or the URL byte budget would be exceeded.
+        """
+        budget = self._url_budget()
+        limit = self._record_limit()
+        base = self._url_base_bytes()
+
+        chunks: List[Dict[str, Any]] = []
+        chunk: Dict[str, Any] = {}
+        length = base
+        for key, value in params.items():
+            pair = self._pair_bytes(key, value)
+            if chunk and (len(chunk) >= limit or length + 1 + pair > budget):
+                chunks.append(chunk)
+                chunk, length = {}, base
+            chunk[key] = value
+            length += 1 + pair
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    @staticmethod
+    def _halves(chunk: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        items = list(chunk.items())
+        half = len(items) // 2
+        return dict(items[:half]), dict(items[half:])
+
+    def _retries(self) -> int:
+        try:
+            return max(0, int(self.config.get("SCORPION_APPLY_RETRIES", APPLY_RETRIES)))
+        except (TypeError, ValueError):
+            return APPLY_RETRIES
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))"""
+        try:
+            base = float(self.config.get("SCORPION_RETRY_BASE", RETRY_BASE))
+        except (TypeError, ValueError):
+            base = RETRY_BASE
+        return random.uniform(0, min(RETRY_CAP, base * 2 ** attempt))
+
+    def _size_rejected(self, exc: Exception, chunk: Dict[str, Any], probing: bool = False) -> bool:
+        """
+        True when exc looks like the device refusing the request for its size:
+        413 / 414, or a 400 or dropped connection on a URL near the budget
+        (NEAR_BUDGET). probing=True (a half of a chunk already rejected for
+        size) accepts a 400 at any length, for units that cap the record count.
+
+        Refused connections, timeouts, auth errors, 404 and 5xx are never size
+        problems, so they fail the chunk instead of splitting it.
+        """
+        if len(chunk) <= 1 or isinstance(exc, Timeout):
+            return False
+        near_budget = self._url_bytes(chunk) >= NEAR_BUDGET * self._url_budget()
+        if isinstance(exc, HTTPError):
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+            if status in (413, 414):
+                return True
+            return status == 400 and (probing or near_budget)
+        if isinstance(exc, RequestsConnectionError):
+            return near_budget and _dropped(exc)
+        return False
+
+    def _is_transient(self, exc: Exception, chunk: Dict[str, Any]) -> bool:
+        """Worth retrying as-is: timeouts, 5xx, or a connection error that isn't
+        a size rejection (those are split by _post_adaptive instead)."""
+        if isinstance(exc, Timeout):
+            return True
+        if isinstance(exc, HTTPError):
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+            return status is not None and status >= 500
+        if isinstance(exc, RequestsConnectionError):
+            return not self._size_rejected(exc, chunk)
+        return False
+
+    def _post_retrying(self, chunk: Dict[str, Any]):
+        retries = self._retries()
+        for attempt in range(retries + 1):
+            try:
+                return self.scorpion.post(query=chunk)
+            except RequestException as exc:
+                if attempt >= retries or not self._is_transient(exc, chunk):
+                    raise
+                time.sleep(self._backoff(attempt))
+
+    async def _post_retrying_async(self, chunk: Dict[str, Any]):
+        retries = self._retries()
+        for attempt in range(retries + 1):
+            try:
+                return await self.scorpion.post(query=chunk)
+            except RequestException as exc:
+                if attempt >= retries or not self._is_transient(exc, chunk):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+
+    def _post_adaptive(self, chunk: Dict[str, Any], on_sent=None, probing: bool = False) -> List[Any]:
+        """
+        POST one packed chunk, retrying transient failures (see _is_transient).
+        If the device rejects it for its size (see _size_rejected) the chunk is
+        halved and retried, and the smaller size is remembered for this host once
+        a half goes through.
+        Any other failure (refused, timeout after retries, 401, 404, 5xx) is raised.
+        on_sent(chunk, reply) is called for every sub-chunk the device accepted.
+        """
+        responses: List[Any] = []
+        try:
+            reply = self._post_retrying(chunk)
+        except RequestException as exc:
+            if not self._size_rejected(exc, chunk, probing):
+                raise
+            first, second = self._halves(chunk)
+            responses.extend(self._post_adaptive(first, on_sent, probing=True))
+            # only remember the smaller size once it has actually worked (a unit
+            # that fails everything shouldn't drag the limit down to 1)
+            self._lower_record_limit(len(first))
+            responses.extend(self._post_adaptive(second, on_sent, probing=True))
+            return responses
+        self._collect(responses, reply)
+        if on_sent is not None:
+            on_sent(chunk, reply)
+        return responses
+
+    async def _post_adaptive_async(self, chunk: Dict[str, Any], on_sent=None, probing: bool = False) -> List[Any]:
+        responses: List[Any] = []
+        try:
+            reply = await self._post_retrying_async(chunk)
+        except RequestException as exc:
+            if not self._size_rejected(exc, chunk, probing):
+                raise
+            first, second = self._halves(chunk)
+            responses.extend(await self._post_adaptive_async(first, on_sent, probing=True))
+            # only remember the smaller size once it has actually worked (a unit
+            # that fails everything shouldn't drag the limit down to 1)
+            self._lower_record_limit(len(first))
+            responses.extend(await self._post_adaptive_async(second, on_sent, probing=True))
+            return responses
+        self._collect(responses, reply)
+        if on_sent is not None:
+            on_sent(chunk, reply)
+        return responses
+
+    def _journal_step(self, params, label: Optional[str], step: Optional[int]):
+        """(step, on_sent) for the active journal, or (None, None) when not journaling"""
+        if self.journal is None:
+            return None, None
+        if step is None:
+            step = self.journal.step(params, label)
+        journal = self.journal
+        return step, lambda chunk, reply: journal.sent(step, _accepted_keys(chunk, reply))
+
+    def _send_params(self, params, label: Optional[str] = None, step: Optional[int] = None):
         """
         Send params to the scorpion device using POST requests.
-        Splits the dict into chunks (size 10 by default).
+        Packs the dict into as few requests as the URL budget and record limit
+        allow (see _pack_params), halving a chunk the device rejects.
         Returns (responses, fails) where responses is a list and fails is a list of items
         containing an 'error' key.
+
+        While a journal is active each accepted chunk is recorded under `label`
+        (or appended to an existing `step` when resuming), so resume() can send
+        only what is left after a failure.
+
+        With an AsyncCall client the chunks are sent concurrently. Always blocks;
+        async code awaits _send_params_async() instead.
         """
+        if self._is_async():
+            return self._run(self._send_params_async(params, label, step))
+
+        step, on_sent = self._journal_step(params, label, step)
         responses = []
-        queries = self._split_dict(params, 10)
+        queries = self._pack_params(params)
         for split_query in queries:
             try:
-                response = self.scorpion.post(query=split_query)
+                responses.extend(self._post_adaptive(split_query, on_sent))
             except RequestException as exc:
                 return [], [{"error": str(exc)}]
 
-            if isinstance(response, list):
-                responses.extend(response)
-            elif isinstance(response, dict):
-                responses.append(response)
-            else:
-                responses.append(response)
+        fails = [item for item in responses if isinstance(item, dict) and item.get("error")]
+        if step is not None and not fails:
+            self.journal.done(step)
+        return responses, fails
+
+    async def _send_params_async(self, params, label: Optional[str] = None, step: Optional[int] = None):
+        """_send_params for async callers; same return shape. A blocking Call sends from a worker thread."""
+        if not self._is_async():
+            return await asyncio.to_thread(self._send_params, params, label, step)
+        step, on_sent = self._journal_step(params, label, step)
+        queries = self._pack_params(params)
+        results = await asyncio.gather(
+            *(self._post_adaptive_async(q, on_sent) for q in queries), return_exceptions=True
+        )
+        responses = []
+        for result in results:
+            if isinstance(result, RequestException):
+                return [], [{"error": str(result)}]
+            if isinstance(result, BaseException):
+                raise result
+            responses.extend(result)
 
         fails = [item for item in responses if isinstance(item, dict) and item.get("error")]
+        if step is not None and not fails:
+            self.journal.done(step)
         return responses, fails
 
     # ---- defaults preparation ----
@@ -396,13 +718,23 @@ class Defaults:
         """
         Read config/default_params.json, inject dynamic values (names),
         and expand 2110 outputs (video/audio/meta).
+        Uses the device's entry in the fleet plan (src.scorpion.plan) when it is current.
         """
         defaults = self._read_default_params()
         if not defaults:
             raise RuntimeError("Failed to load default_params.json")
 
-        # NMOS Name alias (original behaviour)
+        # A precompiled fleet plan built from this same config/defaults skips the expansion
+        from src.scorpion import plan  # plan imports this module
+
+        planned = plan.lookup(self.host, self.config, defaults)
+        if planned is not None:
+            self.default_params = planned
+            return planned
+
+        # NMOS Name alias (original behaviour); on a copy, the snapshot is shared
         label = self._make_device_label()
+        defaults = dict(defaults)
         defaults["55"] = label
         defaults["5204"] = label
 
@@ -431,6 +763,24 @@ class Defaults:
             return {"status": "partial_failure", "responses": responses, "fails": fails}
         return {"status": "success", "responses": responses}
 
+    @staticmethod
+    def _route_mapping() -> Dict[str, str]:
+        """The project's standard route mapping (applied on top of a cleared table)."""
+        # block A: 3009.4..11 => 17..24
+        block_a = {f"3009.{dst}": str(src) for dst, src in zip(range(4, 12), range(17, 25))}
+        # block B: 3009.16..23 => 5..12
+        block_b = {f"3009.{dst}": str(src) for dst, src in zip(range(16, 24), range(5, 13))}
+        routes = {}
+        routes.update(block_a)
+        routes.update(block_b)
+        return routes
+
+    def _desired_routes(self) -> Dict[str, str]:
+        """Final route table left by set_default_routes(test=False): every entry 0 except the mapping."""
+        routes = {f"3009.{i}": "0" for i in range(32)}
+        routes.update(self._route_mapping())
+        return routes
+
     def set_default_routes(self, test: bool = False) -> Dict[str, Any]:
         """
         Clear route table entries (3009.0..31) and then set the project's default mapping.
@@ -438,35 +788,33 @@ class Defaults:
         """
         # --- 1) Clear all 32 entries to 0 (disconnect) ---
         clear_routes = {f"3009.{i}": "0" for i in range(32)}
-        responses, fails = self._send_params(clear_routes)
+        responses, fails = self._send_params(clear_routes, label="routes_clear")
         if fails:
             return {"status": "failed_to_clear", "responses": responses, "fails": fails}
 
         if test:
             # Special block: set 16..23 to 31
             special = {f"3009.{dst}": "31" for dst in range(16, 24)}
-            responses2, fails2 = self._send_params(special)
+            responses2, fails2 = self._send_params(special, label="routes_test")
             ok = {"status": "cleared_and_set_16_23_to_31", "responses": responses2}
             if fails2:
                 ok["fails"] = fails2
             return ok
 
         # --- 2) Apply your standard mapping ---
-        # block A: 3009.4..11 => 17..24
-        block_a = {f"3009.{dst}": str(src) for dst, src in zip(range(4, 12), range(17, 25))}
-        # block B: 3009.16..23 => 5..12
-        block_b = {f"3009.{dst}": str(src) for dst, src in zip(range(16, 24), range(5, 13))}
-        routes = {}
-        routes.update(block_a)
-        routes.update(block_b)
+        routes = self._route_mapping()
 
-        responses3, fails3 = self._send_params(routes)
+        responses3, fails3 = self._send_params(routes, label="routes")
         if fails3:
             return {"status": "failed_to_set_routes", "responses": responses3, "fails": fails3}
 
         return {"status": "routes_set", "responses": responses3}
 
     # ---- trunks (SCORPION_TRUNKS) ----
+    def _trunk_params(self) -> Dict[str, str]:
+        """Trunk A/B parameter map built from config.json → SCORPION_TRUNKS."""
+        return trunk_params(self.config)
+
     def apply_trunks_from_config(self) -> Dict[str, Any]:
         """
         Uses config.json → SCORPION_TRUNKS to push:
@@ -475,35 +823,9 @@ class Defaults:
           - Netmask:     6001.0(A)/6001.1(B)
           - Gateway:     6002.0(A)/6002.1(B)
         """
-        trunks = self.config.get("SCORPION_TRUNKS", {}) if isinstance(self.config.get("SCORPION_TRUNKS", {}), dict) else {}
-        A = trunks.get("A", {}) if isinstance(trunks.get("A", {}), dict) else {}
-        B = trunks.get("B", {}) if isinstance(trunks.get("B", {}), dict) else {}
-
-        def one(side: Dict[str, Any], idx: int) -> Dict[str, str]:
-            mode = str(side.get("mode", "Auto (DHCP)"))
-            is_dhcp = 1 if mode.lower().startswith("auto") else 0  # IMPORTANT: 1=DHCP, 0=Static
-            out = {f"6022.{idx}": str(is_dhcp)}
-            if is_dhcp == 0:
-                prefix = str(side.get("prefix", "10.20." if idx == 0 else "10.120."))
-                suffix = str(side.get("suffix", "")).lstrip(".")  # e.g. "34.10"
-                ip = f"{prefix}{suffix}" if suffix else ""
-                mask = str(side.get("subnetMask", "255.255.255.252"))
-                gw = str(side.get("gateway", ""))
-
-                if ip:
-                    out[f"6000.{idx}"] = ip
-                if mask:
-                    out[f"6001.{idx}"] = mask
-                if gw:
-                    out[f"6002.{idx}"] = gw
-            return out
-
-        params: Dict[str, str] = {}
-        params.update(one(A, 0))  # A
-        params.update(one(B, 1))  # B
-
+        params = self._trunk_params()
         try:
-            resp, fails = self._send_params(params)
+            resp, fails = self._send_params(params, label="trunks")
             return {"applied": resp, "fails": fails}
         except Exception as exc:
             return {"error": str(exc)}
@@ -527,14 +849,66 @@ class Defaults:
         return root in (6000, 6001, 6002, 6022)
 
     # ---- new one-shot that the page will call ----
-    def apply_all_defaults(self) -> Dict[str, Any]:
+    def _split_defaults(self, complete: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Split expanded defaults into (2110 ip-output family, remaining non-trunk keys)."""
+        ip_outputs = {k: v for k, v in complete.items() if self._is_ip_output_family_key(k)}
+        other = {k: v for k, v in complete.items() if not self._is_ip_output_family_key(k) and not self._is_trunk_key(k)}
+        return ip_outputs, other
+
+    @staticmethod
+    def _matches(current: Any, desired: Any) -> bool:
+        """True when a read_params() response already holds the desired value."""
+        if not isinstance(current, dict) or "value" not in current:
+            return False
+        if desired is None:
+            return False
+        return str(current["value"]).strip() == str(desired).strip()
+
+    async def apply_all_defaults_async(self, delta: bool = False, journal: bool = True) -> Dict[str, Any]:
+        """
+        apply_all_defaults() for async callers: the steps run on a worker thread
+        (each step's requests on that thread's own loop), so the caller's event
+        loop keeps running. An AsyncCall client must own its aiohttp session,
+        since a session passed in is tied to the caller's loop.
+        """
+        if self._is_async() and not self.scorpion.owns_client:
+            raise ValueError("apply_all_defaults_async needs an AsyncCall that owns its aiohttp session")
+        if self._is_async():
+            # the worker thread opens its own; don't leave this loop's one dangling
+            await self.scorpion.close()
+        return await asyncio.to_thread(self.apply_all_defaults, delta, journal)
+
+    def apply_all_defaults(self, delta: bool = False, journal: bool = True) -> Dict[str, Any]:
         """
         Safe 'apply all':
           1) Clear routes → mapping;
           2) Apply trunks (DHCP/Static + addressing) from config;
           3) Push 2110 IP/UDP/enable grid;
           4) Push remaining default_params.json keys (excluding trunk & 2110 families).
+
+        delta=True reads the device first and only sends keys whose value differs
+        (see apply_delta_defaults).
+
+        journal=True records every accepted chunk in config/journal/<host>.jsonl so
+        resume() can finish the run after a failure. Only one journaled apply or
+        resume per host runs at a time; a second one returns {"error": ...}.
         """
+        if journal:
+            run = ApplyJournal(self.host)
+            if not run.claim():
+                return {"error": f"another journaled apply to {self.host} is in progress"}
+            self.journal = run
+            run.begin("apply_delta" if delta else "apply_all")
+        try:
+            if delta:
+                return self.apply_delta_defaults()
+            return self._apply_all()
+        finally:
+            if self.journal is not None:
+                self.journal.release()
+            self.journal = None
+
+    def _apply_all(self) -> Dict[str, Any]:
         out: Dict[str, Any] = {}
 
         # 1) routes first
@@ -553,41 +927,189 @@ class Defaults:
             out["defaults"] = {"error": f"prep_failed: {exc}"}
             return out
 
-        ip_outputs = {k: v for k, v in complete.items() if self._is_ip_output_family_key(k)}
-        other = {k: v for k, v in complete.items() if not self._is_ip_output_family_key(k) and not self._is_trunk_key(k)}
+        ip_outputs, other = self._split_defaults(complete)
 
         # 3) apply 2110 family
         try:
-            resp1, fails1 = self._send_params(ip_outputs) if ip_outputs else ([], [])
+            resp1, fails1 = self._send_params(ip_outputs, label="ip_outputs") if ip_outputs else ([], [])
             out["ip_outputs"] = {"applied": resp1, "fails": fails1}
         except Exception as exc:
             out["ip_outputs"] = {"error": str(exc)}
 
         # 4) apply remaining defaults
         try:
-            resp2, fails2 = self._send_params(other) if other else ([], [])
+            resp2, fails2 = self._send_params(other, label="default_params") if other else ([], [])
             out["default_params"] = {"applied": resp2, "fails": fails2} if other else {"info": "No additional defaults to apply."}
         except Exception as exc:
             out["default_params"] = {"error": str(exc)}
 
         return out
 
+    def apply_delta_defaults(self, window: int = READ_WINDOW) -> Dict[str, Any]:
+        """
+        Delta 'apply all': bulk-read the device, then send only the routes, trunks,
+        2110 and default keys whose current value differs from the target state.
+
+        The route target is the table set_default_routes() leaves behind (all 0
+        except the standard mapping), so no clear pass is needed. Keys that could
+        not be read are treated as changed. Each group reports how many writes were
+        skipped, and out["delta"] summarises the whole device.
+        """
+        out: Dict[str, Any] = {}
+        groups: Dict[str, Dict[str, Any]] = {
+            "routes": self._desired_routes(),
+            "trunks": self._trunk_params(),
+        }
+        try:
+            groups["ip_outputs"], groups["default_params"] = self._split_defaults(self.get_user_defaults())
+        except Exception as exc:
+            out["defaults"] = {"error": f"prep_failed: {exc}"}
+
+        keys = list(dict.fromkeys(k for group in groups.values() for k in group))
+        current = self.read_params(keys, window)
+
+        summary = {"checked": len(keys), "sent": 0, "skipped": 0, "read_errors": 0}
+        summary["read_errors"] = sum(1 for k in keys if not isinstance(current.get(k), dict) or "value" not in current[k])
+        for name, desired in groups.items():
+            changed = {k: v for k, v in desired.items() if not self._matches(current.get(k), v)}
+            skipped = len(desired) - len(changed)
+            summary["sent"] += len(changed)
+            summary["skipped"] += skipped
+            try:
+                resp, fails = self._send_params(changed, label=name) if changed else ([], [])
+                out[name] = {"applied": resp, "fails": fails, "skipped": skipped}
+            except Exception as exc:
+                out[name] = {"error": str(exc), "skipped": skipped}
+
+        out["delta"] = summary
+        return out
+
+    def resume(self) -> Dict[str, Any]:
+        """
+        Send only what the last journaled apply left unsent (see ApplyJournal.pending),
+        in the original order. Keys a later step already wrote are not replayed.
+        Returns per-step results keyed "<step>:<label>" plus the journal summary.
+        """
+        journal = ApplyJournal(self.host)
+        if not journal.claim():
+            return {"error": f"another journaled apply to {self.host} is in progress"}
+        try:
+            pending = journal.pending()
+            if not pending:
+                return {"status": "nothing_to_resume", "journal": journal.summary()}
+
+            out: Dict[str, Any] = {}
+            self.journal = journal
+            try:
+                for step, label, params in pending:
+                    try:
+                        resp, fails = self._send_params(params, step=step)
+                        out[f"{step}:{label}"] = {"applied": resp, "fails": fails}
+                    except Exception as exc:
+                        out[f"{step}:{label}"] = {"error": str(exc)}
+            finally:
+                self.journal = None
+            out["journal"] = journal.summary()
+            return out
+        finally:
+            journal.release()
+
     # ---- debug/readback ----
-    def get_current(self):
-        """Returns a dictionary of lists for current status of all default values"""
-        current = {"name": [], "code": [], "value": [], "default": []}
+    def read_params(self, keys, window: int = READ_WINDOW) -> Dict[str, Any]:
+        """
+        Read many parameters with at most `window` GETs in flight.
+        Returns {key: response}; a key whose read failed maps to {"error": ...}
+        and does not affect the others.
+        A blocking Call is read through a temporary AsyncCall to the same host.
+        Always blocks; async code awaits read_params_async() instead.
+        """
+        return self._run(self.read_params_async(keys, window))
+
+    async def read_params_async(self, keys, window: int = READ_WINDOW) -> Dict[str, Any]:
+        """read_params() for async callers"""
+        return await self._read_params_async(list(keys), window, self.scorpion if self._is_async() else None)
 
+    async def _read_params_async(self, keys, window, client: Optional[AsyncCall] = None):
+        owned = client is None
+        if owned:
+            client = AsyncCall(host=self.scorpion.host, port=self.scorpion.port, max_connections=window)
+        slots = asyncio.Semaphore(max(1, int(window)))
+
+        async def _one(key):
+            async with slots:
+                try:
+                    return await client.get(key)
+                except Exception as exc:
+                    return {"error": str(exc)}
+
+        try:
+            values = await asyncio.gather(*(_one(key) for key in keys))
+        finally:
+            if owned:
+                await client.close()
+        return dict(zip(keys, values))
+
+    def get_current(self, bulk: bool = True, window: int = READ_WINDOW):
+        """Returns a dictionary of lists for current status of all default values
+
+        bulk=True reads with up to `window` requests in flight and records a failed
+        key in the "error" column instead of aborting the whole readback.
+        bulk=False is the original one-GET-at-a-time readback.
+        Always blocks; async code awaits get_current_async() instead.
+        """
         if self.default_params is None:
             try:
                 self.get_user_defaults()
             except Exception as exc:
                 return {"error": f"Could not load defaults: {exc}"}
 
-        for key, default_value in self.default_params.items():
+        if bulk or self._is_async():
+            return self._run(self.get_current_async(bulk, window))
+
+        calls = []
+        for key in self.default_params:
             try:
-                call = self.scorpion.get(key)
+                calls.append(self.scorpion.get(key))
             except RequestException as exc:
                 return {"error": f"Scorpion API Call Failed: {exc}"}
+        return self._current_table(calls)
+
+    async def get_current_async(self, bulk: bool = True, window: int = READ_WINDOW):
+        """get_current() for async callers (bulk=False needs an AsyncCall client)"""
+        if self.default_params is None:
+            try:
+                self.get_user_defaults()
+            except Exception as exc:
+                return {"error": f"Could not load defaults: {exc}"}
+        if bulk:
+            reads = await self.read_params_async(self.default_params, window)
+            return self._current_table(reads[key] for key in self.default_params)
+        if not self._is_async():
+            return await asyncio.to_thread(self.get_current, False, window)
+        return await self._get_current_each_async()
+
+    async def _get_current_each_async(self):
+        """AsyncCall variant of the one-GET-per-key readback: all reads in flight at once."""
+        calls = await asyncio.gather(
+            *(self.scorpion.get(key) for key in self.default_params), return_exceptions=True
+        )
+        for call in calls:
+            if isinstance(call, RequestException):
+                return {"error": f"Scorpion API Call Failed: {call}"}
+            if isinstance(call, BaseException):
+                raise call
+        return self._current_table(calls)
+
+    def _current_table(self, calls):
+        current = {"name": [], "code": [], "value": [], "default": [], "error": []}
+        for (key, default_value), call in zip(self.default_params.items(), calls):
+            if isinstance(call, dict) and call.get("error") and "value" not in call:
+                current["name"].append(None)
+                current["code"].append(key)
+                current["value"].append(None)
+                current["default"].append(default_value)
+                current["error"].append(str(call["error"]))
+                continue
 
             name = call.get("name") if isinstance(call, dict) else None
             code = call.get("id") if isinstance(call, dict) else key
@@ -597,5 +1119,6 @@ class Defaults:
             current["code"].append(code)
             current["value"].append(value)
             current["default"].append(default_value)
+            current["error"].append(None)
 
-        return current
\ No newline at end of file
+        return current
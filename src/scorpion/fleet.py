@@ -0,0 +1,67 @@
+# src/scorpion/fleet.py
+"""Concurrent 'Set Defaults' across many Scorpions, built on scorpion.default.Defaults"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional
+
+from src.fleet import fleet_workers, run_fleet
+from src.scorpion.default import Defaults
+
+
+def apply_all_defaults(
+    targets: Iterable[str],
+    port: int = 80,
+    max_workers: Optional[int] = None,
+    config: Optional[Dict[str, Any]] = None,
+    delta: bool = False,
+    journal: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run Defaults.apply_all_defaults() on every target concurrently.
+
+    Every host gets its own Defaults (and therefore its own HTTP session), so a
+    slow or failing unit only affects its own entry in the result.
+
+    Args:
+        targets: control IPs of the Scorpions
+        port: control HTTP port
+        max_workers: hosts in flight at once; defaults to config SCORPION_FLEET_WORKERS (8)
+        config: parsed config.json, only used to look up the worker cap
+        delta: only send parameters whose current value differs (Defaults.apply_delta_defaults)
+        journal: record each host's run in config/journal so resume_all() can finish it
+
+    Returns:
+        dict: see src.fleet.run_fleet ("results" keeps the per-IP shape the tab renders)
+    """
+    if max_workers is None:
+        max_workers = fleet_workers(config, "SCORPION_FLEET_WORKERS")
+
+    def _apply(ip: str) -> Dict[str, Any]:
+        d = Defaults(name=f"SC@{ip}", host=ip, port=port)
+        return d.apply_all_defaults(delta=delta, journal=journal)
+
+    return run_fleet(targets, _apply, max_workers=max_workers)
+
+
+def resume_all(
+    targets: Iterable[str],
+    port: int = 80,
+    max_workers: Optional[int] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run Defaults.resume() on every target concurrently: each host only gets the
+    parameters its last apply journal shows as unsent.
+
+    Returns:
+        dict: see src.fleet.run_fleet
+    """
+    if max_workers is None:
+        max_workers = fleet_workers(config, "SCORPION_FLEET_WORKERS")
+
+    def _resume(ip: str) -> Dict[str, Any]:
+        d = Defaults(name=f"SC@{ip}", host=ip, port=port)
+        return d.resume()
+
+    return run_fleet(targets, _resume, max_workers=max_workers)
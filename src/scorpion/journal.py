@@ -0,0 +1,179 @@
+# src/scorpion/journal.py
+"""On-disk apply journal so an interrupted Scorpion push can be resumed
+
+Each host has one JSON Lines file (config/journal/<host>.jsonl) describing the
+latest apply run:
+
+    {"event": "run", "run": "20260428-210219", "host": "10.169.20.51", "kind": "apply_all"}
+    {"event": "step", "step": 0, "label": "routes_clear", "params": {"3009.0": "0", ...}}
+    {"event": "sent", "step": 0, "keys": ["3009.0", ...]}        # one line per accepted chunk
+    {"event": "done", "step": 0}
+    ...
+
+Lines are appended as the device accepts each chunk, so after a crash or a
+failed chunk pending() returns exactly the parameters that were never sent.
+
+Only one journaled run per host can be in progress in this process: claim()
+takes the host's run lock and a second apply/resume on the same host is turned
+away instead of interleaving its lines with the first.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
+SRC_DIR = os.path.dirname(PARENT_DIR)
+ROOT_DIR = os.path.dirname(SRC_DIR)
+
+JOURNAL_DIR = f"{ROOT_DIR}/config/journal"
+
+# journal path -> lock held for the whole of a run (begin .. last line)
+_RUN_LOCKS: Dict[str, threading.Lock] = {}
+_RUN_LOCKS_GUARD = threading.Lock()
+
+
+def _run_lock(path: str) -> threading.Lock:
+    key = os.path.realpath(path)
+    with _RUN_LOCKS_GUARD:
+        lock = _RUN_LOCKS.get(key)
+        if lock is None:
+            lock = _RUN_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def journal_path(host: str, directory: Optional[str] = None) -> str:
+    """config/journal/<host>.jsonl (JOURNAL_DIR is read at call time)"""
+    safe = "".join(c if c.isalnum() or c in ".-" else "_" for c in str(host))
+    return os.path.join(directory or JOURNAL_DIR, f"{safe}.jsonl")
+
+
+class ApplyJournal:
+    """Journal of the latest apply run for one host"""
+
+    def __init__(self, host: str, path: Optional[str] = None):
+        self.host = host
+        self.path = path or journal_path(host)
+        self._lock = threading.Lock()
+        self._next_step = 0
+        self._claimed = False
+
+    # ---- run ownership ----
+    def claim(self) -> bool:
+        """Take the host's run lock; False when another run on this host holds it"""
+        if not self._claimed:
+            self._claimed = _run_lock(self.path).acquire(blocking=False)
+        return self._claimed
+
+    def release(self):
+        if self._claimed:
+            self._claimed = False
+            _run_lock(self.path).release()
+
+    # ---- writing ----
+    def _append(self, entry: Dict[str, Any]):
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    def begin(self, kind: str = "apply_all") -> str:
+        """Start a new run, discarding whatever the previous run left behind"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        run = datetime.now().strftime("%Y%m%d-%H%M%S")
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"event": "run", "run": run, "host": self.host, "kind": kind}) + "\n")
+            self._next_step = 0
+        return run
+
+    def step(self, params: Dict[str, Any], label: Optional[str] = None) -> int:
+        """Record the full parameter set of one _send_params call; returns its step number"""
+        with self._lock:
+            step = self._next_step
+            self._next_step += 1
+        self._append({"event": "step", "step": step, "label": label, "params": params})
+        return step
+
+    def sent(self, step: int, keys):
+        self._append({"event": "sent", "step": step, "keys": list(keys)})
+
+    def done(self, step: int):
+        self._append({"event": "done", "step": step})
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    # ---- reading ----
+    def load(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """(run header, steps) where each step has label, params, sent (set) and done"""
+        header: Dict[str, Any] = {}
+        steps: Dict[int, Dict[str, Any]] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # a torn last line from a crash mid-write
+                        continue
+                    event = entry.get("event")
+                    if event == "run":
+                        header = entry
+                    elif event == "step":
+                        steps[entry["step"]] = {
+                            "step": entry["step"],
+                            "label": entry.get("label"),
+                            "params": entry.get("params") or {},
+                            "sent": set(),
+                            "done": False,
+                        }
+                    elif event == "sent" and entry.get("step") in steps:
+                        steps[entry["step"]]["sent"].update(entry.get("keys") or [])
+                    elif event == "done" and entry.get("step") in steps:
+                        steps[entry["step"]]["done"] = True
+        except FileNotFoundError:
+            pass
+        return header, [steps[i] for i in sorted(steps)]
+
+    def pending(self) -> List[Tuple[int, Optional[str], Dict[str, Any]]]:
+        """
+        [(step, label, unsent params)] in the original order.
+
+        A key that a later step has already written is dropped, so replaying an
+        earlier step (eg the route clear) can't undo a later one (the route mapping).
+        """
+        _, steps = self.load()
+        pending = []
+        written_later: set = set()
+        for step in reversed(steps):
+            if not step["done"]:
+                remaining = {
+                    k: v for k, v in step["params"].items()
+                    if k not in step["sent"] and k not in written_later
+                }
+                if remaining:
+                    pending.append((step["step"], step["label"], remaining))
+            written_later.update(step["sent"])
+        pending.reverse()
+        with self._lock:
+            self._next_step = max(self._next_step, len(steps))
+        return pending
+
+    def summary(self) -> Dict[str, Any]:
+        """Run header plus how many parameters are still unsent, per step label"""
+        header, steps = self.load()
+        if not header:
+            return {}
+        pending = self.pending()
+        return {
+            "run": header.get("run"),
+            "kind": header.get("kind"),
+            "steps": len(steps),
+            "pending": {f"{step}:{label}": len(params) for step, label, params in pending},
+            "pending_keys": sum(len(params) for _, _, params in pending),
+        }
@@ -0,0 +1,224 @@
+# src/scorpion/plan.py
+"""Whole-fleet Scorpion address plan: compile once, look devices up by IP
+
+The expanded parameter set Defaults.get_user_defaults() builds for one host
+only differs between Scorpions in the label (55/5204) and the last octet of
+the generated 2110 multicast addresses. compile_plan() expands the defaults
+once with a placeholder octet and stamps out every device from that template.
+
+The plan is written as JSON Lines (config/scorpion_plan.jsonl):
+
+    {"plan": {"fingerprint": "...", "created": "...", "outputs": 8, "devices": 20}}
+    {"name": "SCPN6-051", "ip": "10.169.20.51", "label": "SCPN6-051", "params": {...}, "trunks": {...}}
+    ...
+
+The fingerprint covers the config keys and default_params.json the plan was
+built from; lookup() ignores a stale plan, so callers fall back to expanding.
+
+Example:
+    python -m src.scorpion.plan          # compile and write the plan for config.json
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src import utils
+from src.scorpion.default import (
+    EXPANSION_CONFIG_KEYS,
+    ROOT_DIR,
+    device_label,
+    expand_2110_outputs,
+    read_config,
+    read_default_params,
+    trunk_params,
+)
+
+PLAN_PATH = f"{ROOT_DIR}/config/scorpion_plan.jsonl"
+OUTPUTS = 8
+
+# Config keys (besides the 2110 ones) that change what a device's plan contains
+PLAN_CONFIG_KEYS = EXPANSION_CONFIG_KEYS + (
+    "SCORPION_RANGE",
+    "SCORPION_RANGE_NAME_PFIX",
+    "CONTROL_PREFIX",
+    "SCORPION_LIST",
+    "SCORPION_TRUNKS",
+)
+
+# Stands in for the last octet while the shared template is expanded
+_OCTET = "\x00octet\x00"
+
+
+def fingerprint(config: dict, defaults: dict, outputs: int = OUTPUTS) -> str:
+    """Hash of everything a plan is derived from (defaults key order included)"""
+    source = {
+        "config": {k: config.get(k) for k in PLAN_CONFIG_KEYS},
+        "defaults": list(defaults.items()),
+        "outputs": outputs,
+    }
+    return hashlib.sha1(json.dumps(source, default=repr).encode("utf-8")).hexdigest()
+
+
+def devices(config: dict) -> Dict[str, str]:
+    """{name: ip} for every Scorpion in SCORPION_RANGE / SCORPION_LIST"""
+    return {
+        name: ip for name, ip in utils.get_scorpion_unit_list(config).items() if name != "Select" and ip
+    }
+
+
+def compile_plan(
+    config: Optional[dict] = None,
+    defaults: Optional[dict] = None,
+    outputs: int = OUTPUTS,
+    targets: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Expanded parameter sets for every Scorpion in one pass.
+
+    Args:
+        config: parsed config.json (read from disk when omitted)
+        defaults: parsed default_params.json (read from disk when omitted)
+        outputs: 2110 outputs per device
+        targets: {name: ip} to plan; defaults to SCORPION_RANGE / SCORPION_LIST
+
+    Returns:
+        list: one record per device; "params" equals Defaults(host=ip).get_user_defaults()
+    """
+    config = read_config() if config is None else config
+    defaults = read_default_params() if defaults is None else defaults
+    if not defaults:
+        raise RuntimeError("Failed to load default_params.json")
+    targets = devices(config) if targets is None else targets
+
+    # Same steps as get_user_defaults(): labels are (re)assigned before expansion,
+    # so their position in the dict matches.
+    template_source = dict(defaults)
+    template_source["55"] = ""
+    template_source["5204"] = ""
+    template = expand_2110_outputs(template_source, config, f"0.0.0.{_OCTET}", outputs=outputs)
+    per_octet = [
+        (k, v) for k, v in template.items() if isinstance(v, str) and _OCTET in v
+    ]
+    trunks = trunk_params(config)
+
+    records = []
+    for name, ip in targets.items():
+        octet = str(ip).strip().split(".")[-1]
+        label = device_label(config, ip)
+        params = dict(template)
+        params["55"] = label
+        params["5204"] = label
+        for key, value in per_octet:
+            params[key] = value.replace(_OCTET, octet)
+        records.append(
+            {"name": name, "ip": ip, "label": label, "params": params, "trunks": dict(trunks)}
+        )
+    return records
+
+
+def write_plan(
+    config: Optional[dict] = None,
+    defaults: Optional[dict] = None,
+    path: str = PLAN_PATH,
+    outputs: int = OUTPUTS,
+) -> Dict[str, Any]:
+    """
+    Compile the plan and write it to path (atomically).
+
+    Returns:
+        dict: the plan header ({"fingerprint", "created", "outputs", "devices", "path"})
+    """
+    config = read_config() if config is None else config
+    defaults = read_default_params() if defaults is None else defaults
+    records = compile_plan(config, defaults, outputs=outputs)
+    header = {
+        "fingerprint": fingerprint(config, defaults, outputs),
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "outputs": outputs,
+        "devices": len(records),
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"plan": header}, separators=(",", ":")) + "\n")
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+    return {**header, "path": path}
+
+
+class PlanFile:
+    """Read access to a written plan; records are found by IP through a byte-offset index"""
+
+    def __init__(self, path: str = PLAN_PATH):
+        self.path = path
+        self.header: Dict[str, Any] = {}
+        self.offsets: Dict[str, int] = {}
+        with open(path, "rb") as f:
+            first = f.readline()
+            self.header = json.loads(first).get("plan", {}) if first.strip() else {}
+            offset = f.tell()
+            for line in f:
+                if line.strip():
+                    # only the "ip" field is needed for the index
+                    self.offsets[json.loads(line)["ip"]] = offset
+                offset += len(line)
+
+    def get(self, ip: str) -> Optional[Dict[str, Any]]:
+        """The device's record, or None if the plan has no entry for it"""
+        offset = self.offsets.get(ip)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, "rb") as f:
+            f.readline()
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+_PLANS: Dict[str, Tuple[Tuple[int, int, int], PlanFile]] = {}
+_PLANS_LOCK = threading.Lock()
+
+
+def load_plan(path: str = PLAN_PATH) -> Optional[PlanFile]:
+    """The plan at path (index cached until the file changes), or None if there is none"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+    with _PLANS_LOCK:
+        cached = _PLANS.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    try:
+        plan = PlanFile(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    with _PLANS_LOCK:
+        _PLANS[path] = (stamp, plan)
+    return plan
+
+
+def lookup(ip: str, config: dict, defaults: dict, path: str = PLAN_PATH,
+           outputs: int = OUTPUTS) -> Optional[Dict[str, Any]]:
+    """The planned params for ip, or None when there is no plan, no entry, or the plan is stale"""
+    plan = load_plan(path)
+    if plan is None or plan.header.get("fingerprint") != fingerprint(config, defaults, outputs):
+        return None
+    record = plan.get(ip)
+    return record["params"] if record else None
+
+
+if __name__ == "__main__":
+    print(json.dumps(write_plan(), indent=4))
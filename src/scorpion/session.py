@@ -1,21 +1,26 @@
 """Creates a requests session to the Evertz Scorpion api"""
 
+import asyncio
 import base64
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 
+import aiohttp
 import requests
+import yarl
 from pydantic import BaseModel, ConfigDict
 
+from src import configstore, httppool, telemetry
+from src.ratelimit import limiter_for
+from src.scorpion import tokens
 from src.scorpion.utils import Url
+from src.urlbuilder import UrlBuilder
 
 PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
 SRC_DIR = os.path.dirname(PARENT_DIR)
 ROOT_DIR = os.path.dirname(SRC_DIR)
 
-
 class Session(BaseModel):
     """Creates a requests session to the Evertz Scorpion api"""
 
@@ -28,6 +33,7 @@ class Session(BaseModel):
     max_records_per_request: int = 100
     session: Optional[requests.Session] = None
     url: Optional[str] = None
+    urls: Optional[UrlBuilder] = None
     timeout: float = 2
     config: dict = None
     token: str = None
@@ -35,64 +41,52 @@ class Session(BaseModel):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.config = self._get_config()
-        self.token = self.config.get("SCORPION_TOKEN")
-        self.session = requests.Session()
+        self.session = httppool.session_for(self.scheme, self.host, self.port)
         self.url = Url(
             scheme=self.scheme,
             host=self.host,
             port=self.port,
             version=self.version,
         )
+        self.urls = UrlBuilder(scheme=self.scheme, host=self.host, port=self.port)
         if self.config.get("JWT_ENABLED"):
+            # fetch up front; the header goes on each request (the pooled
+            # requests.Session is shared with other Sessions for this host)
             self._token()
-            self.session.headers.update({"jwt": self.token})
 
     def _get_config(self):
-        with open(f"{ROOT_DIR}/config/config.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _write_config(self):
-        with open(f"{ROOT_DIR}/config/config.json", "w", encoding="utf-8") as f:
-            f.write(
-                json.dumps(self.config, indent=4, sort_keys=True, ensure_ascii=False)
-            )
+        # Sessions are built per IP per button press (and from fleet worker
+        # threads); they all share one parsed snapshot
+        return configstore.config()
 
     def _token(self):
+        token = tokens.cache().get(
+            self.host, fetch=self._get_token, refresh=self._refresh_token
+        )
+        # self.token is only informational (verify_token); another thread may
+        # overwrite it, so callers use the returned value
+        self.token = token
+        return token
 
-        if not self.token:
-            self.token = self._get_token()
-        else:
-            timestamp_str = self.config["SCORPION_TOKEN_TIMEOUT"]
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-            if not datetime.now() < timestamp:
-                self.token = self._get_token()
-
-    def _set_token_timeout(self, timeout: int):
-        timestamp = datetime.now()
-        timestamp += timedelta(seconds=timeout)
-        self.config["SCORPION_TOKEN_TIMEOUT"] = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-        self._write_config()
-
-    def _get_token(self):
+    @staticmethod
+    def _credentials():
         creds = json.dumps(
             {
                 "username": os.environ["SCORPION_USER"],
                 "password": os.environ["SCORPION_PASS"],
             }
         ).encode("ascii")
-        creds = base64.b64encode(creds)
-        creds = creds.decode("ascii")
-        self.url.path = f"{self.version}BT/JWTCREATE/{creds}"
-        response = requests.post(
-            self.url.to_string(),
+        return base64.b64encode(creds).decode("ascii")
+
+    def _get_token(self):
+        """Create a token; returns (token, life in seconds)"""
+        response = self.session.post(
+            self.urls.build(f"{self.version}BT/JWTCREATE/{self._credentials()}"),
             verify=False,
             timeout=5,
         )
-        token = response.json()["jwt"]
-        self.config["SCORPION_TOKEN"] = token
-        self._write_config()
-        self._set_token_timeout(response.json()["brief"]["life"])
-        return token
+        body = response.json()
+        return body["jwt"], body["brief"]["life"]
 
     def verify_token(self):
         """Verifies if the currently stored token is valid
@@ -100,9 +94,8 @@ class Session(BaseModel):
         Returns:
             bool: True if the token is valid, False otherwise
         """
-        self.url.path = f"{self.version}BT/JWTVERIFY/{self.token}"
-        response = requests.post(
-            self.url.to_string(),
+        response = self.session.post(
+            self.urls.build(f"{self.version}BT/JWTVERIFY/{self.token}"),
             verify=False,
             timeout=2,
         )
@@ -111,19 +104,15 @@ class Session(BaseModel):
             return True
         return False
 
-    def _refresh_token(self):
-        self.url.path = f"{self.version}BT/JWTREFRESH/{self.token}"
-        response = requests.post(
-            self.url.to_string(),
+    def _refresh_token(self, token=None):
+        """Exchange a still-valid token for a new one; returns (token, life in seconds)"""
+        response = self.session.post(
+            self.urls.build(f"{self.version}BT/JWTREFRESH/{token or self.token}"),
             verify=False,
             timeout=5,
         )
-        token = response.json().get("jwt")
-        self.config["SCORPION_TOKEN"] = token
-        self._write_config()
-        self._set_env("SCORPION_TOKEN", token)
-        self._set_token_timeout(response.json()["brief"]["life"])
-        return False
+        body = response.json()
+        return body.get("jwt"), body["brief"]["life"]
 
     def _process_response(self, response):
         try:
@@ -142,15 +131,170 @@ class Session(BaseModel):
         # self._refresh_token()
         return response.json()
 
-    def _request(self, http_method: str, params=None, json_data=None, files=None):
+    def _request(self, http_method: str, path: str, query=None, params=None, json_data=None, files=None):
+        # everything per request (path, query, jwt header) stays local, so
+        # threads sharing this Session can't send each other's parameters
+        limiter_for(self.host, "scorpion").acquire()
+        headers = None
+        if self.config.get("JWT_ENABLED"):
+            # a cache lookup; long-lived sessions pick up refreshed tokens here
+            headers = {"jwt": self._token()}
+        url = self.urls.build(path, query)
+        endpoint = telemetry.endpoint_family(path, self.version)
+        with telemetry.timed("scorpion", self.host, http_method, endpoint, url) as outcome:
+            outcome["response"] = self.session.request(
+                http_method,
+                url,
+                params=params,
+                json=json_data,
+                files=files,
+                headers=headers,
+                timeout=self.timeout,
+            )
+            return self._process_response(outcome["response"])
+
+
+class AsyncSession(Session):
+    """Creates an aiohttp session to the Evertz Scorpion api
+
+    Same fields and JWT handling as Session, but requests are coroutines so many
+    Scorpions can be driven from one event loop. The token is fetched lazily on the
+    first request instead of in __init__.
+
+    Pass ``client`` to share one aiohttp.ClientSession (and its connection limit)
+    between several hosts; otherwise one is created on first use and closed by close().
+    """
 
-        response = self.session.request(
-            http_method,
-            self.url.to_string(),
-            params=params,
-            json=json_data,
-            files=files,
-            timeout=self.timeout,
+    max_connections: int = 16
+    client: Optional[Any] = None
+    owns_client: bool = True
+    client_loop: Optional[Any] = None
+    token_lock: Optional[Any] = None
+
+    def __init__(self, **kwargs):
+        BaseModel.__init__(self, **kwargs)
+        self.config = self._get_config()
+        self.owns_client = self.client is None
+        self.url = Url(
+            scheme=self.scheme,
+            host=self.host,
+            port=self.port,
+            version=self.version,
         )
-        print(self.url.to_string())
-        return self._process_response(response)
+        self.urls = UrlBuilder(scheme=self.scheme, host=self.host, port=self.port)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """Close the aiohttp session if this object created it"""
+        if self.owns_client and self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    def _client(self):
+        loop = asyncio.get_running_loop()
+        if self.owns_client and (
+            self.client is None or self.client.closed or self.client_loop is not loop
+        ):
+            # first use, or the session belonged to a previous asyncio.run() loop
+            self.client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                # per-socket timeouts like requests; time queued for a free
+                # connection must not count against the request
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=self.timeout, sock_read=self.timeout
+                ),
+            )
+        if self.client_loop is not loop:
+            self.client_loop = loop
+            self.token_lock = asyncio.Lock()
+        return self.client
+
+    async def _token(self):
+        cache = tokens.cache()
+        token, state = cache.lookup(self.host)
+        if state != tokens.VALID:
+            async with self.token_lock:
+                token, state = cache.lookup(self.host)
+                if state == tokens.REFRESH:
+                    try:
+                        token, life = await self._refresh_token(token)
+                    except Exception as exc:
+                        print(f"Token refresh for {self.host} failed, logging in again: {exc}")
+                        token = None
+                    if token:
+                        cache.store(self.host, token, life)
+                        state = tokens.VALID
+                if state != tokens.VALID:
+                    token, life = await self._get_token()
+                    cache.store(self.host, token, life)
+        self.token = token
+        return token
+
+    async def _post_auth(self, path: str, timeout: float):
+        url = yarl.URL(self.urls.build(f"{self.version}{path}"), encoded=True)
+        try:
+            async with self._client().post(
+                url, ssl=False, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise requests.exceptions.ConnectionError(str(exc)) from exc
+
+    async def _get_token(self):
+        """Create a token; returns (token, life in seconds)"""
+        body = await self._post_auth(f"BT/JWTCREATE/{self._credentials()}", timeout=5)
+        return body["jwt"], body["brief"]["life"]
+
+    async def verify_token(self):
+        """Verifies if the currently stored token is valid
+
+        Returns:
+            bool: True if the token is valid, False otherwise
+        """
+        body = await self._post_auth(f"BT/JWTVERIFY/{self.token}", timeout=2)
+        if body.get("status") == "valid":
+            print(f"{body.get('life-remain')}")
+            return True
+        return False
+
+    async def _refresh_token(self, token=None):
+        """Exchange a still-valid token for a new one; returns (token, life in seconds)"""
+        body = await self._post_auth(f"BT/JWTREFRESH/{token or self.token}", timeout=5)
+        return body.get("jwt"), body["brief"]["life"]
+
+    async def _request(self, http_method: str, path: str, query=None, params=None, json_data=None, files=None):
+        url = yarl.URL(self.urls.build(path, query), encoded=True)
+        endpoint = telemetry.endpoint_family(path, self.version)
+        client = self._client()
+        await limiter_for(self.host, "scorpion").acquire_async()
+        headers = None
+        if self.config.get("JWT_ENABLED"):
+            headers = {"jwt": await self._token()}
+        try:
+            with telemetry.timed("scorpion", self.host, http_method, endpoint, str(url)) as outcome:
+                async with client.request(
+                    http_method, url, params=params, json=json_data, data=files, headers=headers
+                ) as response:
+                    outcome["status"] = response.status
+                    body = await response.read()
+                    outcome["nbytes"] = len(body)
+                    if response.status >= 400:
+                        text = await response.text()
+                        err_msg = f"{response.status} Error: {response.reason} for url: {url}"
+                        print(f"{err_msg} [{text}]")
+                        # a bare requests.Response so callers can read the status like the sync path
+                        failed = requests.Response()
+                        failed.status_code = response.status
+                        failed.reason = response.reason
+                        failed.url = str(url)
+                        raise requests.exceptions.HTTPError(err_msg, response=failed)
+                    return await response.json(content_type=None)
+        except asyncio.TimeoutError as exc:
+            raise requests.exceptions.Timeout(f"Timed out: {url}") from exc
+        except aiohttp.ClientError as exc:
+            raise requests.exceptions.ConnectionError(str(exc)) from exc
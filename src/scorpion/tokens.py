@@ -0,0 +1,203 @@
+"""Process-wide JWT token cache for the Scorpion Sessions
+
+Every Session/AsyncSession for a host shares one cached token, so building a new
+Defaults per IP per button press costs no auth round trip while the token is
+valid. Tokens are refreshed (JWTREFRESH) shortly before they expire and only
+re-created (JWTCREATE) when refresh fails or the token has already expired.
+
+Persistence is optional (SCORPION_TOKEN_PERSIST, default true) and write-behind:
+updates are coalesced and flushed once per SCORPION_TOKEN_FLUSH_DELAY seconds, and
+at interpreter exit, to config/tokens.json
+
+    {"10.169.20.51": {"token": "...", "timeout": "2026-04-28 21:02:19"}}
+
+Tokens live in their own file so a flush never rewrites config.json under the
+Config Manager (or makes every config reader parse it again). A SCORPION_TOKENS
+map left in config.json by older versions is read once when tokens.json doesn't
+exist yet.
+"""
+
+import atexit
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from src import configstore
+
+PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
+SRC_DIR = os.path.dirname(PARENT_DIR)
+ROOT_DIR = os.path.dirname(SRC_DIR)
+TOKENS_PATH = f"{ROOT_DIR}/config/tokens.json"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+REFRESH_MARGIN = 60
+FLUSH_DELAY = 5.0
+
+VALID = "valid"
+REFRESH = "refresh"
+EXPIRED = "expired"
+
+
+def _read_tokens() -> Optional[dict]:
+    """The persisted {host: {"token", "timeout"}} map, or None if tokens.json doesn't exist"""
+    try:
+        with open(TOKENS_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class TokenCache:
+    """In-memory JWT tokens keyed by host
+
+    Example:
+        cache.get("10.169.20.51", fetch=session._get_token, refresh=session._refresh_token)
+    """
+
+    def __init__(self, persist: bool = True, refresh_margin: float = REFRESH_MARGIN,
+                 flush_delay: float = FLUSH_DELAY):
+        self.persist = persist
+        self.refresh_margin = refresh_margin
+        self.flush_delay = flush_delay
+        self._entries: Dict[str, Tuple[str, datetime]] = {}
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+
+    def load(self, persisted: dict):
+        """Seed the cache from a persisted {host: {"token", "timeout"}} map, skipping expired tokens"""
+        now = datetime.now()
+        with self._lock:
+            for host, entry in (persisted or {}).items():
+                try:
+                    expires = datetime.strptime(entry["timeout"], TIME_FORMAT)
+                    token = entry["token"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if token and expires > now and host not in self._entries:
+                    self._entries[host] = (token, expires)
+
+    def lookup(self, host: str) -> Tuple[Optional[str], str]:
+        """Return (token, state): state is VALID, REFRESH (expires within the margin) or EXPIRED"""
+        with self._lock:
+            entry = self._entries.get(host)
+        if entry is None:
+            return None, EXPIRED
+        token, expires = entry
+        remaining = (expires - datetime.now()).total_seconds()
+        if remaining <= 0:
+            return token, EXPIRED
+        if remaining <= self.refresh_margin:
+            return token, REFRESH
+        return token, VALID
+
+    def store(self, host: str, token: str, life: float):
+        """Cache a token that the device says is good for `life` seconds"""
+        expires = datetime.now() + timedelta(seconds=float(life))
+        with self._lock:
+            self._entries[host] = (token, expires)
+        self._schedule_flush()
+
+    def invalidate(self, host: str):
+        with self._lock:
+            self._entries.pop(host, None)
+        self._schedule_flush()
+
+    def host_lock(self, host: str) -> threading.Lock:
+        """Lock held while a token for host is fetched, so threads don't all log in at once"""
+        with self._lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def get(self, host: str, fetch: Callable[[], Tuple[str, float]],
+            refresh: Optional[Callable[[str], Tuple[str, float]]] = None) -> str:
+        """
+        Return a usable token for host, refreshing or fetching it when needed.
+
+        Args:
+            host: device address
+            fetch: creates a new token; returns (token, life_seconds)
+            refresh: exchanges a still-valid token; returns (token, life_seconds)
+        """
+        token, state = self.lookup(host)
+        if state == VALID:
+            return token
+        with self.host_lock(host):
+            # another thread may have renewed it while we waited
+            token, state = self.lookup(host)
+            if state == VALID:
+                return token
+            if state == REFRESH and refresh is not None:
+                try:
+                    token, life = refresh(token)
+                except Exception as exc:
+                    print(f"Token refresh for {host} failed, logging in again: {exc}")
+                else:
+                    if token:
+                        self.store(host, token, life)
+                        return token
+            token, life = fetch()
+            self.store(host, token, life)
+            return token
+
+    def _schedule_flush(self):
+        if not self.persist:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write the cached tokens to tokens.json now (no-op if nothing changed)"""
+        with self._lock:
+            self._timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            tokens = {
+                host: {"token": token, "timeout": expires.strftime(TIME_FORMAT)}
+                for host, (token, expires) in self._entries.items()
+            }
+        with _FILE_LOCK:
+            if _read_tokens() == tokens:
+                return
+            os.makedirs(os.path.dirname(TOKENS_PATH), exist_ok=True)
+            tmp = f"{TOKENS_PATH}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps(tokens, indent=4, sort_keys=True, ensure_ascii=False))
+            os.replace(tmp, TOKENS_PATH)
+
+
+_FILE_LOCK = threading.Lock()
+_CACHE: Optional[TokenCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def cache() -> TokenCache:
+    """The process-wide cache, created (and seeded from tokens.json) on first use"""
+    global _CACHE
+    if _CACHE is not None:
+        return _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            config = configstore.config(default={})
+            tokens = TokenCache(
+                persist=bool(config.get("SCORPION_TOKEN_PERSIST", True)),
+                refresh_margin=float(config.get("SCORPION_TOKEN_REFRESH_MARGIN", REFRESH_MARGIN)),
+                flush_delay=float(config.get("SCORPION_TOKEN_FLUSH_DELAY", FLUSH_DELAY)),
+            )
+            if tokens.persist:
+                persisted = _read_tokens()
+                tokens.load(config.get("SCORPION_TOKENS") if persisted is None else persisted)
+            atexit.register(tokens.flush)
+            _CACHE = tokens
+        return _CACHE
@@ -0,0 +1,256 @@
+"""Per-request timing shared by every device Session
+
+Each Session._request reports one RequestEvent (method, endpoint family, host,
+status, bytes, duration) to the registered hooks. The default hook feeds an
+in-process registry of latency histograms keyed by (family, host, method,
+endpoint), which the UI reads back as per-device p50/p95 latency and error rate.
+
+    telemetry.add_hook(lambda event: print(event))  # extra hooks, eg logging
+    telemetry.summary(targets)                      # {host: {"requests", "p50_ms", ...}}
+
+REQUEST_LOG=1 in the environment adds a hook that prints one line per request.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class RequestEvent(NamedTuple):
+    family: str  # device type: "scorpion", "xip3901", "mcm", "prism", "arista"
+    host: str
+    method: str
+    endpoint: str  # path with the version prefix and per-object ids removed, eg "EV/SET/parameter"
+    status: Optional[int]  # None when no response came back (timeout, refused, ...)
+    nbytes: int
+    duration: float  # seconds
+    url: str = ""
+    error: str = ""
+
+
+# Histogram bucket upper bounds in milliseconds: 0.1ms .. ~140s, 25% apart
+BOUNDS_MS: Tuple[float, ...] = tuple(0.1 * 1.25**i for i in range(64))
+
+
+class Histogram:
+    """Bucketed latency histogram; percentiles are interpolated within a bucket"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets = [0] * (len(BOUNDS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.nbytes = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.statuses: Dict[str, int] = {}
+
+    def add(self, duration_ms: float, status: Optional[int], nbytes: int = 0):
+        with self._lock:
+            self.buckets[bisect.bisect_left(BOUNDS_MS, duration_ms)] += 1
+            self.count += 1
+            self.nbytes += nbytes
+            self.total_ms += duration_ms
+            self.min_ms = min(self.min_ms, duration_ms)
+            self.max_ms = max(self.max_ms, duration_ms)
+            if status is None or status >= 400:
+                self.errors += 1
+            key = str(status) if status is not None else "none"
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def merge(self, other: "Histogram"):
+        with other._lock:
+            buckets = list(other.buckets)
+            count, errors, nbytes, total = other.count, other.errors, other.nbytes, other.total_ms
+            low, high, statuses = other.min_ms, other.max_ms, dict(other.statuses)
+        with self._lock:
+            self.buckets = [a + b for a, b in zip(self.buckets, buckets)]
+            self.count += count
+            self.errors += errors
+            self.nbytes += nbytes
+            self.total_ms += total
+            self.min_ms = min(self.min_ms, low)
+            self.max_ms = max(self.max_ms, high)
+            for key, n in statuses.items():
+                self.statuses[key] = self.statuses.get(key, 0) + n
+
+    def percentile(self, pct: float) -> float:
+        with self._lock:
+            return self._percentile(pct)
+
+    def _percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                low = BOUNDS_MS[i - 1] if i else 0.0
+                high = BOUNDS_MS[i] if i < len(BOUNDS_MS) else self.max_ms
+                value = low + (high - low) * max(0.0, rank - seen) / n
+                return min(max(value, self.min_ms), self.max_ms)
+            seen += n
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.count,
+                "errors": self.errors,
+                "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+                "p50_ms": round(self._percentile(50), 2),
+                "p95_ms": round(self._percentile(95), 2),
+                "p99_ms": round(self._percentile(99), 2),
+                "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+                "max_ms": round(self.max_ms, 2),
+                "bytes": self.nbytes,
+                "statuses": dict(self.statuses),
+            }
+
+
+_HISTOGRAMS: Dict[Tuple[str, str, str, str], Histogram] = {}
+_HISTOGRAMS_LOCK = threading.Lock()
+
+
+def _histogram(key: Tuple[str, str, str, str]) -> Histogram:
+    histogram = _HISTOGRAMS.get(key)
+    if histogram is not None:
+        return histogram
+    with _HISTOGRAMS_LOCK:
+        return _HISTOGRAMS.setdefault(key, Histogram())
+
+
+def _record(event: RequestEvent):
+    key = (event.family, event.host, event.method, event.endpoint)
+    _histogram(key).add(event.duration * 1e3, event.status, event.nbytes)
+
+
+def _print(event: RequestEvent):
+    status = event.status if event.status is not None else event.error or "no response"
+    print(f"{event.method} {event.url or event.endpoint} -> {status} in {event.duration * 1e3:.1f}ms")
+
+
+_HOOKS: List[Callable[[RequestEvent], Any]] = [_record]
+if os.environ.get("REQUEST_LOG", "").lower() in ("1", "true", "yes"):
+    _HOOKS.append(_print)
+
+
+def add_hook(hook: Callable[[RequestEvent], Any]):
+    """Call hook(event) after every device request (from whichever thread sent it)"""
+    if hook not in _HOOKS:
+        _HOOKS.append(hook)
+
+
+def remove_hook(hook: Callable[[RequestEvent], Any]):
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+def emit(event: RequestEvent):
+    for hook in list(_HOOKS):
+        try:
+            hook(event)
+        except Exception as exc:
+            # instrumentation must never fail a device request
+            print(f"Request hook {hook!r} failed: {exc}")
+
+
+def endpoint_family(path: str, version: str = "", depth: int = 3) -> str:
+    """
+    Collapse a request path into a low-cardinality endpoint name.
+
+    The version prefix is dropped and the path is cut at the first segment that
+    looks like an id (contains a digit) or a suffix like ".json", so
+    "v.api/apis/EV/GET/parameter/6551.0.0.0" -> "EV/GET/parameter" and
+    "api/2.0/channels/command/start/12/.json" -> "channels/command/start".
+    """
+    path = (path or "").split("?", 1)[0].strip("/")
+    version = (version or "").strip("/")
+    if version and path.startswith(version):
+        path = path[len(version):]
+    kept = []
+    for segment in path.split("/"):
+        if not segment:
+            continue
+        if segment.startswith(".") or any(c.isdigit() for c in segment):
+            break
+        kept.append(segment)
+        if len(kept) == depth:
+            break
+    return "/".join(kept) or "/"
+
+
+@contextmanager
+def timed(family: str, host: str, method: str, endpoint: str, url: str = ""):
+    """
+    Time the block and emit one RequestEvent for it.
+
+    Yields a dict; set "response" (requests.Response) or "status"/"nbytes" in it
+    so the event carries the outcome. An exception leaving the block is recorded
+    with its HTTP status if it has a response, otherwise status None.
+    """
+    outcome: Dict[str, Any] = {}
+    started = time.perf_counter()
+    error = ""
+    try:
+        yield outcome
+    except BaseException as exc:
+        error = type(exc).__name__
+        response = getattr(exc, "response", None)
+        if response is not None and "status" not in outcome:
+            outcome["status"] = getattr(response, "status_code", None)
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        response = outcome.get("response")
+        status = outcome.get("status")
+        nbytes = outcome.get("nbytes", 0)
+        if response is not None:
+            status = response.status_code
+            nbytes = len(response.content or b"")
+        emit(RequestEvent(family, str(host), method.upper(), endpoint, status, nbytes, duration, url, error))
+
+
+def histograms(
+    hosts: Optional[Iterable[str]] = None, family: Optional[str] = None
+) -> Dict[Tuple[str, str, str, str], Histogram]:
+    with _HISTOGRAMS_LOCK:
+        items = dict(_HISTOGRAMS)
+    wanted = set(hosts) if hosts is not None else None
+    return {
+        key: h for key, h in items.items()
+        if (wanted is None or key[1] in wanted) and (family is None or key[0] == family)
+    }
+
+
+def summary(hosts: Optional[Iterable[str]] = None, family: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Latency and error rate per device (all endpoints merged)"""
+    merged: Dict[str, Histogram] = {}
+    for (_, host, _, _), histogram in histograms(hosts, family).items():
+        merged.setdefault(host, Histogram()).merge(histogram)
+    return {host: merged[host].snapshot() for host in sorted(merged)}
+
+
+def endpoints(hosts: Optional[Iterable[str]] = None, family: Optional[str] = None) -> List[Dict[str, Any]]:
+    """One row per (family, host, method, endpoint), eg for a dataframe"""
+    rows = []
+    for (fam, host, method, endpoint), histogram in sorted(histograms(hosts, family).items()):
+        snap = histogram.snapshot()
+        snap.pop("statuses")
+        rows.append(dict(family=fam, host=host, method=method, endpoint=endpoint, **snap))
+    return rows
+
+
+def reset(hosts: Optional[Iterable[str]] = None):
+    """Forget recorded timings, for all devices or only the given hosts"""
+    with _HISTOGRAMS_LOCK:
+        if hosts is None:
+            _HISTOGRAMS.clear()
+            return
+        wanted = set(hosts)
+        for key in [k for k in _HISTOGRAMS if k[1] in wanted]:
+            del _HISTOGRAMS[key]
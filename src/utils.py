@@ -1,6 +1,7 @@
-import json
 import os
 
+from src import configstore, discovery
+
 PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
 ROOT_DIR = os.path.dirname(PARENT_DIR)
 
@@ -14,23 +15,53 @@ def ping(host, timeout=0.2):
     return response == 0
 
 
-def discover_devices(scorpions, mcms, switches, xips=None):
+def _discovery_ports(config):
+    """Ports probed per device group: the control port first, then the usual web/ssh ports"""
+    scorpion_port = int(config.get("SCORPION_CONTROL_PORT", 80) or 80)
+    xip_port = int(config.get("XIP3901_CONTROL_PORT", 80) or 80)
+    return (
+        (scorpion_port, 80),
+        (80, 443),
+        (22, 443, 80),
+        (xip_port, 80, 443),
+    )
+
+
+def discover_devices(scorpions, mcms, switches, xips=None, timeout=None, details=False):
     """
-    Ping through dicts of name->ip and return a combined online/offline map.
+    Probe dicts of name->ip all at once and return a combined online/offline map.
+
+    Every device is swept concurrently (TCP connect to its ports, plus one ICMP
+    echo), so the whole rack takes about `timeout` seconds
+    (config DISCOVERY_TIMEOUT, default 1.0).
+
+    Returns:
+        dict: {name: bool}, or with details=True
+        {name: {"ip", "online", "rtt_ms", "via"}}
     """
+    config = configstore.config(default={})
+    if timeout is None:
+        timeout = float(config.get("DISCOVERY_TIMEOUT", discovery.DEFAULT_TIMEOUT))
     xips = xips or {}
-    status = {}
-    for groups in (scorpions, mcms, switches, xips):
+    devices = {}
+    targets = {}
+    for groups, ports in zip((scorpions, mcms, switches, xips), _discovery_ports(config)):
         for device, ip_address in groups.items():
             if device == "Select" or not ip_address:
                 continue
-            status[device] = ping(ip_address)
-    return status
+            ip_address = str(ip_address).strip()
+            devices[device] = ip_address
+            probed = targets.setdefault(ip_address, [])
+            probed.extend(p for p in ports if p not in probed)
+
+    results = discovery.sweep(targets, timeout=timeout)
+    if details:
+        return {device: dict(results[ip], ip=ip) for device, ip in devices.items()}
+    return {device: results[ip]["online"] for device, ip in devices.items()}
 
 
 def get_config():
-    with open(f"{ROOT_DIR}/config/config.json", "r", encoding="utf-8") as f:
-        config = json.load(f)
+    config = configstore.config()
     scorpions = _get_scorpion_unit_list(config)
     return (
         config,
@@ -41,6 +72,13 @@ def get_config():
     )
 
 
+def get_scorpion_unit_list(config):
+    """
+    Public helper to build the Scorpion {name: ip} list (SCORPION_RANGE or SCORPION_LIST).
+    """
+    return _get_scorpion_unit_list(config)
+
+
 def get_xip3901_unit_list(config):
     """
     Public helper to build XIP list; mirrors the scorpion list logic.
@@ -1,3 +1,3 @@
 # src/xip3901/__init__.py
 # Minimal, side-effect free init.
-__all__ = ["api", "default", "session", "utils"]
\ No newline at end of file
+__all__ = ["api", "default", "fleet", "session", "utils"]
\ No newline at end of file
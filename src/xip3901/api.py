@@ -10,9 +10,9 @@ class Call(Session):
 
     Notes
     -----
-    - The underlying `Session._request()` uses `self.timeout` when calling
-      `requests.Session.request(...)`. To support a custom timeout per call,
-      we temporarily override `self.timeout` and then restore it.
+    - The timeout is passed down to `Session._request()` with the path and
+      query, so `self.timeout` stays the default and calls from several
+      threads on one Call don't see each other's overrides.
     """
 
     def _do(
@@ -24,16 +24,7 @@ class Call(Session):
         json_data: Any = None,
         timeout: Optional[float] = None,
     ):
-        if timeout is None:
-            return self._request(method, path, params=query, json_data=json_data)
-
-        # Per-call timeout: temporarily override, then restore
-        old_timeout = self.timeout
-        try:
-            self.timeout = timeout
-            return self._request(method, path, params=query, json_data=json_data)
-        finally:
-            self.timeout = old_timeout
+        return self._request(method, path, params=query, json_data=json_data, timeout=timeout)
 
     def get(self, path: str, query: Optional[dict] = None, timeout: Optional[float] = None):
         return self._do("GET", path, query=query, timeout=timeout)
@@ -1,18 +1,230 @@
 # src/xip3901/default.py
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, Optional
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from requests.exceptions import RequestException
 
+from src import configstore
+from src.fleet import fleet_workers
 from src.xip3901.api import Call
 
+# sender PUTs in flight per device (config: XIP3901_SENDER_CONCURRENCY)
+SENDER_CONCURRENCY = 4
+
+# NMOS/PTP readiness polling: first poll after READY_FIRST_POLL s, doubling up to
+# READY_MAX_POLL s, giving up after XIP3901_READY_TIMEOUT (READY_TIMEOUT) s
+READY_TIMEOUT = 5.0
+READY_FIRST_POLL = 0.05
+READY_MAX_POLL = 0.5
+# the fixed settle time used when the device can't be polled
+SETTLE_FALLBACK = 0.6
+
+# readback GETs in flight per device during an audit (config: XIP3901_AUDIT_CONCURRENCY)
+AUDIT_CONCURRENCY = 8
+
 
 def _ensure_dot_suffix(s: str) -> str:
     s = (s or "").strip()
     return s if s.endswith(".") else f"{s}."
 
 
+def poll_until(
+    check: Callable[[], bool],
+    timeout: float = READY_TIMEOUT,
+    first: float = READY_FIRST_POLL,
+    cap: float = READY_MAX_POLL,
+) -> Dict[str, Any]:
+    """
+    Call check() until it returns True or timeout passes, backing off between polls.
+
+    check() runs immediately, then after first, 2*first, ... (at most cap) seconds.
+    Exceptions from check() propagate.
+
+    Returns:
+        dict: {"ready": bool, "waited_s": seconds, "polls": n}
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = first
+    polls = 0
+    while True:
+        polls += 1
+        if check():
+            return {"ready": True, "waited_s": round(time.monotonic() - started, 3), "polls": polls}
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return {"ready": False, "waited_s": round(time.monotonic() - started, 3), "polls": polls}
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, cap)
+
+
+def _same(actual: Any, expected: Any) -> bool:
+    # devices echo numbers as strings and vice versa; compare as text, case-insensitive
+    return str(actual).strip().lower() == str(expected).strip().lower()
+
+
+def _map_limited(
+    fn: Callable[[Any], Any],
+    items: List[Any],
+    workers: int,
+    limit: Optional[threading.Semaphore] = None,
+    name: str = "xip",
+) -> List[Any]:
+    """
+    fn(item) for every item, in order, with up to `workers` calls at once (1
+    runs them inline). Each call holds `limit` when given, so one semaphore can
+    cap the requests in flight across several devices.
+    """
+    def _call(item: Any) -> Any:
+        if limit is None:
+            return fn(item)
+        with limit:
+            return fn(item)
+
+    workers = max(1, min(int(workers), len(items)))
+    if workers == 1:
+        return [_call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name) as pool:
+        return list(pool.map(_call, items))
+
+
+def _enum(value: Any) -> str:
+    # enum values come back with their own case and separators ("IS-04 & IS-05" / "IS04_IS05")
+    return re.sub(r"[\s_&-]+", "", str(value)).lower()
+
+
+def _reports(current: Any, expected: Dict[str, Any]) -> bool:
+    """
+    Every expected field the device echoes back matches (enum-style comparison).
+
+    Fields the GET doesn't return (eg the NMOS label) can't be waited for and
+    are skipped; at least one field has to be echoed.
+    """
+    if not isinstance(current, dict):
+        return False
+    echoed = [k for k in expected if k in current]
+    return bool(echoed) and all(_enum(current[k]) == _enum(expected[k]) for k in echoed)
+
+
+def _drift(actual: Any, expected: Any, field: str = "") -> Dict[str, Dict[str, Any]]:
+    """
+    Fields of expected the device reports differently, {"rtp[0].txStreamPort": {"expected", "actual"}}.
+
+    Only fields present in expected are compared; extra fields on the device are ignored.
+    """
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            return {field or ".": {"expected": "object", "actual": actual}}
+        out: Dict[str, Dict[str, Any]] = {}
+        for k, v in expected.items():
+            out.update(_drift(actual.get(k), v, f"{field}.{k}" if field else str(k)))
+        return out
+    if isinstance(expected, list):
+        if not isinstance(actual, list):
+            return {field or ".": {"expected": "list", "actual": actual}}
+        out = {}
+        for i, v in enumerate(expected):
+            out.update(_drift(actual[i] if i < len(actual) else None, v, f"{field}[{i}]"))
+        return out
+    if actual is None or not _same(actual, expected):
+        return {field or ".": {"expected": expected, "actual": actual}}
+    return {}
+
+
+class RtpRenderer:
+    """
+    A sender body_template compiled into a function that builds sender bodies.
+
+    The template is walked once. Only the dicts/lists leading to a varying field
+    are rebuilt per render; everything else (static values and subtrees) is
+    reused from the template, which configstore keeps read-only.
+
+    Varying fields (the ones _fill_rtp_body used to patch):
+        rtp[0].txStreamAddress = red, rtp[1].txStreamAddress = blue,
+        rtp[0|1].txStreamPort = port, and for audio smpteType / profile
+    """
+
+    def __init__(self, template: Dict[str, Any], audio: bool = False):
+        self.template = template
+        self.audio = audio
+        slots: Dict[Tuple[Any, ...], str] = {
+            ("rtp", 0, "txStreamAddress"): "red",
+            ("rtp", 1, "txStreamAddress"): "blue",
+            ("rtp", 0, "txStreamPort"): "port",
+            ("rtp", 1, "txStreamPort"): "port",
+        }
+        if audio:
+            slots[("smpteType",)] = "audio_type"
+            slots[("profile",)] = "audio_profile"
+        self._build = self._compile(template, (), slots)
+
+    def render(self, red: str, blue: str, port: int,
+               audio_type: Optional[str] = None, audio_profile: Optional[str] = None) -> Dict[str, Any]:
+        return self._build({
+            "red": red, "blue": blue, "port": port,
+            "audio_type": audio_type, "audio_profile": audio_profile,
+        })
+
+    @classmethod
+    def _compile(cls, node: Any, path: Tuple[Any, ...], slots: Dict[Tuple[Any, ...], str]) -> Callable[[Dict[str, Any]], Any]:
+        if path in slots:
+            name = slots[path]
+            return lambda values: values[name]
+        below = [p for p in slots if p[:len(path)] == path and len(p) > len(path)]
+        if not below:
+            return lambda values: node
+        if isinstance(node, dict):
+            keys = list(node) + [p[len(path)] for p in below if len(p) == len(path) + 1 and p[-1] not in node]
+            parts = [(k, cls._compile(node.get(k), path + (k,), slots)) for k in keys]
+            return lambda values: {k: build(values) for k, build in parts}
+        if isinstance(node, list):
+            # a template without rtp[0]/rtp[1] fails here, as the old patching did
+            missing = {p[len(path)] for p in below} - set(range(len(node)))
+            if missing:
+                raise IndexError(f"sender template has no rtp[{min(missing)}]")
+            parts_ = [cls._compile(item, path + (i,), slots) for i, item in enumerate(node)]
+            return lambda values: [build(values) for build in parts_]
+        raise TypeError(f"sender template: {'.'.join(map(str, path))} is not an object")
+
+
+# compiled renderers kept (3 sender kinds per snapshot of the reference file)
+RENDERER_CACHE_SIZE = 16
+_RENDERERS: Dict[Tuple[int, bool], RtpRenderer] = {}
+_RENDERERS_LOCK = threading.Lock()
+
+
+def rtp_renderer(template: Dict[str, Any], audio: bool = False) -> RtpRenderer:
+    """
+    The compiled renderer for one body_template, shared by every Defaults.
+
+    Keyed by the template object: configstore hands every Defaults the same
+    snapshot, and a new one (so a recompile) only when the reference file changes.
+    """
+    key = (id(template), audio)
+    renderer = _RENDERERS.get(key)
+    if renderer is not None and renderer.template is template:
+        return renderer
+    with _RENDERERS_LOCK:
+        renderer = _RENDERERS.get(key)
+        if renderer is None or renderer.template is not template:
+            if len(_RENDERERS) >= RENDERER_CACHE_SIZE:
+                # renderers of older snapshots of the reference file
+                _RENDERERS.clear()
+            renderer = _RENDERERS[key] = RtpRenderer(template, audio)
+        return renderer
+
+
+def sender_concurrency(config: Optional[Dict[str, Any]]) -> int:
+    try:
+        return max(1, int((config or {}).get("XIP3901_SENDER_CONCURRENCY", SENDER_CONCURRENCY)))
+    except (TypeError, ValueError):
+        return SENDER_CONCURRENCY
+
+
 def _host_only(v: Optional[str]) -> str:
     if not v:
         return ""
@@ -95,27 +307,28 @@ class Defaults:
             }
         return summary
 
+    @property
+    def hostname(self) -> str:
+        return f"{self.config.get('XIP3901_RANGE_NAME_PFIX','XIP3901-')}{self.last_octet:03}"
+
     def apply_network_and_hostname(self) -> Dict[str, Any]:
         results: Dict[str, Any] = {}
-        hostname = f"{self.config.get('XIP3901_RANGE_NAME_PFIX','XIP3901-')}{self.last_octet:03}"
         path = self.refs.get("networking", {}).get("host", {}).get("path", "networking/host")
         try:
-            results["hostname"] = self.client.put(path, json_data={"hostname": hostname})
+            results["hostname"] = self.client.put(path, json_data={"hostname": self.hostname})
         except RequestException as exc:
             results["hostname"] = {"error": str(exc)}
         return results
 
-    def apply_interfaces(self) -> Dict[str, Any]:
+    def interface_bodies(self) -> Dict[str, Dict[str, Any]]:
         """
-        Apply interface configuration.
+        Interface configuration, {ifid: body}.
 
         - eth1/eth2: use Config Manager overrides if provided, else DHCP.
         - frame:     use Config Manager override if provided, else Off.
         - eth3:      ALWAYS derived from XIP3901_CONTROL_PREFIX + last_octet (Static).
                     Any eth3 override in config is ignored by design.
         """
-        results: Dict[str, Any] = {}
-
         def _body(mode: str, ip="0.0.0.0", sm="0.0.0.0", gw_="0.0.0.0"):
             return {"mode": mode, "ipAddress": ip, "subnetMask": sm, "gateway": gw_}
 
@@ -155,14 +368,17 @@ class Defaults:
         gw   = self.config.get("XIP3901_GATEWAY", f"{ctrl_net}.1")
         eth3_body = _body("Static", ip=f"{ctrl_net}.{self.last_octet}", sm=mask, gw_=gw)
 
-        payloads = {
+        return {
             "eth1": eth1_body,
             "eth2": eth2_body,
             "eth3": eth3_body,   # ignore any config override
             "frame": frame_body,
         }
 
-        for ifid, b in payloads.items():
+    def apply_interfaces(self) -> Dict[str, Any]:
+        """Apply interface configuration (see interface_bodies)"""
+        results: Dict[str, Any] = {}
+        for ifid, b in self.interface_bodies().items():
             try:
                 results[ifid] = self.client.put(f"networking/interfaces/{ifid}", json_data=b)
             except RequestException as exc:
@@ -170,10 +386,70 @@ class Defaults:
 
         return results
 
+    def wait_for_state(self, path: str, expected: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Poll GET path until the fields of expected it echoes back match (see
+        _reports and poll_until).
+
+        If the endpoint can't be read, falls back to the old fixed settle time.
+        A device that never reports the new state gets an "error" entry.
+
+        Returns:
+            dict: {"ready": bool | None, "waited_s", "polls"} (+ "fallback" or "error": text)
+        """
+        if timeout is None:
+            timeout = float(self.config.get("XIP3901_READY_TIMEOUT", READY_TIMEOUT))
+        started = time.monotonic()
+        try:
+            waited = poll_until(lambda: _reports(self.client.get(path), expected), timeout=timeout)
+            if not waited["ready"]:
+                waited["error"] = f"{path} did not report the new state within {timeout:g}s"
+            return waited
+        except RequestException as exc:
+            time.sleep(SETTLE_FALLBACK)
+            return {
+                "ready": None,
+                "waited_s": round(time.monotonic() - started, 3),
+                "polls": None,
+                "fallback": str(exc),
+            }
+
+    def _put_and_wait(self, out: Dict[str, Any], waits: Dict[str, Any], key: str, path: str, body: Dict[str, Any]):
+        try:
+            out[key] = self.client.put(path, json_data=body)
+        except RequestException as exc:
+            out[key] = {"error": str(exc)}
+            return
+        waits[key] = self.wait_for_state(path, body)
+
     def apply_nmos_and_ptp(self) -> Dict[str, Any]:
-        import time
+        """
+        NMOS off -> registry -> NMOS on -> PTP.
+
+        After each NMOS step the device is polled until it reports the new state
+        (instead of a fixed sleep); out["waits"] records how long each wait took.
+        """
         out: Dict[str, Any] = {}
+        waits: Dict[str, Any] = {}
+        plan = self.nmos_ptp_bodies()
+        nmos_global_path, nmos_on = plan["nmos_global"]
+        nmos_reg_path, nmos_reg = plan["nmos_registry"]
+        ptp_path, ptp = plan["ptp"]
+
+        self._put_and_wait(out, waits, "nmos_global_off", nmos_global_path, {"mode": "OFF", "label": self.hostname})
+        self._put_and_wait(out, waits, "nmos_registry", nmos_reg_path, nmos_reg)
+        self._put_and_wait(out, waits, "nmos_global_on", nmos_global_path, nmos_on)
 
+        try:
+            out["ptp"] = self.client.put(ptp_path, json_data=ptp)
+        except RequestException as exc:
+            out["ptp"] = {"error": str(exc)}
+
+        out["waits"] = waits
+        return out
+
+    def nmos_ptp_bodies(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Final NMOS and PTP state: {"nmos_global" | "nmos_registry" | "ptp": (path, body)}"""
         nmos_mode   = self.refs.get("defaults", {}).get("nmos_mode", "IS-04 & IS-05")
         reg_mode    = self.refs.get("defaults", {}).get("registry_mode", "Static")
         reg_port    = int(self.refs.get("defaults", {}).get("registry_port", 3020))
@@ -184,8 +460,6 @@ class Defaults:
         ptp_to      = int(self.refs.get("defaults", {}).get("ptp_announce_timeout", 3))
         ptp_dscp    = int(self.refs.get("defaults", {}).get("ptp_dscp", 46))
 
-        hostname = f"{self.config.get('XIP3901_RANGE_NAME_PFIX','XIP3901-')}{self.last_octet:03}"
-
         nmos_global_path = self.refs.get("nmos", {}).get("global", {}).get("path", "nmos/global")
         nmos_reg_path    = self.refs.get("nmos", {}).get("registry", {}).get("path", "nmos/registry")
         ptp_path         = self.refs.get("ptp", {}).get("path", "reference/ptp")
@@ -193,75 +467,81 @@ class Defaults:
         links = self.config.get("LINKS") or {}
         reg_ip = _host_only((links.get("hi") if isinstance(links, dict) else None))
 
-        try:
-            out["nmos_global_off"] = self.client.put(nmos_global_path, json_data={"mode": "OFF", "label": hostname})
-        except RequestException as exc:
-            out["nmos_global_off"] = {"error": str(exc)}
-        time.sleep(0.6)
-
-        try:
-            out["nmos_registry"] = self.client.put(nmos_reg_path, json_data={
+        return {
+            "nmos_global": (nmos_global_path, {"mode": nmos_mode, "label": self.hostname}),
+            "nmos_registry": (nmos_reg_path, {
                 "registryMode": reg_mode,
                 "httpAddress": reg_ip,
                 "registrationPort": reg_port,
                 "queryPort": query_port
-            })
-        except RequestException as exc:
-            out["nmos_registry"] = {"error": str(exc)}
-        time.sleep(0.6)
-
-        try:
-            out["nmos_global_on"] = self.client.put(nmos_global_path, json_data={"mode": nmos_mode, "label": hostname})
-        except RequestException as exc:
-            out["nmos_global_on"] = {"error": str(exc)}
-        time.sleep(0.6)
-
-        try:
-            out["ptp"] = self.client.put(ptp_path, json_data={
+            }),
+            "ptp": (ptp_path, {
                 "domainNumber": ptp_domain,
                 "announceInterval": ptp_int,
                 "announceReceiptTimeoutCount": ptp_to,
                 "dscp": ptp_dscp
-            })
-        except RequestException as exc:
-            out["ptp"] = {"error": str(exc)}
-
-        return out
+            }),
+        }
 
-    def apply_senders(self) -> Dict[str, Any]:
-        results = {"video": [], "audio": [], "meta": []}
+    def sender_jobs(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """(kind, path, body) for every sender channel, in push order"""
+        jobs: List[Tuple[str, str, Dict[str, Any]]] = []
 
         v_ref = self.refs["senders"]["video"]
         for out_idx in range(8):
             v_oct = self.video_rng[out_idx]
             body = self._fill_rtp_body(v_ref["body_template"], v_oct, self.udp_video)
-            path = v_ref["path_template"].format(channelId=out_idx + 1)
-            try:
-                results["video"].append(self.client.put(path, json_data=body))
-            except RequestException as exc:
-                results["video"].append({"error": str(exc)})
+            jobs.append(("video", v_ref["path_template"].format(channelId=out_idx + 1), body))
 
         a_ref = self.refs["senders"]["audio"]
         cur = self.audio_rng_start
         for out_idx in range(8):
             body = self._fill_rtp_body(a_ref["body_template"], cur, self.udp_audio, audio=True)
-            path = a_ref["path_template"].format(channelId=out_idx + 1)
-            try:
-                results["audio"].append(self.client.put(path, json_data=body))
-            except RequestException as exc:
-                results["audio"].append({"error": str(exc)})
+            jobs.append(("audio", a_ref["path_template"].format(channelId=out_idx + 1), body))
             cur += 1
 
         m_ref = self.refs["senders"]["meta"]
         for out_idx in range(8):
             m_oct = self.meta_rng[out_idx]
             body = self._fill_rtp_body(m_ref["body_template"], m_oct, self.udp_meta)
-            path = m_ref["path_template"].format(channelId=out_idx + 1)
+            jobs.append(("meta", m_ref["path_template"].format(channelId=out_idx + 1), body))
+
+        return jobs
+
+    def apply_senders(
+        self,
+        max_in_flight: Optional[int] = None,
+        limit: Optional[threading.Semaphore] = None,
+    ) -> Dict[str, Any]:
+        """
+        PUT all 24 sender channels (8 video, 8 audio, 8 meta) concurrently.
+
+        Args:
+            max_in_flight: PUTs in flight to this device; defaults to config
+                XIP3901_SENDER_CONCURRENCY (4), 1 sends them one by one
+            limit: semaphore held around every PUT, shared by all devices of a
+                fleet push to cap the total (see src.xip3901.fleet)
+
+        Returns:
+            dict: {"video": [...], "audio": [...], "meta": [...]} replies (or
+            {"error": ...}) in channel order
+        """
+        if max_in_flight is None:
+            max_in_flight = sender_concurrency(self.config)
+        jobs = self.sender_jobs()
+
+        def _put(job: Tuple[str, str, Dict[str, Any]]) -> Any:
+            _, path, body = job
             try:
-                results["meta"].append(self.client.put(path, json_data=body))
+                return self.client.put(path, json_data=body)
             except RequestException as exc:
-                results["meta"].append({"error": str(exc)})
+                return {"error": str(exc)}
+
+        replies = _map_limited(_put, jobs, max_in_flight, limit, f"xip-senders-{self.host}")
 
+        results: Dict[str, Any] = {"video": [], "audio": [], "meta": []}
+        for (kind, _, _), reply in zip(jobs, replies):
+            results[kind].append(reply)
         return results
 
     def apply_advanced_qos(self) -> Dict[str, Any]:
@@ -336,18 +616,98 @@ class Defaults:
 
         return out
 
+    def expected_state(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        What every applied resource should read back as: {name: (path, expected fields)}.
+
+        Interfaces that aren't Static are checked for mode only (DHCP picks the
+        addresses); QoS entries missing from the reference file are skipped.
+        """
+        expected: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        host_path = self.refs.get("networking", {}).get("host", {}).get("path", "networking/host")
+        expected["hostname"] = (host_path, {"hostname": self.hostname})
+
+        for ifid, body in self.interface_bodies().items():
+            check = body if body["mode"] == "Static" else {"mode": body["mode"]}
+            expected[f"interfaces/{ifid}"] = (f"networking/interfaces/{ifid}", check)
+
+        for name, (path, body) in self.nmos_ptp_bodies().items():
+            expected[name] = (path, body)
+
+        channel: Dict[str, int] = {}
+        for kind, path, body in self.sender_jobs():
+            channel[kind] = channel.get(kind, 0) + 1
+            expected[f"senders/{kind}/{channel[kind]}"] = (path, body)
+
+        adv = self.refs.get("advanced", {})
+        for name in ("video", "audio30", "audio31", "meta"):
+            ref = adv.get(name)
+            if isinstance(ref, dict) and "path" in ref:
+                expected[f"qos/{name}"] = (ref["path"], {k: ref[k] for k in ("dscp", "payloadType") if k in ref})
+        glob = adv.get("global")
+        if isinstance(glob, dict) and "path" in glob and "minimumProcessingDelayEnable" in glob:
+            expected["qos/global"] = (glob["path"], {"minimumProcessingDelayEnable": glob["minimumProcessingDelayEnable"]})
+        return expected
+
+    def audit(
+        self,
+        max_in_flight: Optional[int] = None,
+        limit: Optional[threading.Semaphore] = None,
+    ) -> Dict[str, Any]:
+        """
+        Read back every resource in expected_state() concurrently and report drift.
+
+        Args:
+            max_in_flight: GETs in flight to this device; defaults to config
+                XIP3901_AUDIT_CONCURRENCY (8)
+            limit: semaphore held around every GET, shared by all devices of a
+                fleet audit to cap the total (see src.xip3901.fleet)
+
+        Returns:
+            dict: {"ok": bool, "checked": n, "drifted": n, "unreadable": n,
+            "drift": {name: {field: {"expected", "actual"}}}, "errors": {name: text}}
+        """
+        if max_in_flight is None:
+            max_in_flight = fleet_workers(self.config, "XIP3901_AUDIT_CONCURRENCY", AUDIT_CONCURRENCY)
+        expected = self.expected_state()
+        names = list(expected)
+
+        def _get(name: str) -> Tuple[bool, Any]:
+            # (True, reply) or (False, error text)
+            try:
+                return True, self.client.get(expected[name][0])
+            except RequestException as exc:
+                return False, str(exc)
+
+        replies = _map_limited(_get, names, max_in_flight, limit, f"xip-audit-{self.host}")
+
+        drift: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        for name, (read, reply) in zip(names, replies):
+            if not read:
+                errors[name] = reply
+                continue
+            fields = _drift(reply, expected[name][1])
+            if fields:
+                drift[name] = fields
+
+        return {
+            "ok": not drift and not errors,
+            "checked": len(names),
+            "drifted": len(drift),
+            "unreadable": len(errors),
+            "drift": drift,
+            "errors": errors,
+        }
+
     def _fill_rtp_body(self, template: Dict[str, Any], suffix_octet: int, udp_port: int, audio: bool = False) -> Dict[str, Any]:
-        t = json.loads(json.dumps(template))
-        red  = f"{self.red_prefix}{self.last_octet}.{suffix_octet}"
-        blue = f"{self.blue_prefix}{self.last_octet}.{suffix_octet}"
-        t["rtp"][0]["txStreamAddress"] = red
-        t["rtp"][1]["txStreamAddress"] = blue
-        t["rtp"][0]["txStreamPort"] = udp_port
-        t["rtp"][1]["txStreamPort"] = udp_port
-        if audio:
-            t["smpteType"] = self.audio_type
-            t["profile"]   = self.audio_profile
-        return t
+        return rtp_renderer(template, audio).render(
+            f"{self.red_prefix}{self.last_octet}.{suffix_octet}",
+            f"{self.blue_prefix}{self.last_octet}.{suffix_octet}",
+            udp_port,
+            self.audio_type,
+            self.audio_profile,
+        )
 
     @staticmethod
     def _expand_range(s: str):
@@ -361,9 +721,5 @@ class Defaults:
 
     @staticmethod
     def _load_json_from_repo(rel_path: str) -> Dict[str, Any]:
-        import os
-        here = os.path.dirname(os.path.realpath(__file__))
-        src  = os.path.dirname(here)
-        root = os.path.dirname(src)
-        with open(f"{root}/{rel_path}", "r", encoding="utf-8") as f:
-            return json.load(f)
\ No newline at end of file
+        """Read-only snapshot, shared by every Defaults until the file changes"""
+        return configstore.load(f"{configstore.ROOT_DIR}/{rel_path}")
\ No newline at end of file
@@ -0,0 +1,240 @@
+# src/xip3901/fleet.py
+"""Concurrent sender push, drift audit and staged rollout across many XIP3901s, built on xip3901.default.Defaults"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src import configstore
+from src.fleet import fleet_workers, run_fleet
+from src.xip3901.default import Defaults
+
+# sender PUTs in flight across the whole fleet (config: XIP3901_MAX_IN_FLIGHT)
+MAX_IN_FLIGHT = 32
+
+# staged rollout: canary units first, then waves of WAVE_SIZE; a wave whose
+# failure rate exceeds MAX_FAILURE_RATE stops the rollout
+# (config: XIP3901_ROLLOUT_CANARY / _WAVE_SIZE / _MAX_FAILURE_RATE)
+CANARY = 1
+WAVE_SIZE = 8
+MAX_FAILURE_RATE = 0.25
+
+
+def _run_limited(
+    targets: Iterable[str],
+    port: int,
+    op: Callable[[Defaults, threading.Semaphore], Dict[str, Any]],
+    max_workers: Optional[int],
+    max_in_flight: Optional[int],
+    config: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    run_fleet() with one Defaults per target; op(defaults, limit) gets a
+    semaphore shared by every device so at most max_in_flight requests
+    (config XIP3901_MAX_IN_FLIGHT, 32) are out across the fleet.
+    """
+    config = configstore.config(default={}) if config is None else config
+    if max_workers is None:
+        max_workers = fleet_workers(config, "XIP3901_FLEET_WORKERS")
+    if max_in_flight is None:
+        max_in_flight = fleet_workers(config, "XIP3901_MAX_IN_FLIGHT", MAX_IN_FLIGHT)
+    limit = threading.BoundedSemaphore(max(1, int(max_in_flight)))
+
+    def _one(ip: str) -> Dict[str, Any]:
+        return op(Defaults(name=f"XIP@{ip}", host=ip, port=port), limit)
+
+    return run_fleet(targets, _one, max_workers=max_workers)
+
+
+def apply_senders(
+    targets: Iterable[str],
+    port: int = 80,
+    max_workers: Optional[int] = None,
+    per_device: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run Defaults.apply_senders() on every target concurrently.
+
+    Args:
+        targets: control IPs of the XIP3901s
+        port: control HTTP port
+        max_workers: devices in flight at once; defaults to config XIP3901_FLEET_WORKERS (8)
+        per_device: sender PUTs in flight per device; defaults to XIP3901_SENDER_CONCURRENCY (4)
+        max_in_flight: sender PUTs in flight across all devices; defaults to XIP3901_MAX_IN_FLIGHT (32)
+        config: parsed config.json; read from disk when omitted
+
+    Returns:
+        dict: see src.fleet.run_fleet ("results" keeps the per-IP shape the tab renders)
+    """
+    return _run_limited(
+        targets, port,
+        lambda d, limit: d.apply_senders(max_in_flight=per_device, limit=limit),
+        max_workers, max_in_flight, config,
+    )
+
+
+def audit(
+    targets: Iterable[str],
+    port: int = 80,
+    max_workers: Optional[int] = None,
+    per_device: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run Defaults.audit() on every target concurrently.
+
+    Every device's readback runs at once (up to max_workers), so a rack takes
+    about as long as its slowest unit.
+
+    Args:
+        targets: control IPs of the XIP3901s
+        port: control HTTP port
+        max_workers: devices in flight at once; defaults to config XIP3901_FLEET_WORKERS (8)
+        per_device: GETs in flight per device; defaults to XIP3901_AUDIT_CONCURRENCY (8)
+        max_in_flight: GETs in flight across all devices; defaults to XIP3901_MAX_IN_FLIGHT (32)
+        config: parsed config.json; read from disk when omitted
+
+    Returns:
+        dict: see src.fleet.run_fleet; "results" holds each IP's drift report
+    """
+    return _run_limited(
+        targets, port,
+        lambda d, limit: d.audit(max_in_flight=per_device, limit=limit),
+        max_workers, max_in_flight, config,
+    )
+
+
+def _has_error(result: Any) -> bool:
+    """
+    True if any nested step of an apply result is an {"error": "<text>"} wrapper
+    (what the apply_* methods put in place of a failed request). Device replies
+    that merely carry an "error" field (null, 0, "") don't count.
+    """
+    if isinstance(result, dict):
+        error = result.get("error")
+        if isinstance(error, str) and error:
+            return True
+        return any(_has_error(v) for v in result.values())
+    if isinstance(result, list):
+        return any(_has_error(v) for v in result)
+    return False
+
+
+def _rate(config: Dict[str, Any]) -> float:
+    try:
+        return min(1.0, max(0.0, float(config.get("XIP3901_ROLLOUT_MAX_FAILURE_RATE", MAX_FAILURE_RATE))))
+    except (TypeError, ValueError):
+        return MAX_FAILURE_RATE
+
+
+def _canary(config: Dict[str, Any]) -> int:
+    # not fleet_workers(): that clamps to 1, and 0 turns the canary stage off
+    try:
+        return max(0, int(config.get("XIP3901_ROLLOUT_CANARY", CANARY)))
+    except (TypeError, ValueError):
+        return CANARY
+
+
+def rollout(
+    targets: Iterable[str],
+    port: int = 80,
+    canary: Optional[int] = None,
+    wave_size: Optional[int] = None,
+    max_failure_rate: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    verify: bool = True,
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run Defaults.apply_all_defaults() as a staged rollout.
+
+    The first `canary` targets go alone; if any of them fails, nothing else is
+    touched. The rest follow in waves of wave_size (max_workers in flight),
+    and the rollout stops after the first wave whose share of failed units is
+    above max_failure_rate. A unit fails if any apply step returned an error
+    or, with verify, if its drift audit afterwards isn't clean.
+
+    Args:
+        targets: control IPs of the XIP3901s, canaries first
+        port: control HTTP port
+        canary: units in the canary stage, 0 for none; defaults to config XIP3901_ROLLOUT_CANARY (1)
+        wave_size: units per wave after the canary; defaults to XIP3901_ROLLOUT_WAVE_SIZE (8)
+        max_failure_rate: 0..1; defaults to XIP3901_ROLLOUT_MAX_FAILURE_RATE (0.25)
+        max_workers: units applied at once within a wave; defaults to XIP3901_FLEET_WORKERS (8)
+        verify: audit each unit after applying (see Defaults.audit)
+        config: parsed config.json; read from disk when omitted
+
+    Returns:
+        dict: {
+            "results": {ip: {"ok": bool, "apply": {...}, "audit": {...}}, ...},
+            "waves": [{"stage", "hosts", "failed", "failure_rate", "elapsed"}, ...],
+            "halted": reason or None,
+            "skipped": [ip, ...],           # never touched because the rollout stopped
+            "elapsed": seconds,
+        }
+    """
+    config = configstore.config(default={}) if config is None else config
+    targets = list(dict.fromkeys(t for t in targets if t))
+    if canary is None:
+        canary = _canary(config)
+    if wave_size is None:
+        wave_size = fleet_workers(config, "XIP3901_ROLLOUT_WAVE_SIZE", WAVE_SIZE)
+    if max_failure_rate is None:
+        max_failure_rate = _rate(config)
+    if max_workers is None:
+        max_workers = fleet_workers(config, "XIP3901_FLEET_WORKERS")
+
+    def _apply(ip: str) -> Dict[str, Any]:
+        d = Defaults(name=f"XIP@{ip}", host=ip, port=port)
+        applied = d.apply_all_defaults()
+        out: Dict[str, Any] = {"ok": not _has_error(applied), "apply": applied}
+        if verify:
+            out["audit"] = d.audit()
+            out["ok"] = out["ok"] and out["audit"]["ok"]
+        return out
+
+    stages: List[List[str]] = []
+    canary = max(0, int(canary))
+    wave_size = max(1, int(wave_size))
+    if canary:
+        stages.append(targets[:canary])
+    rest = targets[canary:]
+    stages.extend(rest[i:i + wave_size] for i in range(0, len(rest), wave_size))
+
+    started = time.perf_counter()
+    results: Dict[str, Any] = {}
+    waves: List[Dict[str, Any]] = []
+    halted: Optional[str] = None
+    for index, hosts in enumerate(stages):
+        wave = run_fleet(hosts, _apply, max_workers=max_workers)
+        results.update(wave["results"])
+        failed = [ip for ip in hosts if not wave["results"][ip].get("ok")]
+        rate = len(failed) / len(hosts)
+        is_canary = bool(canary) and index == 0
+        stage = "canary" if is_canary else f"wave {index if canary else index + 1}"
+        waves.append({
+            "stage": stage,
+            "hosts": hosts,
+            "failed": failed,
+            "failure_rate": round(rate, 3),
+            "elapsed": wave["elapsed"],
+        })
+        if is_canary and failed:
+            halted = f"canary failed: {', '.join(failed)}"
+        elif rate > max_failure_rate:
+            halted = f"{stage}: {len(failed)}/{len(hosts)} failed (limit {max_failure_rate:.0%})"
+        if halted:
+            break
+
+    return {
+        "results": results,
+        "waves": waves,
+        "halted": halted,
+        "skipped": [ip for ip in targets if ip not in results],
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
@@ -6,6 +6,9 @@ from typing import Optional
 import requests
 from pydantic import BaseModel, ConfigDict
 
+from src import httppool, telemetry
+from src.ratelimit import limiter_for
+from src.urlbuilder import UrlBuilder
 from src.xip3901.utils import Url
 
 
@@ -20,11 +23,13 @@ class Session(BaseModel):
 
     session: Optional[requests.Session] = None
     url: Optional[Url] = None
+    urls: Optional[UrlBuilder] = None
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.session = requests.Session()
+        self.session = httppool.session_for(self.scheme, self.host, self.port)
         self.url = Url(scheme=self.scheme, host=self.host, port=self.port, path=self.version)
+        self.urls = UrlBuilder(scheme=self.scheme, host=self.host, port=self.port)
 
     def _process_response(self, response: requests.Response):
         response.raise_for_status()
@@ -33,13 +38,19 @@ class Session(BaseModel):
         except Exception:
             return {"status": response.status_code, "text": response.text}
 
-    def _request(self, http_method: str, path: str, params=None, json_data=None):
-        self.url.path = f"{self.version}{path.lstrip('/')}"
-        response = self.session.request(
-            http_method,
-            self.url.to_string(),
-            params=params,
-            json=json.loads(json_data) if isinstance(json_data, str) else json_data,
-            timeout=self.timeout,
-        )
-        return self._process_response(response)
\ No newline at end of file
+    def _request(self, http_method: str, path: str, params=None, json_data=None, timeout: Optional[float] = None):
+        # path, query and timeout are per-call values: nothing on self is written,
+        # so one Session can serve requests from many threads at once
+        full_path = f"{self.version}{path.lstrip('/')}"
+        limiter_for(self.host, "xip3901").acquire()
+        url = self.urls.build(full_path)
+        endpoint = telemetry.endpoint_family(path)
+        with telemetry.timed("xip3901", self.host, http_method, endpoint, url) as outcome:
+            outcome["response"] = self.session.request(
+                http_method,
+                url,
+                params=params,
+                json=json.loads(json_data) if isinstance(json_data, str) else json_data,
+                timeout=self.timeout if timeout is None else timeout,
+            )
+            return self._process_response(outcome["response"])
\ No newline at end of file
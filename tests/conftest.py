@@ -0,0 +1,43 @@
+# tests/conftest.py
+"""Shared fixtures: loopback device mocks and per-test isolation of process-wide state"""
+
+import pytest
+
+from src import ratelimit
+from src.scorpion import default as scorpion_default
+from src.scorpion import journal, tokens
+from tests.mocks.scorpion import MockScorpion
+from tests.mocks.xip3901 import MockXip, MockXipFleet
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    """Keep journals and tokens out of config/ and start every test with fresh per-host state"""
+    monkeypatch.setenv("SCORPION_USER", "test")
+    monkeypatch.setenv("SCORPION_PASS", "test")
+    monkeypatch.setattr(journal, "JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setattr(tokens, "TOKENS_PATH", str(tmp_path / "tokens.json"))
+    monkeypatch.setattr(tokens, "_CACHE", tokens.TokenCache(persist=False))
+    monkeypatch.setattr(scorpion_default, "_RECORD_LIMITS", {})
+    # the mocks answer instantly; per-device throttling would only slow the tests down
+    monkeypatch.setattr(ratelimit, "_BUCKETS", {})
+    monkeypatch.setattr(ratelimit, "DEFAULT_RATE", 0.0)
+    return tmp_path
+
+
+@pytest.fixture
+def scorpion():
+    with MockScorpion(host="127.0.1.1") as device:
+        yield device
+
+
+@pytest.fixture
+def xip():
+    with MockXip(host="127.0.2.1") as device:
+        yield device
+
+
+@pytest.fixture
+def xip_fleet():
+    with MockXipFleet(6, base="127.0.3.") as fleet:
+        yield fleet
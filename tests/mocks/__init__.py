@@ -0,0 +1,2 @@
+# tests/mocks/__init__.py
+# Loopback stand-ins for the device HTTP APIs, shared by the tests and benchmarks.
@@ -0,0 +1,399 @@
+# tests/mocks/scorpion.py
+"""Stand-in Scorpion HTTP API for offline benchmarking and testing
+
+Implements the endpoints the Sessions use:
+
+    GET  v.api/apis/EV/GET/parameter/<key>        -> {"id", "name", "value"}
+    GET  v.api/apis/EV/SET/parameter?<k>=<v>&...  -> [{"id", "name", "value"}, ...]
+    POST v.api/apis/BT/JWTCREATE/<base64 creds>   -> {"jwt", "brief": {"life"}}
+    POST v.api/apis/BT/JWTVERIFY/<jwt>            -> {"status": "valid"|"invalid", "life-remain"}
+    POST v.api/apis/BT/JWTREFRESH/<jwt>           -> {"jwt", "brief": {"life"}}
+
+with an in-memory parameter store, configurable latency, error injection, URL /
+parameter-count limits and connection limits.
+
+Example:
+    with MockFleet(20, latency=0.005) as fleet:
+        scorpion_fleet.apply_all_defaults(fleet.hosts, port=fleet.port)
+        print(fleet.stats())
+
+Or from a shell (serves until Ctrl+C):
+    python -m tests.mocks.scorpion --devices 20 --latency 0.005
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+API_PREFIX = "/v.api/apis/"
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class MockScorpion:
+    """One virtual Scorpion on host:port
+
+    Args:
+        host: address to bind (any 127.x.y.z works on Linux)
+        port: 0 picks a free port
+        latency: seconds added to every request, plus uniform(0, jitter)
+        error_rate: probability a parameter request fails with error_status
+        max_url_bytes: longer request targets get 414 (like a device's URL buffer)
+        max_params: more parameters in one EV/SET get 400
+        max_connections: requests handled at once; more are answered 503
+        requests_per_connection: keep-alive connections are closed after this many requests
+        require_jwt: parameter requests need a valid "jwt" header
+        credentials: (user, password) JWTCREATE accepts; None accepts any
+        token_life: seconds an issued token is valid
+        params: initial parameter store
+        reject_keys: parameters EV/SET answers with a per-key error (and doesn't store)
+        default_value: value reported for parameters never set
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        max_url_bytes: Optional[int] = None,
+        max_params: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        requests_per_connection: Optional[int] = None,
+        require_jwt: bool = False,
+        credentials: Optional[tuple] = None,
+        token_life: int = 480,
+        params: Optional[Dict[str, Any]] = None,
+        reject_keys: Optional[List[str]] = None,
+        default_value: str = "0",
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_url_bytes = max_url_bytes
+        self.max_params = max_params
+        self.max_connections = max_connections
+        self.requests_per_connection = requests_per_connection
+        self.require_jwt = require_jwt
+        self.credentials = credentials
+        self.token_life = token_life
+        self.default_value = default_value
+        self.reject_keys = set(map(str, reject_keys or ()))
+        self.store: Dict[str, str] = {str(k): str(v) for k, v in (params or {}).items()}
+        self.offline = False
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fail_next: List[int] = []
+        self._tokens: Dict[str, float] = {}
+        self._token_ids = itertools.count(1)
+        self._in_flight = 0
+        self.counters: Dict[str, Any] = {
+            "requests": 0,
+            "gets": 0,
+            "sets": 0,
+            "params_set": 0,
+            "auth": 0,
+            "errors": 0,
+            "rejected": 0,
+            "busy": 0,
+            "max_in_flight": 0,
+            "connections": 0,
+        }
+        self._server = _Server((host, port), self._handler_class())
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- lifecycle ----
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def start(self) -> "MockScorpion":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name=f"mock-scorpion-{self.address}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- fault injection ----
+    def fail_next(self, count: int = 1, status: int = 503):
+        """Answer the next `count` parameter requests with `status`"""
+        with self._lock:
+            self._fail_next.extend([status] * count)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, params_stored=len(self.store))
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.counters:
+                self.counters[key] = 0
+
+    # ---- request handling ----
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.counters[key] += n
+
+    def _issue_token(self) -> Dict[str, Any]:
+        token = f"mock-{self.port}-{next(self._token_ids)}"
+        with self._lock:
+            self._tokens[token] = time.monotonic() + self.token_life
+        return {"jwt": token, "brief": {"life": self.token_life}}
+
+    def _token_remaining(self, token: Optional[str]) -> float:
+        with self._lock:
+            expires = self._tokens.get(token or "")
+        return 0.0 if expires is None else max(0.0, expires - time.monotonic())
+
+    def _injected_error(self) -> Optional[int]:
+        with self._lock:
+            if self._fail_next:
+                return self._fail_next.pop(0)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    def _param(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            value = self.store.get(key, self.default_value)
+        return {"id": key, "name": f"Parameter {key}", "value": value}
+
+    def _handle(self, method: str, target: str, headers) -> tuple:
+        """(status, body) for one request"""
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._random.uniform(0, self.jitter))
+        parts = urlsplit(target)
+        if not parts.path.startswith(API_PREFIX):
+            return 404, {"error": "not found"}
+        route = parts.path[len(API_PREFIX):]
+
+        if method == "POST" and route.startswith("BT/"):
+            self._count("auth")
+            action, _, arg = route[3:].partition("/")
+            if action == "JWTCREATE":
+                try:
+                    creds = json.loads(base64.b64decode(unquote(arg)))
+                except ValueError:
+                    return 400, {"error": "bad credentials"}
+                if self.credentials and (creds.get("username"), creds.get("password")) != tuple(self.credentials):
+                    return 401, {"error": "invalid credentials"}
+                return 200, self._issue_token()
+            if action == "JWTVERIFY":
+                remaining = self._token_remaining(arg)
+                return 200, {"status": "valid" if remaining else "invalid", "life-remain": int(remaining)}
+            if action == "JWTREFRESH":
+                if not self._token_remaining(arg):
+                    return 401, {"error": "token expired"}
+                return 200, self._issue_token()
+            return 404, {"error": "not found"}
+
+        if method != "GET" or not route.startswith("EV/"):
+            return 404, {"error": "not found"}
+        if self.require_jwt and not self._token_remaining(headers.get("jwt")):
+            return 401, {"error": "jwt required"}
+        if self.max_url_bytes and len(target) > self.max_url_bytes:
+            self._count("rejected")
+            return 414, {"error": "request-uri too long"}
+        status = self._injected_error()
+        if status:
+            self._count("errors")
+            return status, {"error": "injected failure"}
+
+        if route.startswith("EV/GET/parameter/"):
+            self._count("gets")
+            return 200, self._param(unquote(route[len("EV/GET/parameter/"):]))
+        if route == "EV/SET/parameter":
+            pairs = parse_qsl(parts.query, keep_blank_values=True)
+            if self.max_params and len(pairs) > self.max_params:
+                self._count("rejected")
+                return 400, {"error": f"too many parameters ({len(pairs)} > {self.max_params})"}
+            accepted = [(key, value) for key, value in pairs if key not in self.reject_keys]
+            with self._lock:
+                self.store.update(accepted)
+                self.counters["sets"] += 1
+                self.counters["params_set"] += len(accepted)
+            return 200, [
+                {"id": key, "error": "rejected"} if key in self.reject_keys else self._param(key)
+                for key, _ in pairs
+            ]
+        return 404, {"error": "not found"}
+
+    def _handler_class(self):
+        device = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out as separate writes; without this every
+            # keep-alive response waits on the client's delayed ACK (~40ms)
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                self.served = 0
+                device._count("connections")
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Any):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.served += 1
+                if device.requests_per_connection and self.served >= device.requests_per_connection:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _dispatch(self, method: str):
+                device._count("requests")
+                if device.offline:
+                    # drop the connection without an answer (client sees ConnectionError)
+                    self.close_connection = True
+                    return
+                with device._lock:
+                    busy = device.max_connections and device._in_flight >= device.max_connections
+                    if not busy:
+                        device._in_flight += 1
+                        device.counters["max_in_flight"] = max(
+                            device.counters["max_in_flight"], device._in_flight
+                        )
+                if busy:
+                    device._count("busy")
+                    self._reply(503, {"error": "too many connections"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    if length:
+                        self.rfile.read(length)
+                    self._reply(*device._handle(method, self.path, self.headers))
+                finally:
+                    with device._lock:
+                        device._in_flight -= 1
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+        return Handler
+
+
+class MockFleet:
+    """N virtual Scorpions sharing one port on consecutive loopback addresses
+
+    hosts/port plug straight into scorpion.fleet.apply_all_defaults(). Keyword
+    arguments are passed to every MockScorpion.
+    """
+
+    def __init__(self, count: int, port: int = 0, base: str = "127.0.1.", **kwargs):
+        self.devices: List[MockScorpion] = []
+        try:
+            first = MockScorpion(host=f"{base}1", port=port, **kwargs)
+            self.devices.append(first)
+            self.port = first.port
+            for i in range(2, count + 1):
+                self.devices.append(MockScorpion(host=f"{base}{i}", port=self.port, **kwargs))
+        except OSError:
+            for device in self.devices:
+                device.stop()
+            raise
+
+    @property
+    def hosts(self) -> List[str]:
+        return [device.host for device in self.devices]
+
+    def device(self, host: str) -> MockScorpion:
+        return next(d for d in self.devices if d.host == host)
+
+    def start(self) -> "MockFleet":
+        for device in self.devices:
+            device.start()
+        return self
+
+    def stop(self):
+        for device in self.devices:
+            device.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {device.host: device.stats() for device in self.devices}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve mock Scorpions on loopback addresses")
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-url-bytes", type=int, default=None)
+    parser.add_argument("--max-params", type=int, default=None)
+    parser.add_argument("--max-connections", type=int, default=None)
+    parser.add_argument("--require-jwt", action="store_true")
+    args = parser.parse_args()
+
+    fleet = MockFleet(
+        args.devices,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        max_url_bytes=args.max_url_bytes,
+        max_params=args.max_params,
+        max_connections=args.max_connections,
+        require_jwt=args.require_jwt,
+    ).start()
+    print(f"Serving {len(fleet.devices)} mock Scorpion(s) on port {fleet.port}: {', '.join(fleet.hosts)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fleet.stop()
+
+
+if __name__ == "__main__":
+    main()
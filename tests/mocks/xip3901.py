@@ -0,0 +1,229 @@
+# tests/mocks/xip3901.py
+"""Stand-in XIP3901 REST API (/api/v1/...) for offline benchmarking and testing
+
+PUT stores the JSON body under its path (merged into what is already there),
+GET returns the stored object ({} if nothing was stored). Latency, error
+injection and dropped connections work like tests.mocks.scorpion.
+
+Example:
+    with MockXipFleet(8) as fleet:
+        Defaults(name="XIP", host=fleet.hosts[0], port=fleet.port).apply_senders()
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+API_PREFIX = "/api/v1/"
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class MockXip:
+    """One virtual XIP3901 on host:port
+
+    Args:
+        host: address to bind (any 127.x.y.z works on Linux)
+        port: 0 picks a free port
+        latency: seconds added to every request, plus uniform(0, jitter)
+        error_rate: probability a request fails with error_status
+        state: initial {path: object} store (paths relative to /api/v1/)
+        write_only: fields PUT stores but GET doesn't report (like the NMOS label)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        state: Optional[Dict[str, Any]] = None,
+        write_only: Optional[List[str]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.store: Dict[str, Any] = dict(state or {})
+        self.write_only = set(write_only or ())
+        self.offline = False
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fail_next: List[int] = []
+        self.counters: Dict[str, int] = {"requests": 0, "gets": 0, "puts": 0, "errors": 0}
+        self._server = _Server((host, port), self._handler_class())
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def start(self) -> "MockXip":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name=f"mock-xip-{self.address}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fail_next(self, count: int = 1, status: int = 503):
+        """Answer the next `count` requests with `status`"""
+        with self._lock:
+            self._fail_next.extend([status] * count)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, paths_stored=len(self.store))
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counters[key] += 1
+
+    def _injected_error(self) -> Optional[int]:
+        with self._lock:
+            if self._fail_next:
+                return self._fail_next.pop(0)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    def _handle(self, method: str, target: str, body: Any) -> tuple:
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._random.uniform(0, self.jitter))
+        path = urlsplit(target).path
+        if not path.startswith(API_PREFIX):
+            return 404, {"error": "not found"}
+        path = path[len(API_PREFIX):].strip("/")
+        status = self._injected_error()
+        if status:
+            self._count("errors")
+            return status, {"error": "injected failure"}
+        if method == "GET":
+            self._count("gets")
+            with self._lock:
+                current = json.loads(json.dumps(self.store.get(path, {})))
+            if isinstance(current, dict):
+                current = {k: v for k, v in current.items() if k not in self.write_only}
+            return 200, current
+        if method in ("PUT", "POST"):
+            self._count("puts")
+            with self._lock:
+                current = self.store.get(path)
+                if isinstance(current, dict) and isinstance(body, dict):
+                    current.update(body)
+                else:
+                    self.store[path] = body
+                return 200, json.loads(json.dumps(self.store[path]))
+        return 405, {"error": "method not allowed"}
+
+    def _handler_class(self):
+        device = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out as separate writes; without this every
+            # keep-alive response waits on the client's delayed ACK (~40ms)
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self, method: str):
+                device._count("requests")
+                if device.offline:
+                    self.close_connection = True
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = None
+                status, reply = device._handle(method, self.path, body)
+                data = json.dumps(reply).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+        return Handler
+
+
+class MockXipFleet:
+    """N virtual XIP3901s sharing one port on consecutive loopback addresses"""
+
+    def __init__(self, count: int, port: int = 0, base: str = "127.0.2.", **kwargs):
+        self.devices: List[MockXip] = []
+        try:
+            first = MockXip(host=f"{base}1", port=port, **kwargs)
+            self.devices.append(first)
+            self.port = first.port
+            for i in range(2, count + 1):
+                self.devices.append(MockXip(host=f"{base}{i}", port=self.port, **kwargs))
+        except OSError:
+            for device in self.devices:
+                device.stop()
+            raise
+
+    @property
+    def hosts(self) -> List[str]:
+        return [device.host for device in self.devices]
+
+    def device(self, host: str) -> MockXip:
+        return next(d for d in self.devices if d.host == host)
+
+    def start(self) -> "MockXipFleet":
+        for device in self.devices:
+            device.start()
+        return self
+
+    def stop(self):
+        for device in self.devices:
+            device.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {device.host: device.stats() for device in self.devices}
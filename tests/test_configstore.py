@@ -0,0 +1,78 @@
+# tests/test_configstore.py
+"""configstore snapshots: read-only freeze, thaw, and parse-once caching"""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from src import configstore
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"LINKS": {"hi": "10.0.0.1"}, "SCORPION_LIST": ["10.169.20.51"]}))
+    yield path
+    configstore.invalidate(str(path))
+
+
+def test_snapshots_are_read_only(config_file):
+    snapshot = configstore.load(str(config_file))
+    with pytest.raises(TypeError):
+        snapshot["LINKS"] = {}
+    with pytest.raises(TypeError):
+        snapshot["LINKS"]["hi"] = "10.0.0.2"
+    with pytest.raises(TypeError):
+        snapshot["SCORPION_LIST"].append("10.169.20.52")
+    with pytest.raises(TypeError):
+        snapshot.update({})
+    with pytest.raises(TypeError):
+        snapshot.setdefault("X", 1)
+
+
+def test_snapshots_still_behave_like_dicts(config_file):
+    snapshot = configstore.load(str(config_file))
+    assert isinstance(snapshot, dict) and isinstance(snapshot["SCORPION_LIST"], list)
+    assert snapshot.get("LINKS", {}).get("hi") == "10.0.0.1"
+    assert json.loads(json.dumps(snapshot)) == snapshot
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+
+def test_thaw_returns_an_editable_deep_copy(config_file):
+    snapshot = configstore.load(str(config_file))
+    for editable in (configstore.thaw(snapshot), copy.deepcopy(snapshot)):
+        assert type(editable) is dict and type(editable["LINKS"]) is dict
+        assert type(editable["SCORPION_LIST"]) is list
+        editable["LINKS"]["hi"] = "10.0.0.2"
+        editable["SCORPION_LIST"].append("10.169.20.52")
+    assert snapshot["LINKS"]["hi"] == "10.0.0.1"
+    assert snapshot["SCORPION_LIST"] == ["10.169.20.51"]
+
+
+def test_freeze_is_idempotent():
+    frozen = configstore.freeze({"a": [1, {"b": 2}]})
+    assert configstore.freeze(frozen) is frozen
+    assert isinstance(frozen["a"][1], configstore.FrozenDict)
+
+
+def test_load_parses_again_only_when_the_file_changes(config_file):
+    first = configstore.load(str(config_file))
+    assert configstore.load(str(config_file)) is first
+
+    config_file.write_text(json.dumps({"LINKS": {"hi": "10.0.0.99"}}))
+    second = configstore.load(str(config_file))
+    assert second is not first
+    assert second["LINKS"]["hi"] == "10.0.0.99"
+
+
+def test_missing_or_invalid_files(tmp_path):
+    assert configstore.load(str(tmp_path / "missing.json"), default={}) == {}
+    with pytest.raises(OSError):
+        configstore.load(str(tmp_path / "missing.json"))
+    broken = tmp_path / "broken.json"
+    broken.write_text("{")
+    assert configstore.load(str(broken), default=None) is None
+    with pytest.raises(ValueError):
+        configstore.load(str(broken))
@@ -0,0 +1,50 @@
+# tests/test_delta.py
+"""scorpion.default.Defaults.apply_delta_defaults against a mock Scorpion"""
+
+import pytest
+
+from src.scorpion.default import Defaults
+
+
+def _valueless(unit):
+    # keys without a value (actions) are sent on every run
+    return sum(1 for v in unit.get_user_defaults().values() if v is None)
+
+
+@pytest.fixture
+def applied(scorpion):
+    unit = Defaults(name="SC", host=scorpion.host, port=scorpion.port)
+    unit.apply_all_defaults(journal=False)
+    scorpion.reset_stats()
+    return unit
+
+
+def test_only_actions_are_sent_when_the_device_is_current(scorpion, applied):
+    out = applied.apply_delta_defaults()
+    summary = out["delta"]
+    assert summary["sent"] == _valueless(applied)
+    assert summary["read_errors"] == 0
+    assert summary["skipped"] == summary["checked"] - summary["sent"] > 0
+    assert scorpion.stats()["params_set"] == _valueless(applied)
+
+
+def test_only_changed_keys_are_sent(scorpion, applied):
+    label = scorpion.store["55"]
+    scorpion.store["55"] = "renamed"
+    scorpion.store["3009.1"] = "7"
+
+    out = applied.apply_delta_defaults()
+    assert out["delta"]["sent"] == 2 + _valueless(applied)
+    assert scorpion.stats()["params_set"] == 2 + _valueless(applied)
+    assert scorpion.store["55"] == label
+    assert out["routes"]["skipped"] == len(applied._desired_routes()) - 1
+
+
+def test_the_journaled_delta_run_is_resumable(scorpion, applied):
+    scorpion.store["55"] = "renamed"
+    scorpion.reject_keys = {"55"}
+    out = applied.apply_all_defaults(delta=True)
+    assert out["delta"]["sent"] == 1 + _valueless(applied)
+    scorpion.reject_keys = set()
+    assert applied.resume()["journal"]["kind"] == "apply_delta"
+    assert scorpion.store["55"] != "renamed"
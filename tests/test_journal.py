@@ -0,0 +1,84 @@
+# tests/test_journal.py
+"""scorpion.journal.ApplyJournal bookkeeping and Defaults.resume()"""
+
+import pytest
+
+from src.scorpion.default import Defaults
+from src.scorpion.journal import ApplyJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    j = ApplyJournal("10.169.20.51", path=str(tmp_path / "10.169.20.51.jsonl"))
+    j.begin()
+    return j
+
+
+def test_pending_lists_unsent_keys_in_order(journal):
+    first = journal.step({"a": 1, "b": 2, "c": 3}, "first")
+    journal.sent(first, ["a"])
+    journal.step({"d": 4}, "second")
+    assert journal.pending() == [(0, "first", {"b": 2, "c": 3}), (1, "second", {"d": 4})]
+
+
+def test_pending_skips_done_steps_and_keys_a_later_step_wrote(journal):
+    journal.step({"3009.0": "0", "3009.1": "0"}, "routes_clear")
+    routes = journal.step({"3009.0": "5"}, "routes")
+    journal.sent(routes, ["3009.0"])
+    journal.done(routes)
+    # replaying the clear must not undo the route mapping
+    assert journal.pending() == [(0, "routes_clear", {"3009.1": "0"})]
+
+
+def test_a_torn_last_line_is_ignored(journal):
+    step = journal.step({"a": 1, "b": 2}, "grid")
+    journal.sent(step, ["a"])
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "sent", "step": 0, "ke')
+    assert journal.pending() == [(0, "grid", {"b": 2})]
+
+
+def test_begin_discards_the_previous_run(journal):
+    journal.step({"a": 1}, "old")
+    journal.begin()
+    assert journal.pending() == []
+    assert journal.step({"b": 2}) == 0
+
+
+def test_one_run_per_host_at_a_time(journal):
+    other = ApplyJournal(journal.host, path=journal.path)
+    assert journal.claim()
+    assert not other.claim()
+    journal.release()
+    assert other.claim()
+    other.release()
+
+
+def test_resume_sends_only_what_the_device_rejected(scorpion):
+    unit = Defaults(name="SC", host=scorpion.host, port=scorpion.port)
+    scorpion.reject_keys = {"55"}
+    out = unit.apply_all_defaults()
+    assert out["default_params"]["fails"] == [{"id": "55", "error": "rejected"}]
+
+    pending = ApplyJournal(unit.host).pending()
+    assert [params for _, _, params in pending] == [{"55": unit.default_params["55"]}]
+
+    scorpion.reject_keys = set()
+    scorpion.reset_stats()
+    out = unit.resume()
+    assert out["journal"]["pending_keys"] == 0
+    assert scorpion.stats()["params_set"] == 1
+    assert scorpion.store["55"] == unit.default_params["55"]
+    assert unit.resume()["status"] == "nothing_to_resume"
+
+
+def test_apply_is_refused_while_another_run_holds_the_host(scorpion):
+    unit = Defaults(name="SC", host=scorpion.host, port=scorpion.port)
+    holder = ApplyJournal(unit.host)
+    assert holder.claim()
+    try:
+        assert "in progress" in unit.apply_all_defaults()["error"]
+        assert "in progress" in unit.resume()["error"]
+    finally:
+        holder.release()
+    assert "error" not in unit.apply_all_defaults()
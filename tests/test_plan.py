@@ -0,0 +1,56 @@
+# tests/test_plan.py
+"""scorpion.plan: fingerprint, compiled records and stale-plan detection"""
+
+import pytest
+
+from src import configstore
+from src.scorpion import plan
+from src.scorpion.default import device_label, expand_2110_outputs, read_config, read_default_params
+
+
+@pytest.fixture(scope="module")
+def sources():
+    return configstore.thaw(read_config()), configstore.thaw(read_default_params())
+
+
+def test_fingerprint_is_stable_for_equal_inputs(sources):
+    config, defaults = sources
+    assert plan.fingerprint(config, defaults) == plan.fingerprint(dict(config), dict(defaults))
+
+
+def test_fingerprint_covers_everything_a_plan_is_built_from(sources):
+    config, defaults = sources
+    base = plan.fingerprint(config, defaults)
+    assert plan.fingerprint({**config, "2110_Red": "239.1."}, defaults) != base
+    assert plan.fingerprint({**config, "SCORPION_LIST": ["10.0.0.9"]}, defaults) != base
+    assert plan.fingerprint(config, {**defaults, "55": "other"}) != base
+    assert plan.fingerprint(config, dict(reversed(list(defaults.items())))) != base
+    assert plan.fingerprint(config, defaults, outputs=4) != base
+
+
+def test_fingerprint_ignores_unrelated_config(sources):
+    config, defaults = sources
+    assert plan.fingerprint({**config, "HEALTH_INTERVAL": 99}, defaults) == plan.fingerprint(config, defaults)
+
+
+def test_compiled_records_match_the_per_device_expansion(sources):
+    config, defaults = sources
+    targets = {"SC-51": "10.169.20.51", "SC-52": "10.169.20.52"}
+    records = plan.compile_plan(config, defaults, targets=targets)
+    assert [r["ip"] for r in records] == list(targets.values())
+    for record in records:
+        expected = dict(defaults)
+        expected["55"] = expected["5204"] = device_label(config, record["ip"])
+        expected = expand_2110_outputs(expected, config, record["ip"], outputs=plan.OUTPUTS)
+        assert list(record["params"].items()) == list(expected.items())
+
+
+def test_lookup_ignores_a_stale_plan(tmp_path, sources):
+    config, defaults = sources
+    path = str(tmp_path / "plan.jsonl")
+    header = plan.write_plan(config, defaults, path=path)
+    ip = next(iter(plan.devices(config).values()))
+    assert header["fingerprint"] == plan.fingerprint(config, defaults)
+    assert plan.lookup(ip, config, defaults, path=path) == plan.PlanFile(path).get(ip)["params"]
+    assert plan.lookup("10.255.255.255", config, defaults, path=path) is None
+    assert plan.lookup(ip, {**config, "2110_Blue": "239.2."}, defaults, path=path) is None
@@ -0,0 +1,73 @@
+# tests/test_ratelimit.py
+"""ratelimit.TokenBucket and the per-device buckets handed out by limiter_for()"""
+
+import asyncio
+import time
+
+import pytest
+
+from src import configstore, ratelimit
+from src.ratelimit import TokenBucket
+
+
+def test_burst_goes_through_then_requests_are_paced():
+    bucket = TokenBucket(rate=100, burst=5)
+    waits = [bucket._reserve() for _ in range(7)]
+    assert waits[:5] == [0.0] * 5
+    assert waits[5] == pytest.approx(0.01, abs=0.005)
+    assert waits[6] == pytest.approx(0.02, abs=0.005)
+    stats = bucket.stats()
+    assert stats["requests"] == 7
+    assert stats["throttled"] == 2
+
+
+def test_tokens_refill_over_time():
+    bucket = TokenBucket(rate=200, burst=1)
+    assert bucket.acquire() == 0.0
+    time.sleep(0.02)
+    assert bucket.acquire() == 0.0
+
+
+def test_zero_rate_disables_limiting():
+    bucket = TokenBucket(rate=0, burst=1)
+    assert all(bucket.acquire() == 0.0 for _ in range(100))
+    assert bucket.stats()["throttled"] == 0
+
+
+def test_threads_and_coroutines_share_one_bucket():
+    bucket = TokenBucket(rate=50, burst=1)
+
+    async def _burst():
+        return await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+
+    started = time.monotonic()
+    waits = asyncio.run(_burst())
+    bucket.acquire()
+    assert sorted(waits)[0] == 0.0
+    # 3 more tokens at 50/s after the first
+    assert time.monotonic() - started >= 0.055
+
+
+def test_configure_keeps_earned_tokens_up_to_the_new_burst():
+    bucket = TokenBucket(rate=10, burst=8)
+    bucket.configure(rate=20, burst=2)
+    assert [bucket._reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket._reserve() > 0
+
+
+def test_buckets_are_per_family_and_follow_config_edits(monkeypatch):
+    snapshots = [configstore.freeze({"API_RATE_LIMIT": {"rate": 5, "burst": 2}})]
+    monkeypatch.setattr(configstore, "config", lambda default=None: snapshots[-1])
+
+    scorpion = ratelimit.limiter_for("10.0.0.1", "scorpion")
+    xip = ratelimit.limiter_for("10.0.0.1", "xip3901")
+    assert scorpion is not xip
+    assert scorpion is ratelimit.limiter_for("10.0.0.1", "scorpion")
+    assert (scorpion.rate, scorpion.burst) == (5.0, 2)
+
+    snapshots.append(configstore.freeze({"SCORPION_RATE_LIMIT": {"rate": 7}}))
+    assert ratelimit.limiter_for("10.0.0.1", "scorpion") is scorpion
+    assert (scorpion.rate, scorpion.burst) == (7.0, ratelimit.DEFAULT_BURST)
+    assert ratelimit.limiter_for("10.0.0.1", "xip3901").rate == ratelimit.DEFAULT_RATE
+
+    assert set(ratelimit.stats(["10.0.0.1"])) == {"10.0.0.1", "10.0.0.1 (xip3901)"}
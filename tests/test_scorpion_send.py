@@ -0,0 +1,92 @@
+# tests/test_scorpion_send.py
+"""EV/SET packing and size-rejection halving in scorpion.default.Defaults._send_params"""
+
+import pytest
+
+from src.scorpion.default import Defaults
+
+
+def _params(count):
+    return {f"6551.{i}.0.0": f"232.20.51.{i % 250}" for i in range(count)}
+
+
+@pytest.fixture
+def unit(scorpion):
+    d = Defaults(name="SC", host=scorpion.host, port=scorpion.port)
+    d.config = dict(d.config, SCORPION_APPLY_RETRIES=0, SCORPION_MAX_URL_BYTES=2000,
+                    SCORPION_MAX_PARAMS_PER_REQUEST=100)
+    # don't count the login
+    scorpion.reset_stats()
+    return d
+
+
+def test_pack_respects_record_limit(unit):
+    unit.config = dict(unit.config, SCORPION_MAX_PARAMS_PER_REQUEST=10, SCORPION_MAX_URL_BYTES=100000)
+    params = _params(95)
+    chunks = unit._pack_params(params)
+    assert [len(c) for c in chunks] == [10] * 9 + [5]
+    assert [k for c in chunks for k in c] == list(params)
+
+
+def test_pack_fills_each_request_up_to_the_url_budget(unit):
+    unit.config = dict(unit.config, SCORPION_MAX_PARAMS_PER_REQUEST=1000, SCORPION_MAX_URL_BYTES=400)
+    params = _params(200)
+    chunks = unit._pack_params(params)
+    assert [k for c in chunks for k in c] == list(params)
+    assert all(unit._url_bytes(c) <= 400 for c in chunks)
+    # the first key of the next chunk would not have fitted
+    for chunk, following in zip(chunks, chunks[1:]):
+        key = next(iter(following))
+        assert unit._url_bytes({**chunk, key: following[key]}) > 400
+
+
+def test_send_halves_on_414_and_remembers_the_size(scorpion, unit):
+    scorpion.max_url_bytes = 600
+    params = _params(60)
+    responses, fails = unit._send_params(params)
+    assert fails == []
+    assert len(responses) == 60
+    assert all(scorpion.store[k] == v for k, v in params.items())
+    assert unit._record_limit() == 15
+
+    # the next push is packed to the learnt size straight away
+    scorpion.reset_stats()
+    unit._send_params(params)
+    assert scorpion.stats()["rejected"] == 0
+    assert scorpion.stats()["sets"] == 4
+
+
+def test_send_halves_on_400_for_a_long_url(scorpion, unit):
+    scorpion.max_params = 10
+    params = _params(60)
+    assert unit._url_bytes(params) >= 0.75 * unit._url_budget()
+    responses, fails = unit._send_params(params)
+    assert fails == []
+    assert len(responses) == 60
+    assert unit._record_limit() == 7
+
+
+def test_400_on_a_short_url_is_a_plain_failure(scorpion, unit):
+    scorpion.max_params = 10
+    responses, fails = unit._send_params(_params(20))
+    assert responses == []
+    assert len(fails) == 1 and "400" in fails[0]["error"]
+    assert scorpion.stats()["requests"] == 1
+    assert unit._record_limit() == 100
+
+
+def test_dropped_connection_on_a_short_url_is_not_split(scorpion, unit):
+    scorpion.offline = True
+    responses, fails = unit._send_params(_params(20))
+    assert responses == []
+    assert len(fails) == 1
+    assert scorpion.stats()["requests"] == 1
+    assert unit._record_limit() == 100
+
+
+def test_per_key_errors_are_reported_as_fails(scorpion, unit):
+    scorpion.reject_keys = {"6551.3.0.0"}
+    responses, fails = unit._send_params(_params(10))
+    assert len(responses) == 10
+    assert fails == [{"id": "6551.3.0.0", "error": "rejected"}]
+    assert "6551.3.0.0" not in scorpion.store
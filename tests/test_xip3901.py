@@ -0,0 +1,124 @@
+# tests/test_xip3901.py
+"""XIP3901 sender rendering, drift audit and staged rollout against mock XIPs"""
+
+import json
+
+import pytest
+
+from src.xip3901 import fleet
+from src.xip3901.default import Defaults, RtpRenderer
+
+
+def _fill_rtp_body_before_renderer(unit, template, suffix_octet, udp_port, audio=False):
+    """Defaults._fill_rtp_body as it was before RtpRenderer (the reference output)"""
+    t = json.loads(json.dumps(template))
+    red = f"{unit.red_prefix}{unit.last_octet}.{suffix_octet}"
+    blue = f"{unit.blue_prefix}{unit.last_octet}.{suffix_octet}"
+    t["rtp"][0]["txStreamAddress"] = red
+    t["rtp"][1]["txStreamAddress"] = blue
+    t["rtp"][0]["txStreamPort"] = udp_port
+    t["rtp"][1]["txStreamPort"] = udp_port
+    if audio:
+        t["smpteType"] = unit.audio_type
+        t["profile"] = unit.audio_profile
+    return t
+
+
+@pytest.fixture
+def unit(xip):
+    return Defaults(name="XIP", host=xip.host, port=xip.port)
+
+
+@pytest.mark.parametrize("kind", ["video", "audio", "meta"])
+def test_renderer_matches_the_old_fill_rtp_body(unit, kind):
+    template = unit.refs["senders"][kind]["body_template"]
+    audio = kind == "audio"
+    for octet, port in ((1, 50100), (108, 50200), (232, 50300)):
+        rendered = unit._fill_rtp_body(template, octet, port, audio=audio)
+        expected = _fill_rtp_body_before_renderer(unit, template, octet, port, audio=audio)
+        assert json.dumps(rendered, sort_keys=True) == json.dumps(expected, sort_keys=True)
+
+
+def test_rendered_bodies_do_not_share_their_varying_parts():
+    template = {"rtp": [{"txStreamAddress": "", "txStreamPort": 0}, {"txStreamAddress": ""}], "static": {"a": 1}}
+    renderer = RtpRenderer(template)
+    first = renderer.render("232.20.1.1", "232.120.1.1", 50100)
+    second = renderer.render("232.20.1.2", "232.120.1.2", 50200)
+    assert first["rtp"][1] == {"txStreamAddress": "232.120.1.1", "txStreamPort": 50100}
+    assert second["rtp"][0]["txStreamAddress"] == "232.20.1.2"
+    assert first["rtp"] is not second["rtp"]
+    assert template["rtp"][0] == {"txStreamAddress": "", "txStreamPort": 0}
+
+
+def test_renderer_rejects_a_template_without_both_legs():
+    with pytest.raises(IndexError):
+        RtpRenderer({"rtp": [{}]})
+
+
+def test_audit_is_clean_after_apply(unit):
+    unit.apply_all_defaults()
+    report = unit.audit()
+    assert report["ok"], report
+    assert report["checked"] == len(unit.expected_state())
+
+
+def test_audit_reports_drift_per_field(xip, unit):
+    unit.apply_all_defaults()
+    _, path, _ = unit.sender_jobs()[0]
+    xip.store[path]["rtp"][0]["txStreamPort"] = 1
+    report = unit.audit()
+    assert not report["ok"]
+    assert report["drifted"] == 1
+    assert report["drift"]["senders/video/1"] == {
+        "rtp[0].txStreamPort": {"expected": unit.udp_video, "actual": 1}
+    }
+
+
+def test_audit_reports_unreadable_resources(xip, unit):
+    xip.offline = True
+    report = unit.audit(max_in_flight=1)
+    assert not report["ok"]
+    assert report["unreadable"] == report["checked"]
+    assert report["drifted"] == 0
+
+
+def test_rollout_stops_when_the_canary_fails(xip_fleet):
+    hosts = xip_fleet.hosts
+    xip_fleet.device(hosts[0]).offline = True
+    out = fleet.rollout(hosts, port=xip_fleet.port, canary=1, wave_size=2, verify=False)
+    assert out["halted"].startswith("canary failed")
+    assert [w["stage"] for w in out["waves"]] == ["canary"]
+    assert out["skipped"] == hosts[1:]
+    assert xip_fleet.device(hosts[1]).stats()["puts"] == 0
+
+
+def test_rollout_stops_after_a_wave_over_the_failure_rate(xip_fleet):
+    hosts = xip_fleet.hosts
+    xip_fleet.device(hosts[2]).offline = True
+    out = fleet.rollout(hosts, port=xip_fleet.port, canary=1, wave_size=2,
+                        max_failure_rate=0.25, verify=False)
+    assert [w["stage"] for w in out["waves"]] == ["canary", "wave 1"]
+    assert out["waves"][1]["failed"] == [hosts[2]]
+    assert out["halted"].startswith("wave 1")
+    assert out["skipped"] == hosts[3:]
+
+
+def test_rollout_without_canary_verifies_every_unit(xip_fleet):
+    hosts = xip_fleet.hosts
+    out = fleet.rollout(hosts, port=xip_fleet.port, canary=0, wave_size=3, verify=True)
+    assert out["halted"] is None
+    assert [w["stage"] for w in out["waves"]] == ["wave 1", "wave 2"]
+    assert all(out["results"][ip]["ok"] for ip in hosts)
+    assert all(out["results"][ip]["audit"]["ok"] for ip in hosts)
+
+
+def test_rollout_reads_a_zero_canary_from_config(xip_fleet):
+    out = fleet.rollout(xip_fleet.hosts[:2], port=xip_fleet.port, verify=False,
+                        config={"XIP3901_ROLLOUT_CANARY": 0, "XIP3901_ROLLOUT_WAVE_SIZE": 2})
+    assert [w["stage"] for w in out["waves"]] == ["wave 1"]
+
+
+def test_has_error_only_counts_error_wrappers():
+    assert fleet._has_error({"senders": {"video": [{"error": "timed out"}]}})
+    assert not fleet._has_error({"ptp": {"error": None, "domainNumber": 127}})
+    assert not fleet._has_error({"nmos": {"error": ""}})